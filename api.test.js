@@ -1,22 +1,87 @@
 const request = require('supertest');
 const fs = require('fs').promises;
 const path = require('path');
+const os = require('os');
+const http = require('http');
 
 // Set test environment
 process.env.NODE_ENV = 'test';
 
-const { app, resetStorage } = require('./server');
+const { app, loadTasks, saveTasks, resetStorage, store: serverStore, taskLog, staticAssets } = require('./server');
+const { TaskLog, readState, LOG_SUFFIX } = require('./task-log');
+const { TaskStore } = require('./task-store');
+const { ReplicationPrimary, ClusterReplica } = require('./cluster-replication');
+const { negotiateEncoding } = require('./static-assets');
+const { TASK_COLUMNS_TYPE, encodeTaskColumns } = require('./task-columns');
+const TodoApp = require('./script');
 
 const TEST_STORAGE_FILE = path.join(__dirname, 'tasks.json');
+const TEST_LOG_FILE = TEST_STORAGE_FILE + LOG_SUFFIX;
+
+// Collect a supertest response body as a Buffer, for binary formats
+function binaryParser(res, callback) {
+    const chunks = [];
+    res.on('data', chunk => chunks.push(chunk));
+    res.on('end', () => callback(null, Buffer.concat(chunks)));
+}
 
 // Helper to clean up storage between tests
 async function cleanupStorage() {
-    try {
-        await fs.unlink(TEST_STORAGE_FILE);
-    } catch (error) {
-        // File doesn't exist, that's okay
+    await resetStorage(); // Empty the in-memory store, then remove what the reset wrote
+    await taskLog.flush();
+    for (const file of [TEST_STORAGE_FILE, TEST_LOG_FILE]) {
+        try {
+            await fs.unlink(file);
+        } catch (error) {
+            // File doesn't exist, that's okay
+        }
     }
-    resetStorage(); // Also reset in-memory storage
+}
+
+// Helper to open GET /api/tasks/stream on a real socket and collect its events
+async function openStream() {
+    const server = app.listen(0);
+    await new Promise(resolve => server.once('listening', resolve));
+    const events = [];
+    const waiters = [];
+    const response = await new Promise((resolve, reject) => {
+        http.get(`http://127.0.0.1:${server.address().port}/api/tasks/stream`, resolve).on('error', reject);
+    });
+    let buffer = '';
+    response.setEncoding('utf8');
+    response.on('data', chunk => {
+        buffer += chunk;
+        let end;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+            const lines = buffer.slice(0, end).split('\n');
+            buffer = buffer.slice(end + 2);
+            const event = lines.find(line => line.startsWith('event: '));
+            const data = lines.find(line => line.startsWith('data: '));
+            if (event && data) {
+                events.push({ event: event.slice(7), data: JSON.parse(data.slice(6)) });
+                waiters.splice(0).forEach(wake => wake());
+            }
+        }
+    });
+    return {
+        events,
+        // Resolve once `count` events have arrived
+        async waitFor(count) {
+            while (events.length < count) {
+                await new Promise(resolve => waiters.push(resolve));
+            }
+            return events;
+        },
+        close() {
+            response.destroy();
+            return new Promise(resolve => server.close(resolve));
+        }
+    };
+}
+
+// Helper to read what a restarted server would load (snapshot + log replay)
+async function readStoredTasks() {
+    return readState(TEST_STORAGE_FILE);
 }
 
 describe('Todo API - Comprehensive Test Suite', () => {
@@ -30,6 +95,231 @@ describe('Todo API - Comprehensive Test Suite', () => {
         await cleanupStorage();
     });
 
+    describe('GET /api/health', () => {
+
+        test('HAPPY PATH: should report ready once tasks are loaded', async () => {
+            // Arrange
+            await cleanupStorage();
+            await loadTasks();
+            
+            // Act
+            const response = await request(app).get('/api/health');
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.body.success).toBe(true);
+            expect(response.body.status).toBe('ready');
+            expect(response.body.count).toBe(0);
+        });
+    });
+
+    describe('GET /metrics', () => {
+
+        beforeEach(async () => {
+            await cleanupStorage();
+        });
+
+        test('HAPPY PATH: should expose request, storage and event loop metrics as Prometheus text', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Timed Task' });
+            
+            // Act
+            const response = await request(app).get('/metrics');
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.headers['content-type']).toMatch(/^text\/plain; version=0\.0\.4/);
+            expect(response.text).toContain('# TYPE http_request_duration_seconds histogram');
+            expect(response.text).toMatch(/http_request_duration_seconds_count\{method="POST",route="\/api\/tasks",status="201"\} \d+/);
+            expect(response.text).toMatch(/todo_storage_write_duration_seconds_count\{op="append"\} \d+/);
+            expect(response.text).toContain('http_requests_in_flight 0');
+            expect(response.text).toContain('# TYPE nodejs_eventloop_lag_seconds histogram');
+            expect(response.text).toContain('todo_tasks 1');
+        });
+
+        test('EDGE CASE: should label requests by route pattern, not by URL', async () => {
+            // Arrange
+            const created = await request(app).post('/api/tasks').send({ name: 'Task' });
+            await request(app).get(`/api/tasks/${created.body.data.id}`);
+            await request(app).get('/api/tasks/999999');
+            
+            // Act
+            const response = await request(app).get('/metrics');
+            
+            // Assert
+            expect(response.text).toMatch(/route="\/api\/tasks\/:id",status="200"/);
+            expect(response.text).toMatch(/route="\/api\/tasks\/:id",status="404"/);
+            expect(response.text).not.toMatch(/route="\/api\/tasks\/\d+"/);
+            expect(response.text).not.toContain('route="/metrics"');
+        });
+
+        test('HAPPY PATH: should count every request in the route histogram', async () => {
+            // Arrange
+            const countFor = (text) => {
+                const match = text.match(/http_request_duration_seconds_count\{method="GET",route="\/api\/tasks",status="200"\} (\d+)/);
+                return match ? Number(match[1]) : 0;
+            };
+            const before = countFor((await request(app).get('/metrics')).text);
+            
+            // Act
+            for (let i = 0; i < 3; i++) {
+                await request(app).get(`/api/tasks?limit=${i + 1}`);
+            }
+            const after = countFor((await request(app).get('/metrics')).text);
+            
+            // Assert
+            expect(after - before).toBe(3);
+        });
+    });
+
+    describe('Task columns', () => {
+
+        test('HAPPY PATH: should decode what the server encodes, for any fields, cursor and id order', () => {
+            // Arrange
+            const tasks = [
+                { id: 9, name: 'Nine', status: 'completed', priority: '2' },
+                { id: 3, name: '', status: 'not started', priority: '2' },
+                { id: 2 ** 40, name: 'Ünïcode 😀 name', status: 'completed', priority: '1' }
+            ];
+            const separator = [{ id: 1, name: 'a\u0000b' }, { id: 2, name: '😀' }]; // Names sent with their lengths
+            const cases = [
+                { tasks, fields: ['id', 'name', 'status', 'priority'], nextCursor: null },
+                { tasks, fields: ['id', 'priority'], nextCursor: 3 },
+                { tasks, fields: ['id'], nextCursor: 'WyJuaW5lIiw5XQ' },
+                { tasks: separator, fields: ['id', 'name'], nextCursor: null },
+                { tasks: [], fields: ['id', 'name'], nextCursor: null }
+            ];
+            
+            cases.forEach(({ tasks: list, fields, nextCursor }) => {
+                // Act
+                const data = list.map(task => Object.fromEntries(fields.map(field => [field, task[field]])));
+                const decoded = TodoApp.decodeTaskColumns(encodeTaskColumns({ tasks: data, fields, nextCursor, version: 'k2x-7' }));
+                
+                // Assert
+                expect(decoded).toEqual({ success: true, data, count: data.length, nextCursor, version: 'k2x-7' });
+            });
+        });
+
+        test('FAILURE MODE: should refuse to decode anything else', () => {
+            // Act & Assert
+            expect(() => TodoApp.decodeTaskColumns(Buffer.from('{"success":true}'))).toThrow('Not a task columns response');
+        });
+
+        test('LOAD: should send and parse 50k tasks several times faster than JSON', () => {
+            // Arrange
+            const statuses = ['not started', 'in progress', 'completed'];
+            const tasks = Array.from({ length: 50000 }, (_, i) => ({ id: i + 1, name: `Task ${i}`, status: statuses[i % 3], priority: String(1 + (i % 3)) }));
+            const json = JSON.stringify({ success: true, data: tasks, count: tasks.length, nextCursor: null, version: 'k2x-7' });
+            const columns = encodeTaskColumns({ tasks, fields: ['id', 'name', 'status', 'priority'], nextCursor: null, version: 'k2x-7' });
+            const median = parse => {
+                const times = [];
+                for (let i = 0; i < 7; i++) {
+                    const start = process.hrtime.bigint();
+                    parse();
+                    times.push(Number(process.hrtime.bigint() - start));
+                }
+                return times.sort((a, b) => a - b)[3];
+            };
+            
+            // Act
+            const jsonTime = median(() => JSON.parse(json));
+            const columnsTime = median(() => TodoApp.decodeTaskColumns(columns));
+            
+            // Assert
+            expect(TodoApp.decodeTaskColumns(columns).data).toEqual(tasks);
+            expect(columns.length).toBeLessThan(json.length / 4);
+            expect(columnsTime).toBeLessThan(jsonTime / 2);
+        });
+    });
+
+    describe('Static assets', () => {
+
+        test('HAPPY PATH: should serve the page with links to content-hashed assets', async () => {
+            // Arrange
+            const scriptUrl = staticAssets.urlFor('script.js');
+            
+            // Act
+            const response = await request(app).get('/').set('Accept-Encoding', 'identity');
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.headers['content-type']).toBe('text/html; charset=utf-8');
+            expect(response.headers['cache-control']).toBe('no-cache');
+            expect(response.headers['etag']).toMatch(/^"[0-9a-f]{10}"$/);
+            expect(scriptUrl).toMatch(/^\/script\.[0-9a-f]{10}\.js$/);
+            expect(response.text).toContain(`src="${scriptUrl.slice(1)}"`);
+            expect(response.text).toContain(`href="${staticAssets.urlFor('styles.css').slice(1)}"`);
+        });
+
+        test('HAPPY PATH: should cache hashed assets as immutable and serve the smallest accepted encoding', async () => {
+            // Arrange
+            const url = staticAssets.urlFor('script.js');
+            const plain = await request(app).get(url).set('Accept-Encoding', 'identity');
+            
+            // Act
+            const response = await request(app).get(url).set('Accept-Encoding', 'gzip, deflate, br');
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.headers['cache-control']).toBe('public, max-age=31536000, immutable');
+            expect(response.headers['vary']).toBe('Accept-Encoding');
+            expect(response.headers['content-encoding']).toBe('br');
+            expect(response.headers['etag']).toMatch(/-br"$/);
+            expect(Number(response.headers['content-length'])).toBeLessThan(Number(plain.headers['content-length']) / 3);
+        });
+
+        test('HAPPY PATH: should answer 304 when the ETag still matches', async () => {
+            // Arrange
+            const first = await request(app).get('/').set('Accept-Encoding', 'gzip');
+            
+            // Act
+            const response = await request(app).get('/').set('Accept-Encoding', 'gzip').set('If-None-Match', first.headers['etag']);
+            
+            // Assert
+            expect(first.headers['content-encoding']).toBe('gzip');
+            expect(response.status).toBe(304);
+            expect(response.headers['etag']).toBe(first.headers['etag']);
+        });
+
+        test('FAILURE MODE: should not serve other files from the repository', async () => {
+            // Act
+            const responses = await Promise.all(['/package-lock.json', '/server.js', '/tasks.json', '/k6/load-ui.js'].map(url => request(app).get(url)));
+            
+            // Assert
+            responses.forEach(response => expect(response.status).toBe(404));
+        });
+
+        test('EDGE CASE: should honour q=0 and fall back to identity', () => {
+            // Arrange
+            const variants = { identity: {}, br: {}, gzip: {} };
+            
+            // Act & Assert
+            expect(negotiateEncoding('gzip, br;q=0', variants)).toBe('gzip');
+            expect(negotiateEncoding('*', variants)).toBe('br');
+            expect(negotiateEncoding('gzip;q=0, br;q=0', variants)).toBe('identity');
+            expect(negotiateEncoding('gzip;q=0, *;q=0, identity', variants)).toBe('identity');
+            expect(negotiateEncoding(undefined, variants)).toBe('identity');
+            expect(negotiateEncoding('br', { identity: {} })).toBe('identity');
+        });
+
+        test('EDGE CASE: should not send identity when the client refuses it', async () => {
+            // Arrange
+            const url = staticAssets.urlFor('script.js');
+            
+            // Act
+            const fallback = await request(app).get(url).set('Accept-Encoding', 'gzip, identity;q=0');
+            const refused = await request(app).get(url).set('Accept-Encoding', 'deflate, identity;q=0');
+            
+            // Assert
+            expect(negotiateEncoding('br, identity;q=0', { identity: {} })).toBeNull();
+            expect(negotiateEncoding('gzip;q=0, *;q=0', { identity: {}, gzip: {} })).toBeNull();
+            expect(fallback.status).toBe(200);
+            expect(fallback.headers['content-encoding']).toBe('gzip');
+            expect(refused.status).toBe(406);
+            expect(refused.headers['vary']).toBe('Accept-Encoding');
+        });
+    });
+
     describe('GET /api/tasks', () => {
         
         beforeEach(async () => {
@@ -89,6 +379,341 @@ describe('Todo API - Comprehensive Test Suite', () => {
             expect(response.body.data).toHaveLength(2);
             expect(response.body.data[0].id).not.toBe(response.body.data[1].id);
         });
+
+        test('HAPPY PATH: should page through tasks with limit and after', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: Array.from({ length: 5 }, (_, i) => ({ name: `Task ${i + 1}` })) });
+            await request(app).delete('/api/tasks/2');
+            
+            // Act
+            const first = await request(app).get('/api/tasks?limit=2');
+            const second = await request(app).get(`/api/tasks?limit=2&after=${first.body.nextCursor}`);
+            
+            // Assert
+            expect(first.body.data.map(task => task.id)).toEqual([1, 3]);
+            expect(first.body.count).toBe(2);
+            expect(first.body.nextCursor).toBe(3);
+            expect(second.body.data.map(task => task.id)).toEqual([4, 5]);
+            expect(second.body.nextCursor).toBeNull();
+        });
+
+        test('HAPPY PATH: should filter by status and priority and project fields', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [
+                    { name: 'Match', status: 'completed', priority: '2' },
+                    { name: 'Wrong status', status: 'in progress', priority: '2' },
+                    { name: 'Wrong priority', status: 'completed', priority: '3' }
+                ] });
+            
+            // Act
+            const response = await request(app).get('/api/tasks?status=completed&priority=2&fields=name');
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.body.data).toEqual([{ id: 1, name: 'Match' }]);
+            expect(response.body.nextCursor).toBeNull();
+        });
+
+        test('HAPPY PATH: should search names by word prefix together with the other filters', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [
+                    { name: 'Write quarterly report', status: 'completed' },
+                    { name: 'Review report draft', status: 'completed' },
+                    { name: 'Reporting meeting' },
+                    { name: 'Quarterly planning', status: 'completed' }
+                ] });
+            
+            // Act
+            const prefix = await request(app).get('/api/tasks?q=REP');
+            const twoWords = await request(app).get('/api/tasks?q=quart%20rep&status=completed');
+            const none = await request(app).get('/api/tasks?q=port');
+            
+            // Assert
+            expect(prefix.status).toBe(200);
+            expect(prefix.body.data.map(task => task.id)).toEqual([1, 2, 3]);
+            expect(prefix.headers['server-timing']).toMatch(/^search;dur=\d+\.\d{3}$/);
+            expect(twoWords.body.data.map(task => task.name)).toEqual(['Write quarterly report']);
+            expect(none.body.data).toEqual([]);
+        });
+
+        test('HAPPY PATH: should sort and page with the cursor returned for that sort', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: ['delta', 'Alpha', 'charlie', 'bravo', 'echo'].map((name, i) => ({ name, priority: String(1 + (i % 3)) })) });
+            
+            // Act
+            const names = [];
+            let cursor = null;
+            do {
+                const response = await request(app).get(`/api/tasks?sort=name&limit=2${cursor ? `&after=${cursor}` : ''}`);
+                names.push(...response.body.data.map(task => task.name));
+                cursor = response.body.nextCursor;
+            } while (cursor);
+            const byPriority = await request(app).get('/api/tasks?sort=-priority');
+            
+            // Assert
+            expect(names).toEqual(['Alpha', 'bravo', 'charlie', 'delta', 'echo']);
+            expect(byPriority.body.data.map(task => [task.priority, task.id])).toEqual([['3', 3], ['2', 2], ['2', 5], ['1', 1], ['1', 4]]);
+        });
+
+        test('FAILURE MODE: should reject an invalid search, sort or cursor', async () => {
+            // Act
+            const response = await request(app).get('/api/tasks?q=%20-%20&sort=owner');
+            const badCursor = await request(app).get('/api/tasks?sort=name&after=3');
+            
+            // Assert
+            expect(response.status).toBe(400);
+            expect(response.body.errors).toEqual([
+                'sort must be one of id, name, priority, status, optionally prefixed with - for descending',
+                'q must contain at least one letter or digit'
+            ]);
+            expect(badCursor.status).toBe(400);
+            expect(badCursor.body.errors).toEqual(['after must be a nextCursor returned for the same sort']);
+        });
+
+        test('HAPPY PATH: should send the columnar format to clients that prefer it', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'First' }, { name: 'Ünïcode 😀 task', priority: '3', status: 'completed' }, { name: 'Third', status: 'in progress' }] });
+            const json = await request(app).get('/api/tasks?limit=2&fields=name,status');
+            
+            // Act
+            const response = await request(app)
+                .get('/api/tasks?limit=2&fields=name,status')
+                .set('Accept', `${TASK_COLUMNS_TYPE}, application/json;q=0.9`)
+                .buffer(true)
+                .parse(binaryParser);
+            const revalidated = await request(app)
+                .get('/api/tasks?limit=2&fields=name,status')
+                .set('Accept', TASK_COLUMNS_TYPE)
+                .set('If-None-Match', response.headers['etag']);
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.headers['content-type']).toBe(TASK_COLUMNS_TYPE);
+            expect(response.headers['vary']).toMatch(/Accept/);
+            expect(response.headers['etag']).not.toBe(json.headers['etag']);
+            expect(TodoApp.decodeTaskColumns(response.body)).toEqual(json.body);
+            expect(revalidated.status).toBe(304);
+        });
+
+        test('EDGE CASE: should keep sending JSON unless the columnar format is preferred', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Task' });
+            
+            // Act
+            const responses = await Promise.all(['*/*', 'application/json', `application/json, ${TASK_COLUMNS_TYPE};q=0.5`, 'text/html']
+                .map(accept => request(app).get('/api/tasks').set('Accept', accept)));
+            
+            // Assert
+            responses.forEach(response => {
+                expect(response.status).toBe(200);
+                expect(response.headers['content-type']).toBe('application/json; charset=utf-8');
+                expect(response.body.data).toEqual([{ id: 1, name: 'Task', status: 'not started', priority: '1' }]);
+            });
+        });
+
+        test('FAILURE MODE: should reject invalid query parameters', async () => {
+            // Act
+            const response = await request(app).get('/api/tasks?limit=0&after=abc&status=done&priority=9&fields=name,secret');
+            
+            // Assert
+            expect(response.status).toBe(400);
+            expect(response.body.success).toBe(false);
+            expect(response.body.errors).toEqual([
+                'limit must be an integer between 1 and 1000',
+                'after must be a task ID',
+                'Status must be "not started", "in progress", or "completed"',
+                'Priority must be 1, 2, or 3',
+                'Unknown fields: secret'
+            ]);
+        });
+
+        test('HAPPY PATH: should answer 304 when If-None-Match matches the current ETag', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Cached' });
+            const first = await request(app).get('/api/tasks');
+            
+            // Act
+            const second = await request(app).get('/api/tasks').set('If-None-Match', first.headers.etag);
+            
+            // Assert
+            expect(first.status).toBe(200);
+            expect(first.headers.etag).toBeDefined();
+            expect(first.headers['cache-control']).toBe('no-cache');
+            expect(second.status).toBe(304);
+            expect(second.text).toBeFalsy();
+        });
+
+        test('HAPPY PATH: should change the ETag and body after every kind of write', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'First' });
+            const etags = [(await request(app).get('/api/tasks')).headers.etag];
+            const writes = [
+                () => request(app).post('/api/tasks').send({ name: 'Second' }),
+                () => request(app).post('/api/tasks/bulk').send({ tasks: [{ name: 'Third' }] }),
+                () => request(app).put('/api/tasks/1').send({ status: 'completed' }),
+                () => request(app).delete('/api/tasks/2')
+            ];
+            
+            // Act
+            for (const write of writes) {
+                await write();
+                const response = await request(app).get('/api/tasks').set('If-None-Match', etags[etags.length - 1]);
+                expect(response.status).toBe(200);
+                etags.push(response.headers.etag);
+            }
+            const final = await request(app).get('/api/tasks');
+            
+            // Assert
+            expect(new Set(etags).size).toBe(etags.length);
+            expect(final.body.data.map(task => [task.id, task.status])).toEqual([[1, 'completed'], [3, 'not started']]);
+        });
+
+        test('EDGE CASE: should cache each query separately', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'One' }, { name: 'Two', status: 'completed' }] });
+            
+            // Act
+            const all = await request(app).get('/api/tasks');
+            const completed = await request(app).get('/api/tasks?status=completed');
+            const allAgain = await request(app).get('/api/tasks');
+            
+            // Assert
+            expect(all.body.count).toBe(2);
+            expect(completed.body.data.map(task => task.name)).toEqual(['Two']);
+            expect(allAgain.body).toEqual(all.body);
+        });
+    });
+
+    describe('GET /api/tasks/changes', () => {
+        
+        beforeEach(async () => {
+            await cleanupStorage();
+        });
+
+        test('HAPPY PATH: should return only tasks created, updated and deleted since a version', async () => {
+            // Arrange
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'Untouched' }, { name: 'Updated' }, { name: 'Deleted' }] });
+            const { version } = (await request(app).get('/api/tasks')).body;
+            await request(app).put('/api/tasks/2').send({ status: 'completed' });
+            await request(app).delete('/api/tasks/3');
+            await request(app).post('/api/tasks').send({ name: 'Created' });
+            await request(app).post('/api/tasks').send({ name: 'Created and deleted' });
+            await request(app).delete('/api/tasks/5');
+            
+            // Act
+            const response = await request(app).get(`/api/tasks/changes?since=${version}`);
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.body.created.map(task => task.name)).toEqual(['Created']);
+            expect(response.body.updated).toEqual([{ id: 2, name: 'Updated', priority: '1', status: 'completed' }]);
+            expect(response.body.deleted).toEqual([3]);
+            expect(response.body.version).not.toBe(version);
+        });
+
+        test('EDGE CASE: should return no changes for the current version', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Task' });
+            const { version } = (await request(app).get('/api/tasks')).body;
+            
+            // Act
+            const response = await request(app).get(`/api/tasks/changes?since=${version}`);
+            
+            // Assert
+            expect(response.body).toMatchObject({ success: true, version, created: [], updated: [], deleted: [] });
+        });
+
+        test('FAILURE MODE: should return 410 when the changes are no longer available', async () => {
+            // Arrange
+            const { version } = (await request(app).get('/api/tasks')).body;
+            await resetStorage();
+            
+            // Act
+            const expired = await request(app).get(`/api/tasks/changes?since=${version}`);
+            const otherServer = await request(app).get('/api/tasks/changes?since=zzz-1');
+            
+            // Assert
+            expect(expired.status).toBe(410);
+            expect(expired.body.success).toBe(false);
+            expect(otherServer.status).toBe(410);
+        });
+
+        test('FAILURE MODE: should return 400 for a missing or malformed version', async () => {
+            // Act
+            const missing = await request(app).get('/api/tasks/changes');
+            const malformed = await request(app).get('/api/tasks/changes?since=yesterday');
+            
+            // Assert
+            expect(missing.status).toBe(400);
+            expect(malformed.status).toBe(400);
+            expect(malformed.body.errors).toEqual(['since must be a version returned by the API']);
+        });
+    });
+
+    describe('GET /api/tasks/stream', () => {
+        let stream;
+        
+        beforeEach(async () => {
+            await cleanupStorage();
+            stream = await openStream();
+            await stream.waitFor(1);
+        });
+        
+        afterEach(async () => {
+            await stream.close();
+        });
+
+        test('HAPPY PATH: should push each change as a delta from the previous push', async () => {
+            // Arrange
+            const ready = stream.events[0];
+            
+            // Act
+            await request(app).post('/api/tasks').send({ name: 'Pushed' });
+            await stream.waitFor(2);
+            await request(app).put('/api/tasks/1').send({ status: 'completed' });
+            const [, created, updated] = await stream.waitFor(3);
+            
+            // Assert
+            expect(ready.event).toBe('ready');
+            expect(created.event).toBe('changes');
+            expect(created.data.since).toBe(ready.data.version);
+            expect(created.data.created.map(task => task.name)).toEqual(['Pushed']);
+            expect(updated.data.since).toBe(created.data.version);
+            expect(updated.data.updated).toEqual([{ id: 1, name: 'Pushed', priority: '1', status: 'completed' }]);
+        });
+
+        test('HAPPY PATH: should push one event for writes in the same request', async () => {
+            // Act
+            await request(app).post('/api/tasks/bulk').send({ tasks: [{ name: 'A' }, { name: 'B' }, { name: 'C' }] });
+            const [, pushed] = await stream.waitFor(2);
+            
+            // Assert
+            expect(pushed.data.created).toHaveLength(3);
+        });
+
+        test('EDGE CASE: should tell clients to resync after a reset', async () => {
+            // Act
+            await request(app).post('/api/test/reset');
+            const [, pushed] = await stream.waitFor(2);
+            
+            // Assert
+            expect(pushed.event).toBe('reset');
+            expect(pushed.data.version).toBeDefined();
+        });
     });
 
     describe('GET /api/tasks/:id', () => {
@@ -228,8 +853,7 @@ describe('Todo API - Comprehensive Test Suite', () => {
                 .send({ name: 'Persistent Task', status: 'not started' });
             
             // Assert - Check storage file exists and contains task
-            const fileData = await fs.readFile(TEST_STORAGE_FILE, 'utf8');
-            const parsedData = JSON.parse(fileData);
+            const parsedData = await readStoredTasks();
             expect(parsedData.tasks).toHaveLength(1);
             expect(parsedData.tasks[0].name).toBe('Persistent Task');
         });
@@ -265,98 +889,288 @@ describe('Todo API - Comprehensive Test Suite', () => {
                 .send({ status: 'not started' });
             
             // Assert
-            expect(response.status).toBe(400);
-            expect(response.body.success).toBe(false);
-            expect(response.body.errors).toBeDefined();
+            expect(response.status).toBe(400);
+            expect(response.body.success).toBe(false);
+            expect(response.body.errors).toBeDefined();
+        });
+
+        test('FAILURE MODE: should reject task with name exceeding max length', async () => {
+            // Arrange
+            const longName = 'a'.repeat(201);
+            
+            // Act
+            const response = await request(app)
+                .post('/api/tasks')
+                .send({ name: longName, status: 'not started' });
+            
+            // Assert
+            expect(response.status).toBe(400);
+            expect(response.body.success).toBe(false);
+            expect(response.body.errors).toContain('Task name cannot exceed 200 characters');
+        });
+
+        test('EDGE CASE: should accept task name at exactly max length (200 chars)', async () => {
+            // Arrange
+            const maxLengthName = 'a'.repeat(200);
+            
+            // Act
+            const response = await request(app)
+                .post('/api/tasks')
+                .send({ name: maxLengthName, status: 'not started' });
+            
+            // Assert
+            expect(response.status).toBe(201);
+            expect(response.body.data.name).toBe(maxLengthName);
+        });
+
+        test('FAILURE MODE: should reject invalid priority', async () => {
+            // Act
+            const response = await request(app)
+                .post('/api/tasks')
+                .send({ name: 'Task', priority: '5', status: 'not started' });
+            
+            // Assert
+            expect(response.status).toBe(400);
+            expect(response.body.success).toBe(false);
+            expect(response.body.errors).toContain('Priority must be 1, 2, or 3');
+        });
+
+        test('FAILURE MODE: should reject invalid status', async () => {
+            // Act
+            const response = await request(app)
+                .post('/api/tasks')
+                .send({ name: 'Task', status: 'invalid status' });
+            
+            // Assert
+            expect(response.status).toBe(400);
+            expect(response.body.success).toBe(false);
+            expect(response.body.errors).toContain('Status must be "not started", "in progress", or "completed"');
+        });
+
+        test('EDGE CASE: should generate unique IDs for multiple tasks', async () => {
+            // Act
+            const response1 = await request(app).post('/api/tasks').send({ name: 'Task 1' });
+            const response2 = await request(app).post('/api/tasks').send({ name: 'Task 2' });
+            const response3 = await request(app).post('/api/tasks').send({ name: 'Task 3' });
+            
+            // Assert
+            expect(response1.body.data.id).toBeDefined();
+            expect(response2.body.data.id).toBeDefined();
+            expect(response3.body.data.id).toBeDefined();
+            expect(response1.body.data.id).not.toBe(response2.body.data.id);
+            expect(response2.body.data.id).not.toBe(response3.body.data.id);
+        });
+
+        test('EDGE CASE: should handle special characters in task name', async () => {
+            // Act
+            const response = await request(app)
+                .post('/api/tasks')
+                .send({ name: '<script>alert("XSS")</script>', status: 'not started' });
+            
+            // Assert
+            expect(response.status).toBe(201);
+            expect(response.body.data.name).toBe('<script>alert("XSS")</script>');
+        });
+
+        test('EDGE CASE: should handle unicode characters in task name', async () => {
+            // Act
+            const response = await request(app)
+                .post('/api/tasks')
+                .send({ name: '测试任务 🚀', status: 'not started' });
+            
+            // Assert
+            expect(response.status).toBe(201);
+            expect(response.body.data.name).toBe('测试任务 🚀');
+        });
+    });
+
+    describe('POST /api/tasks/bulk', () => {
+        
+        beforeEach(async () => {
+            await cleanupStorage();
+        });
+
+        test('HAPPY PATH: should create all tasks in one request', async () => {
+            // Act
+            const response = await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [
+                    { name: 'Task 1' },
+                    { name: '  Task 2  ', priority: 3, status: 'In Progress' }
+                ] });
+            
+            // Assert
+            expect(response.status).toBe(201);
+            expect(response.body.success).toBe(true);
+            expect(response.body.count).toBe(2);
+            expect(response.body.data[0]).toMatchObject({ name: 'Task 1', priority: '1', status: 'not started' });
+            expect(response.body.data[1]).toMatchObject({ name: 'Task 2', priority: '3', status: 'in progress' });
+            expect(response.body.data[1].id).toBe(response.body.data[0].id + 1);
+        });
+
+        test('HAPPY PATH: should persist created tasks', async () => {
+            // Act
+            await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'Task 1' }, { name: 'Task 2' }, { name: 'Task 3' }] });
+            
+            // Assert
+            const parsedData = await readStoredTasks();
+            expect(parsedData.tasks).toHaveLength(3);
+            expect(parsedData.nextId).toBe(4);
+        });
+
+        test('FAILURE MODE: should reject the whole batch when one task is invalid', async () => {
+            // Act
+            const response = await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'Valid' }, { name: '' }, { name: 'Bad priority', priority: '9' }] });
+            
+            // Assert
+            expect(response.status).toBe(400);
+            expect(response.body.success).toBe(false);
+            expect(response.body.errors.map(e => e.index)).toEqual([1, 2]);
+            const getResponse = await request(app).get('/api/tasks');
+            expect(getResponse.body.data).toHaveLength(0);
+        });
+
+        test('FAILURE MODE: should return 400 when tasks array is missing or empty', async () => {
+            // Act
+            const missingResponse = await request(app).post('/api/tasks/bulk').send({});
+            const emptyResponse = await request(app).post('/api/tasks/bulk').send({ tasks: [] });
+            
+            // Assert
+            expect(missingResponse.status).toBe(400);
+            expect(emptyResponse.status).toBe(400);
         });
+    });
 
-        test('FAILURE MODE: should reject task with name exceeding max length', async () => {
+    describe('POST /api/tasks/batch', () => {
+        
+        beforeEach(async () => {
+            await cleanupStorage();
+        });
+
+        test('HAPPY PATH: should apply creates, updates and deletes in order', async () => {
             // Arrange
-            const longName = 'a'.repeat(201);
+            const seeded = await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'Keep' }, { name: 'Remove' }] });
+            const [keep, remove] = seeded.body.data;
             
             // Act
             const response = await request(app)
-                .post('/api/tasks')
-                .send({ name: longName, status: 'not started' });
+                .post('/api/tasks/batch')
+                .send({ operations: [
+                    { op: 'create', name: 'New', priority: '2' },
+                    { op: 'update', id: keep.id, status: 'completed' },
+                    { op: 'delete', id: remove.id }
+                ] });
             
             // Assert
-            expect(response.status).toBe(400);
-            expect(response.body.success).toBe(false);
-            expect(response.body.errors).toContain('Task name cannot exceed 200 characters');
+            expect(response.status).toBe(200);
+            expect(response.body.success).toBe(true);
+            expect(response.body.count).toBe(3);
+            expect(response.body.data.map(result => result.op)).toEqual(['create', 'update', 'delete']);
+            expect(response.body.data[0].data).toMatchObject({ name: 'New', priority: '2', status: 'not started' });
+            expect(response.body.data[1].data).toMatchObject({ id: keep.id, status: 'completed' });
+            expect(response.body.data[2].data.id).toBe(remove.id);
+            const getResponse = await request(app).get('/api/tasks');
+            expect(getResponse.body.data.map(task => task.name)).toEqual(['Keep', 'New']);
         });
 
-        test('EDGE CASE: should accept task name at exactly max length (200 chars)', async () => {
+        test('HAPPY PATH: should persist the whole batch as one log entry', async () => {
             // Arrange
-            const maxLengthName = 'a'.repeat(200);
+            const seeded = await request(app)
+                .post('/api/tasks/bulk')
+                .send({ tasks: [{ name: 'Task 1' }, { name: 'Task 2' }, { name: 'Task 3' }] });
+            const ids = seeded.body.data.map(task => task.id);
+            await taskLog.flush();
+            const appendsBefore = taskLog.stats.appends;
             
             // Act
-            const response = await request(app)
-                .post('/api/tasks')
-                .send({ name: maxLengthName, status: 'not started' });
+            await request(app)
+                .post('/api/tasks/batch')
+                .send({ operations: [
+                    ...ids.slice(0, 2).map(id => ({ op: 'update', id, status: 'completed' })),
+                    { op: 'delete', id: ids[2] }
+                ] });
             
             // Assert
-            expect(response.status).toBe(201);
-            expect(response.body.data.name).toBe(maxLengthName);
+            expect(taskLog.stats.appends - appendsBefore).toBe(1);
+            const stored = await readStoredTasks();
+            expect(stored.tasks.map(task => [task.id, task.status])).toEqual([[ids[0], 'completed'], [ids[1], 'completed']]);
         });
 
-        test('FAILURE MODE: should reject invalid priority', async () => {
+        test('FAILURE MODE: should reject the whole batch and report every invalid operation', async () => {
+            // Arrange
+            const created = await request(app).post('/api/tasks').send({ name: 'Untouched' });
+            const id = created.body.data.id;
+            
             // Act
             const response = await request(app)
-                .post('/api/tasks')
-                .send({ name: 'Task', priority: '5', status: 'not started' });
+                .post('/api/tasks/batch')
+                .send({ operations: [
+                    { op: 'update', id, status: 'completed' },
+                    { op: 'create', name: '' },
+                    { op: 'update', id: 999999, status: 'completed' },
+                    { op: 'rename', id },
+                    { op: 'update', id, priority: '7' }
+                ] });
             
             // Assert
             expect(response.status).toBe(400);
             expect(response.body.success).toBe(false);
-            expect(response.body.errors).toContain('Priority must be 1, 2, or 3');
+            expect(response.body.errors.map(e => e.index)).toEqual([1, 2, 3, 4]);
+            expect(response.body.errors[1].errors).toEqual(['Task not found']);
+            const getResponse = await request(app).get(`/api/tasks/${id}`);
+            expect(getResponse.body.data.status).toBe('not started');
         });
 
-        test('FAILURE MODE: should reject invalid status', async () => {
+        test('EDGE CASE: should validate operations against the earlier operations in the batch', async () => {
+            // Arrange
+            const created = await request(app).post('/api/tasks').send({ name: 'Doomed' });
+            const id = created.body.data.id;
+            
             // Act
             const response = await request(app)
-                .post('/api/tasks')
-                .send({ name: 'Task', status: 'invalid status' });
+                .post('/api/tasks/batch')
+                .send({ operations: [{ op: 'delete', id }, { op: 'update', id, status: 'completed' }, { op: 'delete', id }] });
             
             // Assert
             expect(response.status).toBe(400);
-            expect(response.body.success).toBe(false);
-            expect(response.body.errors).toContain('Status must be "not started", "in progress", or "completed"');
+            expect(response.body.errors.map(e => e.index)).toEqual([1, 2]);
+            expect((await request(app).get(`/api/tasks/${id}`)).status).toBe(200);
         });
 
-        test('EDGE CASE: should generate unique IDs for multiple tasks', async () => {
-            // Act
-            const response1 = await request(app).post('/api/tasks').send({ name: 'Task 1' });
-            const response2 = await request(app).post('/api/tasks').send({ name: 'Task 2' });
-            const response3 = await request(app).post('/api/tasks').send({ name: 'Task 3' });
+        test('EDGE CASE: should default empty priority and status the same way as a single create', async () => {
+            // Arrange
+            const fields = { name: 'Defaults', priority: '', status: '' };
             
-            // Assert
-            expect(response1.body.data.id).toBeDefined();
-            expect(response2.body.data.id).toBeDefined();
-            expect(response3.body.data.id).toBeDefined();
-            expect(response1.body.data.id).not.toBe(response2.body.data.id);
-            expect(response2.body.data.id).not.toBe(response3.body.data.id);
-        });
-
-        test('EDGE CASE: should handle special characters in task name', async () => {
             // Act
-            const response = await request(app)
-                .post('/api/tasks')
-                .send({ name: '<script>alert("XSS")</script>', status: 'not started' });
+            const single = await request(app).post('/api/tasks').send(fields);
+            const bulk = await request(app).post('/api/tasks/bulk').send({ tasks: [fields] });
+            const batch = await request(app).post('/api/tasks/batch').send({ operations: [{ op: 'create', ...fields }] });
             
             // Assert
-            expect(response.status).toBe(201);
-            expect(response.body.data.name).toBe('<script>alert("XSS")</script>');
+            const expected = { name: 'Defaults', priority: '1', status: 'not started' };
+            expect(single.body.data).toMatchObject(expected);
+            expect(bulk.body.data[0]).toMatchObject(expected);
+            expect(batch.body.data[0].data).toMatchObject(expected);
         });
 
-        test('EDGE CASE: should handle unicode characters in task name', async () => {
+        test('FAILURE MODE: should return 400 when operations are missing, empty or too many', async () => {
             // Act
-            const response = await request(app)
-                .post('/api/tasks')
-                .send({ name: '测试任务 🚀', status: 'not started' });
+            const missingResponse = await request(app).post('/api/tasks/batch').send({});
+            const emptyResponse = await request(app).post('/api/tasks/batch').send({ operations: [] });
+            const tooManyResponse = await request(app)
+                .post('/api/tasks/batch')
+                .send({ operations: Array.from({ length: 10001 }, () => ({ op: 'create', name: 'Task' })) });
             
             // Assert
-            expect(response.status).toBe(201);
-            expect(response.body.data.name).toBe('测试任务 🚀');
+            expect(missingResponse.status).toBe(400);
+            expect(emptyResponse.status).toBe(400);
+            expect(tooManyResponse.status).toBe(400);
         });
     });
 
@@ -454,8 +1268,7 @@ describe('Todo API - Comprehensive Test Suite', () => {
                 .send({ status: 'completed' });
             
             // Assert
-            const fileData = await fs.readFile(TEST_STORAGE_FILE, 'utf8');
-            const parsedData = JSON.parse(fileData);
+            const parsedData = await readStoredTasks();
             expect(parsedData.tasks[0].status).toBe('completed');
         });
 
@@ -623,8 +1436,7 @@ describe('Todo API - Comprehensive Test Suite', () => {
             await request(app).delete(`/api/tasks/${taskId}`);
             
             // Assert
-            const fileData = await fs.readFile(TEST_STORAGE_FILE, 'utf8');
-            const parsedData = JSON.parse(fileData);
+            const parsedData = await readStoredTasks();
             expect(parsedData.tasks).toHaveLength(0);
         });
 
@@ -682,6 +1494,478 @@ describe('Todo API - Comprehensive Test Suite', () => {
         });
     });
 
+    describe('POST /api/test/reset', () => {
+        
+        beforeEach(async () => {
+            await cleanupStorage();
+        });
+
+        test('HAPPY PATH: should delete all tasks in one request', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Task 1' });
+            await request(app).post('/api/tasks').send({ name: 'Task 2' });
+            
+            // Act
+            const response = await request(app).post('/api/test/reset');
+            
+            // Assert
+            expect(response.status).toBe(200);
+            expect(response.body.success).toBe(true);
+            expect(response.body.count).toBe(2);
+            const getResponse = await request(app).get('/api/tasks');
+            expect(getResponse.body.data).toHaveLength(0);
+        });
+
+        test('HAPPY PATH: should persist the reset before responding', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Task' });
+            
+            // Act
+            await request(app).post('/api/test/reset');
+            
+            // Assert
+            const parsedData = await readStoredTasks();
+            expect(parsedData.tasks).toHaveLength(0);
+            expect(parsedData.nextId).toBe(1);
+        });
+    });
+
+    describe('Task log persistence', () => {
+        
+        beforeEach(async () => {
+            await cleanupStorage();
+        });
+
+        test('HAPPY PATH: should append changes to the log instead of rewriting the snapshot', async () => {
+            // Act
+            await request(app).post('/api/tasks').send({ name: 'Logged Task' });
+            
+            // Assert
+            const logData = await fs.readFile(TEST_LOG_FILE, 'utf8');
+            const entries = logData.trim().split('\n').map(line => JSON.parse(line));
+            expect(entries).toHaveLength(1);
+            expect(entries[0].op).toBe('put');
+            expect(entries[0].tasks[0].name).toBe('Logged Task');
+            await expect(fs.access(TEST_STORAGE_FILE)).rejects.toThrow();
+        });
+
+        test('HAPPY PATH: should group concurrent writes into one log append', async () => {
+            // Arrange
+            const file = path.join(os.tmpdir(), `task-log-${process.pid}.json`);
+            const log = new TaskLog(file, { snapshot: () => ({ tasks: [], nextId: 1 }) });
+            
+            // Act
+            await Promise.all(
+                Array.from({ length: 20 }, (_, i) => log.append({ op: 'put', tasks: [{ id: i + 1, name: `Task ${i}` }], nextId: i + 2 }))
+            );
+            
+            // Assert
+            expect(log.stats).toEqual({ appends: 20, batches: 1, compactions: 0 });
+            const stored = await readState(file);
+            expect(stored.tasks).toHaveLength(20);
+            expect(stored.nextId).toBe(21);
+            await fs.unlink(file + LOG_SUFFIX);
+        });
+
+        test('HAPPY PATH: should replay a logged reset as an empty list with ids from 1', async () => {
+            // Arrange
+            const file = path.join(os.tmpdir(), `task-log-reset-${process.pid}.json`);
+            const log = new TaskLog(file, { snapshot: () => ({ tasks: [], nextId: 1 }) });
+            await log.append({ op: 'put', tasks: [{ id: 1, name: 'Task 1' }, { id: 2, name: 'Task 2' }], nextId: 3 });
+            
+            // Act
+            await log.append({ op: 'reset', nextId: 1 });
+            
+            // Assert
+            const stored = await readState(file);
+            expect(stored.tasks).toEqual([]);
+            expect(stored.nextId).toBe(1);
+            expect(stored.replayed).toBe(2);
+            await fs.unlink(file + LOG_SUFFIX);
+        });
+
+        test('HAPPY PATH: should compact the log into the snapshot on saveTasks', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Task 1' });
+            await request(app).post('/api/tasks').send({ name: 'Task 2' });
+            
+            // Act
+            await saveTasks();
+            
+            // Assert
+            const snapshot = JSON.parse(await fs.readFile(TEST_STORAGE_FILE, 'utf8'));
+            expect(snapshot.tasks).toHaveLength(2);
+            expect(snapshot.nextId).toBe(3);
+            expect(await fs.readFile(TEST_LOG_FILE, 'utf8')).toBe('');
+        });
+
+        test('HAPPY PATH: should replay the log on top of the snapshot when loading', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'In Snapshot' });
+            await saveTasks();
+            const createResponse = await request(app).post('/api/tasks').send({ name: 'In Log' });
+            await request(app).put(`/api/tasks/${createResponse.body.data.id}`).send({ status: 'completed' });
+            serverStore.reset(); // Forget the tasks in memory only
+            
+            // Act
+            await loadTasks();
+            
+            // Assert
+            const response = await request(app).get('/api/tasks');
+            expect(response.body.data.map(task => task.name)).toEqual(['In Snapshot', 'In Log']);
+            expect(response.body.data[1].status).toBe('completed');
+        });
+
+        test('HAPPY PATH: resetStorage should log and compact the reset', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'In Snapshot' });
+            await saveTasks();
+            await request(app).post('/api/tasks').send({ name: 'In Log' });
+            const compactions = taskLog.stats.compactions;
+            
+            // Act
+            const { count } = await resetStorage();
+            await loadTasks();
+            
+            // Assert
+            expect(count).toBe(2);
+            expect(taskLog.stats.compactions).toBe(compactions + 1);
+            expect((await request(app).get('/api/tasks')).body.data).toEqual([]);
+            expect(JSON.parse(await fs.readFile(TEST_STORAGE_FILE, 'utf8')).tasks).toEqual([]);
+        });
+
+        test('EDGE CASE: should ignore a torn last line and stale entries already in the snapshot', async () => {
+            // Arrange
+            await request(app).post('/api/tasks').send({ name: 'Task 1' });
+            await saveTasks();
+            await fs.writeFile(TEST_LOG_FILE, JSON.stringify({ seq: 1, op: 'reset', nextId: 1 }) + '\n{"seq":99,"op":"pu');
+            
+            // Act
+            const stored = await readStoredTasks();
+            
+            // Assert
+            expect(stored.tasks).toHaveLength(1);
+            expect(stored.tasks[0].name).toBe('Task 1');
+            expect(stored.replayed).toBe(0);
+        });
+    });
+
+    describe('TaskStore', () => {
+
+        test('HAPPY PATH: should keep creation order across updates and deletes', () => {
+            // Arrange
+            const store = new TaskStore();
+            ['A', 'B', 'C'].forEach(name => store.create({ name, priority: '1', status: 'not started' }));
+            
+            // Act
+            store.update(1, { status: 'completed' });
+            store.delete(2);
+            store.create({ name: 'D', priority: 2, status: 'In Progress' });
+            
+            // Assert
+            expect(store.list().map(task => task.name)).toEqual(['A', 'C', 'D']);
+            expect(store.get(1).status).toBe('completed');
+            expect(store.get(4)).toEqual({ id: 4, name: 'D', priority: '2', status: 'in progress' });
+            expect(store.snapshot().nextId).toBe(5);
+        });
+
+        test('FAILURE MODE: should return undefined for unknown ids', () => {
+            // Arrange
+            const store = new TaskStore();
+            
+            // Act & Assert
+            expect(store.get(1)).toBeUndefined();
+            expect(store.update(1, { name: 'X' })).toBeUndefined();
+            expect(store.delete(1)).toBeUndefined();
+        });
+
+        test('HAPPY PATH: should page after a cursor across deleted ids', () => {
+            // Arrange
+            const store = new TaskStore();
+            for (let i = 0; i < 3000; i++) {
+                store.create({ name: `Task ${i}`, priority: '1', status: i % 2 ? 'completed' : 'not started' });
+            }
+            for (let id = 1; id <= 2000; id++) {
+                store.delete(id); // Enough deletes to sweep the order index
+            }
+            
+            // Act
+            const first = store.page({ after: 0, limit: 2, filter: task => task.status === 'completed' });
+            const second = store.page({ after: first.nextCursor, limit: 2 });
+            const last = store.page({ after: 2998 });
+            
+            // Assert
+            expect(first.items.map(task => task.id)).toEqual([2002, 2004]);
+            expect(first.nextCursor).toBe(2004);
+            expect(second.items.map(task => task.id)).toEqual([2005, 2006]);
+            expect(last).toEqual({ items: [store.get(2999), store.get(3000)], nextCursor: null });
+            expect(store.order.length).toBeLessThan(3000);
+        });
+
+        test('HAPPY PATH: should keep the search indexes current through updates and deletes', () => {
+            // Arrange
+            const store = new TaskStore();
+            ['Buy milk', 'Buy bread', 'Call mum'].forEach(name => store.create({ name, priority: '1', status: 'not started' }));
+            
+            // Act
+            store.update(1, { name: 'Sell milk', status: 'completed' });
+            store.delete(2);
+            store.create({ name: 'Buy butter', priority: '3', status: 'completed' });
+            
+            // Assert
+            const ids = options => store.search(options).items.map(task => task.id);
+            expect(ids({ terms: ['bu'] })).toEqual([4]);
+            expect(ids({ terms: ['milk'] })).toEqual([1]);
+            expect(ids({ status: 'completed', sort: 'name' })).toEqual([4, 1]);
+            expect(ids({ priority: '1', status: 'not started' })).toEqual([3]);
+            expect(store.index.byWord.has('bread')).toBe(false);
+        });
+
+        test('EDGE CASE: should keep the word lists bounded under create and delete churn', () => {
+            // Arrange
+            const store = new TaskStore();
+            for (let i = 0; i < 100; i++) {
+                store.create({ name: `stable ${i}`, priority: '1', status: 'not started' });
+            }
+            const wordCount = () => store.index.sortedWords.length + store.index.newWords.length;
+            let largest = 0;
+            
+            // Act - a new word per task, with a prefix lookup after every other create
+            for (let i = 0; i < 20000; i++) {
+                const task = store.create({ name: `churn${i}`, priority: '1', status: 'not started' });
+                if (i % 2 === 0) {
+                    expect(store.search({ terms: [`churn${i}`] }).items).toEqual([task]);
+                }
+                store.delete(task.id);
+                largest = Math.max(largest, wordCount());
+            }
+            
+            // Assert
+            expect(largest).toBeLessThan(400);
+            expect(store.search({ terms: ['churn'] }).items).toEqual([]);
+            expect(store.search({ terms: ['stable'] }).items).toHaveLength(100);
+        });
+
+        test('HAPPY PATH: should return the same pages with and without indexes', () => {
+            // Arrange
+            const indexed = new TaskStore();
+            const words = ['red', 'green', 'blue', 'rust', 'gold'];
+            for (let i = 0; i < 2000; i++) {
+                indexed.create({ name: `${words[i % 5]} ${words[(i * 3) % 5]} ${i}`, priority: String(1 + (i % 3)), status: ['not started', 'completed'][i % 2] });
+            }
+            const scanned = new TaskStore({ indexed: false });
+            scanned.load(indexed.snapshot());
+            const pages = (store, options) => {
+                const ids = [];
+                let after = null;
+                do {
+                    const page = store.search({ ...options, after, limit: 100 });
+                    ids.push(...page.items.map(task => task.id));
+                    after = page.nextCursor;
+                } while (after !== null);
+                return ids;
+            };
+            
+            // Act & Assert
+            [
+                { terms: ['r'] },
+                { terms: ['gr', 'blue'], status: 'completed' },
+                { priority: '2', sort: 'name' },
+                { terms: ['gold'], sort: 'status', descending: true },
+                { status: 'not started', descending: true }
+            ].forEach(options => {
+                const expected = pages(scanned, options);
+                expect(expected.length).toBeGreaterThan(0);
+                expect(pages(indexed, options)).toEqual(expected);
+            });
+        });
+
+        test('LOAD: should answer filtered searches over 100k tasks in well under a millisecond', () => {
+            // Arrange
+            const store = new TaskStore();
+            const words = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel'];
+            for (let i = 0; i < 100000; i++) {
+                store.create({ name: `${words[i % 8]} ${words[(i * 3) % 8]} ${i}`, priority: String(1 + (i % 3)), status: ['not started', 'in progress', 'completed'][i % 3] });
+            }
+            const queries = [
+                { status: 'completed', priority: '2', limit: 50 },
+                { terms: ['golf'], limit: 50 },
+                { terms: ['echo', 'hotel'], status: 'in progress', limit: 50 },
+                { terms: ['99999'] }
+            ];
+            queries.forEach(query => store.search(query)); // Warm up
+            
+            // Act
+            const start = process.hrtime.bigint();
+            for (let i = 0; i < 100; i++) {
+                queries.forEach(query => store.search(query));
+            }
+            const averageMs = Number(process.hrtime.bigint() - start) / 1e6 / (100 * queries.length);
+            
+            // Assert
+            expect(averageMs).toBeLessThan(1);
+        });
+
+        test('LOAD: should look up tasks in a large store without scanning', () => {
+            // Arrange
+            const store = new TaskStore();
+            const tasks = Array.from({ length: 100000 }, (_, i) => ({ id: i + 1, name: `Task ${i}`, priority: '1', status: 'not started' }));
+            store.load({ tasks, nextId: 100001 });
+            
+            // Act
+            const start = process.hrtime.bigint();
+            for (let id = 100000; id > 90000; id--) {
+                store.get(id);
+                store.update(id, { status: 'completed' });
+            }
+            for (let id = 1; id <= 10000; id++) {
+                store.delete(id);
+            }
+            const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+            
+            // Assert - 30k operations; a linear scan per operation would take seconds
+            expect(store.size).toBe(90000);
+            expect(elapsedMs).toBeLessThan(500);
+        });
+    });
+
+    describe('Cluster replication', () => {
+
+        // One IPC channel between the primary and a worker; messages arrive asynchronously and in order
+        function connect(primary, { drop = () => false } = {}) {
+            const EventEmitter = require('events');
+            const workerSide = new EventEmitter();
+            const primarySide = new EventEmitter();
+            workerSide.send = message => setImmediate(() => primary.handle(primarySide, structuredClone(message)));
+            primarySide.send = message => {
+                if (!drop(message)) {
+                    setImmediate(() => workerSide.emit('message', structuredClone(message)));
+                }
+            };
+            primary.addWorker(primarySide);
+            return new ClusterReplica(new TaskStore(), { channel: workerSide });
+        }
+
+        function createPrimary(store = new TaskStore()) {
+            const entries = [];
+            const primary = new ReplicationPrimary(store, {
+                persist: async entry => { entries.push(entry); },
+                compact: async () => {},
+                storageStats: () => ({ appends: entries.length })
+            });
+            return { primary, store, entries };
+        }
+
+        const settle = () => new Promise(resolve => setTimeout(resolve, 20));
+
+        test('HAPPY PATH: should keep every replica identical to the primary', async () => {
+            // Arrange
+            const { primary, store } = createPrimary();
+            store.create({ name: 'Before Start', priority: '2', status: 'not started' });
+            const replicas = [connect(primary), connect(primary), connect(primary)];
+            await Promise.all(replicas.map(replica => replica.start()));
+            
+            // Act
+            const created = await Promise.all(Array.from({ length: 30 }, (_, i) => replicas[i % 3].create({ name: `Task ${i}` })));
+            await Promise.all(created.filter((_, i) => i % 2).map(({ task }, i) => replicas[i % 3].delete(task.id)));
+            await replicas[0].update(created[0].task.id, { status: 'completed' });
+            await replicas[1].batch([{ op: 'create', name: 'Batched' }, { op: 'delete', id: 1 }]);
+            await settle();
+            
+            // Assert
+            const ids = created.map(({ task }) => task.id);
+            expect(new Set(ids).size).toBe(30);
+            replicas.forEach(replica => {
+                expect(replica.store.list()).toEqual(store.list());
+                expect(replica.store.version).toBe(store.version);
+                expect(replica.store.nextId).toBe(store.nextId);
+                expect(replica.store.changesSince(store.version - 10)).toEqual(store.changesSince(store.version - 10));
+            });
+        });
+
+        test('HAPPY PATH: should read its own write as soon as the write resolves', async () => {
+            // Arrange
+            const { primary } = createPrimary();
+            const replica = connect(primary);
+            await replica.start();
+            
+            // Act
+            const { task } = await replica.create({ name: 'Mine', priority: '3' });
+            
+            // Assert
+            expect(replica.store.get(task.id)).toEqual(task);
+            expect(replica.storageStats).toEqual({ appends: 1 });
+        });
+
+        test('FAILURE MODE: should return validation errors and not-found from the primary without changing anything', async () => {
+            // Arrange
+            const { primary, store } = createPrimary();
+            const replica = connect(primary);
+            await replica.start();
+            const version = store.version;
+            
+            // Act
+            const invalid = await replica.create({ name: '   ' });
+            const missing = await replica.update(99, { status: 'completed' });
+            
+            // Assert
+            expect(invalid.errors).toEqual(['Task name cannot be empty or whitespace only']);
+            expect(missing).toEqual({ notFound: true });
+            expect(store.version).toBe(version);
+        });
+
+        test('EDGE CASE: should resync after missing a change', async () => {
+            // Arrange
+            const { primary, store } = createPrimary();
+            let dropNext = false;
+            const replica = connect(primary, { drop: message => message.type === 'apply' && dropNext && !(dropNext = false) });
+            const writer = connect(primary);
+            await Promise.all([replica.start(), writer.start()]);
+            
+            // Act
+            dropNext = true;
+            await writer.create({ name: 'Lost In Transit' });
+            await writer.create({ name: 'After The Gap' });
+            await settle();
+            
+            // Assert
+            expect(replica.store.list()).toEqual(store.list());
+            expect(replica.store.version).toBe(store.version);
+        });
+
+        test('EDGE CASE: should record a replicated delete of a task the replica does not have', async () => {
+            // Arrange
+            const replicaStore = new TaskStore();
+            
+            // Act
+            const applied = replicaStore.applyReplicated([{ op: 'delete', id: 7 }], 8, 1);
+            const skipped = replicaStore.applyReplicated([], 8, 3);
+            
+            // Assert
+            expect(applied).toBe(true);
+            expect(skipped).toBe(false);
+            expect(replicaStore.version).toBe(1);
+            expect(replicaStore.changesSince(0).deleted).toEqual([7]);
+        });
+
+        test('EDGE CASE: should restart ids on every replica after a reset', async () => {
+            // Arrange
+            const { primary } = createPrimary();
+            const replicas = [connect(primary), connect(primary)];
+            await Promise.all(replicas.map(replica => replica.start()));
+            await replicas[0].create({ name: 'Old' });
+            
+            // Act
+            await replicas[1].reset();
+            const { task } = await replicas[0].create({ name: 'New' });
+            await settle();
+            
+            // Assert
+            expect(task.id).toBe(1);
+            expect(replicas[1].store.list()).toEqual([task]);
+        });
+    });
+
     describe('Integration Tests', () => {
         
         beforeEach(async () => {
@@ -728,8 +2012,7 @@ describe('Todo API - Comprehensive Test Suite', () => {
             expect(response.body.data).toHaveLength(3);
             
             // Verify storage file
-            const fileData = await fs.readFile(TEST_STORAGE_FILE, 'utf8');
-            const parsedData = JSON.parse(fileData);
+            const parsedData = await readStoredTasks();
             expect(parsedData.tasks).toHaveLength(3);
         });
 
@@ -0,0 +1,181 @@
+const { TaskWriter } = require('./task-writer');
+
+// Keeping worker processes consistent in cluster mode (see cluster.js)
+//
+// The primary process is the only writer. It holds the authoritative
+// TaskStore and TaskLog and runs every write through one TaskWriter, so ids
+// come from a single `nextId` and writes are applied one at a time. Right
+// after each write it broadcasts the store-level changes (create, update,
+// delete, reset, with each task's new state) to every worker, in order.
+//
+// Each worker keeps a replica store that answers reads locally, sends its
+// writes to the primary, and applies the broadcasts to reach exactly the
+// primary's version. So `version`, GET /api/tasks/changes and the SSE stream
+// agree across workers. The primary replies to a write after the broadcast
+// for it, and IPC keeps order, so a worker always reads its own writes. A
+// replica that sees a gap in the versions asks for a full copy again.
+
+const WRITE_METHODS = ['create', 'createMany', 'update', 'delete', 'batch', 'reset'];
+
+class ReplicationPrimary {
+    // `persist` and `compact` are the storage functions a TaskWriter takes
+    constructor(store, { persist, compact, storageStats = () => ({}) }) {
+        this.store = store;
+        this.storageStats = storageStats;
+        this.workers = new Set(); // Anything with send(message), such as cluster workers
+        this.pending = []; // Changes made since the last broadcast
+        this.version = store.version;
+        store.onChange = (op, id) => this.pending.push({ op, id });
+        this.writer = new TaskWriter(store, {
+            persist: entry => {
+                this.broadcast();
+                return persist(entry);
+            },
+            compact: () => {
+                this.broadcast();
+                return compact();
+            }
+        });
+    }
+
+    addWorker(worker) {
+        this.workers.add(worker);
+    }
+
+    removeWorker(worker) {
+        this.workers.delete(worker);
+    }
+
+    // Send the changes made since the last broadcast to every worker
+    broadcast() {
+        if (this.pending.length === 0) {
+            return;
+        }
+        const ops = this.pending.map(({ op, id }) => {
+            const task = op === 'create' || op === 'update' ? this.store.get(id) : undefined;
+            return task ? { op, id, task: { ...task } } : { op, id };
+        });
+        this.pending = [];
+        const message = { type: 'apply', from: this.version, version: this.store.version, nextId: this.store.nextId, ops };
+        this.version = this.store.version;
+        this.workers.forEach(worker => worker.send(message));
+    }
+
+    async handle(worker, message) {
+        if (message.type === 'sync') {
+            this.broadcast();
+            worker.send({ type: 'sync', state: this.store.replicaState() });
+            return;
+        }
+        if (message.type !== 'write') {
+            return;
+        }
+        const { requestId, method, args } = message;
+        try {
+            if (!WRITE_METHODS.includes(method)) {
+                throw new Error(`Unknown write method: ${method}`);
+            }
+            const result = await this.writer[method](...args);
+            worker.send({ type: 'result', requestId, result, storage: this.storageStats() });
+        } catch (error) {
+            worker.send({ type: 'result', requestId, error: error.message });
+        }
+    }
+}
+
+// Worker side: a replica of the primary's store, and a TaskWriter stand-in that forwards writes
+class ClusterReplica {
+    constructor(store, { channel = process, onChange = () => {} } = {}) {
+        this.store = store;
+        this.channel = channel;
+        this.onChange = onChange;
+        this.synced = false;
+        this.syncWaiters = [];
+        this.requests = new Map(); // request id -> { resolve, reject }
+        this.nextRequestId = 1;
+        this.storageStats = {}; // The primary's task log stats as of the last write
+        channel.on('message', message => this.handle(message));
+    }
+
+    // Resolves once the replica holds a full copy of the primary's store
+    start() {
+        return new Promise(resolve => {
+            this.syncWaiters.push(resolve);
+            this.requestSync();
+        });
+    }
+
+    requestSync() {
+        this.synced = false;
+        this.channel.send({ type: 'sync' });
+    }
+
+    handle(message) {
+        if (message.type === 'sync') {
+            this.store.loadReplica(message.state);
+            this.synced = true;
+            this.syncWaiters.splice(0).forEach(resolve => resolve());
+            this.onChange();
+        } else if (message.type === 'apply') {
+            if (!this.synced) {
+                return; // Already part of the full copy on its way
+            }
+            if (message.from !== this.store.version) {
+                this.requestSync();
+                return;
+            }
+            if (!this.store.applyReplicated(message.ops, message.nextId, message.version)) {
+                // Diverged from the primary; start again from a full copy
+                this.requestSync();
+                return;
+            }
+            this.onChange();
+        } else if (message.type === 'result') {
+            const request = this.requests.get(message.requestId);
+            if (!request) {
+                return;
+            }
+            this.requests.delete(message.requestId);
+            if (message.error) {
+                request.reject(new Error(message.error));
+            } else {
+                this.storageStats = message.storage;
+                request.resolve(message.result);
+            }
+        }
+    }
+
+    write(method, args) {
+        return new Promise((resolve, reject) => {
+            const requestId = this.nextRequestId++;
+            this.requests.set(requestId, { resolve, reject });
+            this.channel.send({ type: 'write', requestId, method, args });
+        });
+    }
+
+    create(input) {
+        return this.write('create', [input]);
+    }
+
+    createMany(items) {
+        return this.write('createMany', [items]);
+    }
+
+    update(id, fields) {
+        return this.write('update', [id, fields]);
+    }
+
+    delete(id) {
+        return this.write('delete', [id]);
+    }
+
+    batch(operations) {
+        return this.write('batch', [operations]);
+    }
+
+    reset() {
+        return this.write('reset', []);
+    }
+}
+
+module.exports = { ReplicationPrimary, ClusterReplica };
@@ -0,0 +1,88 @@
+const cluster = require('cluster');
+const os = require('os');
+const path = require('path');
+const { TaskLog } = require('./task-log');
+const { TaskStore } = require('./task-store');
+const { ReplicationPrimary } = require('./cluster-replication');
+
+// Cluster mode: `node cluster.js` runs CLUSTER_WORKERS copies of server.js
+// (default: one per CPU) behind one port. This process serves no HTTP; it
+// owns storage and applies every write, and the workers keep replicas of its
+// store (see cluster-replication.js). Takes the same environment variables
+// as server.js.
+
+const WORKERS = parseInt(process.env.CLUSTER_WORKERS, 10) || (os.availableParallelism ? os.availableParallelism() : os.cpus().length);
+const STORAGE_FILE = process.env.TASKS_FILE ? path.resolve(process.env.TASKS_FILE) : path.join(__dirname, 'tasks.json');
+
+const store = new TaskStore({ maxChanges: parseInt(process.env.TASKS_MAX_CHANGES, 10) || undefined });
+const taskLog = new TaskLog(STORAGE_FILE, {
+    snapshot: () => store.snapshot(),
+    compactBytes: parseInt(process.env.TASKS_COMPACT_BYTES, 10) || undefined,
+    fsync: process.env.TASKS_FSYNC === 'true'
+});
+const primary = new ReplicationPrimary(store, {
+    persist: entry => taskLog.append({ ...entry, nextId: store.nextId }),
+    compact: () => taskLog.compact(),
+    storageStats: () => ({ ...taskLog.stats })
+});
+
+// Every worker uses the same version epoch, so versions from one are valid on all
+const VERSION_EPOCH = Date.now().toString(36);
+let shuttingDown = false;
+
+function fork() {
+    const worker = cluster.fork({ TASKS_CLUSTER_WORKER: 'true', TASKS_VERSION_EPOCH: VERSION_EPOCH });
+    primary.addWorker(worker);
+    worker.on('message', message => primary.handle(worker, message));
+    let listening = false;
+    worker.once('listening', () => {
+        listening = true;
+    });
+    worker.on('exit', (code, signal) => {
+        primary.removeWorker(worker);
+        if (shuttingDown) {
+            return;
+        }
+        if (!listening) {
+            // Failing on startup: a new worker would only fail the same way
+            console.error(`Worker ${worker.process.pid} exited (${signal || code}) before it started listening`);
+            shutdown(1);
+            return;
+        }
+        console.error(`Worker ${worker.process.pid} exited (${signal || code}), starting a new one`);
+        fork();
+    });
+}
+
+async function startCluster() {
+    const state = await taskLog.load();
+    store.load(state);
+    console.log(`Loaded ${store.size} tasks from storage; starting ${WORKERS} workers`);
+
+    cluster.setupPrimary({ exec: path.join(__dirname, 'server.js'), serialization: 'advanced' });
+    for (let i = 0; i < WORKERS; i++) {
+        fork();
+    }
+
+    process.once('SIGINT', () => shutdown(0));
+    process.once('SIGTERM', () => shutdown(0));
+}
+
+// Stop the workers, then fold the log into a snapshot so the next start has nothing to replay
+async function shutdown(code) {
+    if (shuttingDown) {
+        return;
+    }
+    shuttingDown = true;
+    Object.values(cluster.workers).forEach(worker => worker.kill());
+    try {
+        await taskLog.compact();
+    } finally {
+        process.exit(code);
+    }
+}
+
+startCluster().catch(error => {
+    console.error('Failed to start cluster:', error);
+    process.exit(1);
+});
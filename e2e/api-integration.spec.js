@@ -2,6 +2,7 @@ const { test, expect } = require('@playwright/test');
 const { TodoPage } = require('./page-objects/TodoPage');
 const fs = require('fs').promises;
 const path = require('path');
+const { readState, LOG_SUFFIX } = require('../task-log');
 
 test.describe('TO-DO List Application - API Integration', () => {
   let todoPage;
@@ -10,11 +11,13 @@ test.describe('TO-DO List Application - API Integration', () => {
   test.beforeEach(async ({ page }) => {
     todoPage = new TodoPage(page);
     
-    // Clean up tasks.json and reset server state
-    try {
-      await fs.unlink(tasksFile);
-    } catch (err) {
-      // File doesn't exist, that's OK
+    // Clean up tasks.json (and its change log) and reset server state
+    for (const file of [tasksFile, tasksFile + LOG_SUFFIX]) {
+      try {
+        await fs.unlink(file);
+      } catch (err) {
+        // File doesn't exist, that's OK
+      }
     }
     
     // Wait a bit for file deletion to complete
@@ -68,8 +71,7 @@ test.describe('TO-DO List Application - API Integration', () => {
 
     // And tasks.json should contain the task
     await todoPage.page.waitForTimeout(500);
-    const fileContent = await fs.readFile(tasksFile, 'utf8');
-    const data = JSON.parse(fileContent);
+    const data = await readState(tasksFile);
     expect(data.tasks).toBeDefined();
     expect(data.tasks.length).toBeGreaterThan(0);
     // Just verify a task with that name exists
@@ -107,8 +109,7 @@ test.describe('TO-DO List Application - API Integration', () => {
     expect(status).toContain('Completed');
 
     // And tasks.json should reflect the update
-    const fileContent = await fs.readFile(tasksFile, 'utf8');
-    const data = JSON.parse(fileContent);
+    const data = await readState(tasksFile);
     const task = data.tasks.find(t => t.name === 'API Task to Update');
     expect(task.status).toBe('completed');
   });
@@ -144,8 +145,7 @@ test.describe('TO-DO List Application - API Integration', () => {
     await expect(task).toHaveCount(0);
 
     // And tasks.json should not contain the task
-    const fileContent = await fs.readFile(tasksFile, 'utf8');
-    const data = JSON.parse(fileContent);
+    const data = await readState(tasksFile);
     const deletedTask = data.tasks.find(t => t.name === 'API Task to Delete');
     expect(deletedTask).toBeUndefined();
   });
@@ -205,9 +205,9 @@ test.describe('TO-DO List Application - API Integration', () => {
     await todoPage.addTask('Persistent Task 3', '3', 'completed');
     await todoPage.page.waitForTimeout(1000);
 
-    // Verify tasks.json was created
-    const fileExists = await fs.access(tasksFile).then(() => true).catch(() => false);
-    expect(fileExists).toBe(true);
+    // Verify the tasks were persisted (tasks.json snapshot plus its change log)
+    const stored = await readState(tasksFile);
+    expect(stored.tasks).toHaveLength(3);
 
     // Simulate "restart" by opening a new page (API server keeps running)
     const newPage = await context.newPage();
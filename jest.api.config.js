@@ -19,6 +19,13 @@ module.exports = {
     // Coverage configuration
     collectCoverageFrom: [
         'server.js',
+        'task-log.js',
+        'task-store.js',
+        'task-writer.js',
+        'cluster-replication.js',
+        'static-assets.js',
+        'task-index.js',
+        'task-columns.js',
         '!node_modules/**',
         '!coverage/**'
     ],
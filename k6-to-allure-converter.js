@@ -2,6 +2,55 @@ const fs = require('fs');
 const path = require('path');
 const { v4: uuidv4 } = require('uuid');
 
+const SUMMARY_SUFFIX = '.summary.json';
+
+function countSummaryChecks(summary) {
+    const checks = Object.values(summary.checks || {});
+    const failedChecks = checks.reduce((sum, check) => sum + check.fails, 0);
+    return {
+        totalChecks: checks.reduce((sum, check) => sum + check.passes + check.fails, 0),
+        failedChecks,
+        hasRequests: Boolean(summary.metrics && summary.metrics.http_reqs)
+    };
+}
+
+function countRawChecks(k6File) {
+    // Fallback when no summary exists: read the whole stream of JSON objects
+    const k6Data = fs.readFileSync(k6File, 'utf8')
+        .split('\n')
+        .filter(line => line.trim())
+        .map(line => JSON.parse(line));
+
+    const checks = k6Data.filter(item =>
+        item.type === 'Point' &&
+        item.data.tags &&
+        item.data.tags.check
+    );
+
+    return {
+        totalChecks: checks.length,
+        failedChecks: checks.filter(check => check.data.value === 0).length,
+        hasRequests: k6Data.some(item => item.type === 'Metric' && item.data.name === 'http_reqs')
+    };
+}
+
+function summaryParameters(summary) {
+    const parameters = [];
+    const duration = summary.metrics.http_req_duration;
+    if (duration) {
+        ['p50', 'p95', 'p99', 'max'].forEach(key => {
+            parameters.push({ name: `http_req_duration ${key}`, value: `${duration[key].toFixed(2)} ms` });
+        });
+    }
+    if (summary.throughput) {
+        parameters.push({ name: 'Peak Throughput', value: `${summary.throughput.peak_rps.toFixed(1)} req/s` });
+    }
+    if (summary.errors && summary.errors.length) {
+        parameters.push({ name: 'Errors', value: summary.errors.map(error => `${error.error_code} ${error.error}: ${error.count}`).join('; ') });
+    }
+    return parameters;
+}
+
 function convertK6ToAllure(k6ResultsDir, allureResultsDir) {
     console.log('🔄 Converting K6 results to Allure format...');
 
@@ -10,9 +59,9 @@ function convertK6ToAllure(k6ResultsDir, allureResultsDir) {
         fs.mkdirSync(allureResultsDir, { recursive: true });
     }
 
-    // Get all K6 result files
+    // Get all K6 result files (summaries written by tests/perf/k6_analyzer.py sit next to them)
     const k6Files = fs.readdirSync(k6ResultsDir)
-        .filter(file => file.endsWith('.json'))
+        .filter(file => file.endsWith('.json') && !file.endsWith(SUMMARY_SUFFIX))
         .map(file => path.join(k6ResultsDir, file));
 
     console.log(`Found ${k6Files.length} K6 result files`);
@@ -21,37 +70,21 @@ function convertK6ToAllure(k6ResultsDir, allureResultsDir) {
         try {
             const fileName = path.basename(k6File, '.json');
             const testName = fileName.replace('k6-results-', '').replace(/-/g, ' ');
-
-            // Read and parse K6 JSON (it's a stream of JSON objects)
-            const k6Data = fs.readFileSync(k6File, 'utf8')
-                .split('\n')
-                .filter(line => line.trim())
-                .map(line => JSON.parse(line));
-
-            // Extract basic metrics
-            const metrics = {};
-            k6Data.forEach(item => {
-                if (item.type === 'Metric') {
-                    metrics[item.data.name] = item.data;
-                }
-            });
-
-            // Find check results
-            const checks = k6Data.filter(item =>
-                item.type === 'Point' &&
-                item.data.tags &&
-                item.data.tags.check
-            );
-
-            // Calculate test status based on checks
-            const failedChecks = checks.filter(check => check.data.value === 0).length;
+            const summaryFile = path.join(k6ResultsDir, `${fileName}${SUMMARY_SUFFIX}`);
+            const summary = fs.existsSync(summaryFile)
+                ? JSON.parse(fs.readFileSync(summaryFile, 'utf8'))
+                : null;
+
+            const { totalChecks, failedChecks, hasRequests } = summary
+                ? countSummaryChecks(summary)
+                : countRawChecks(k6File);
             const status = failedChecks === 0 ? 'passed' : 'failed';
 
             // Create Allure result
             const allureResult = {
                 name: `K6 Performance Test: ${testName}`,
                 status: status,
-                description: `Performance test results for ${testName}\n\nFailed checks: ${failedChecks}/${checks.length}`,
+                description: `Performance test results for ${testName}\n\nFailed checks: ${failedChecks}/${totalChecks}`,
                 start: Date.now() - 30000, // Assume 30 seconds ago
                 stop: Date.now(),
                 uuid: uuidv4(),
@@ -70,14 +103,25 @@ function convertK6ToAllure(k6ResultsDir, allureResultsDir) {
             };
 
             // Add some basic metrics as steps or parameters
-            if (metrics.http_reqs) {
+            if (hasRequests) {
                 allureResult.parameters = [
-                    { name: 'Total Requests', value: checks.length.toString() },
+                    { name: 'Total Requests', value: totalChecks.toString() },
                     { name: 'Failed Checks', value: failedChecks.toString() },
                     { name: 'Status', value: status }
                 ];
             }
 
+            if (summary) {
+                allureResult.parameters = (allureResult.parameters || []).concat(summaryParameters(summary));
+
+                // Attach the full summary (percentiles, tag breakdowns, errors, throughput windows)
+                const attachmentName = `${uuidv4()}-attachment.json`;
+                fs.copyFileSync(summaryFile, path.join(allureResultsDir, attachmentName));
+                allureResult.attachments = [
+                    { name: 'K6 summary', source: attachmentName, type: 'application/json' }
+                ];
+            }
+
             // Write Allure result
             const allureFileName = `${uuidv4()}-result.json`;
             const allureFilePath = path.join(allureResultsDir, allureFileName);
@@ -6,9 +6,18 @@ export let options = {
   duration: '30s',
 };
 
+// What a browser sends; the server answers with its precompressed variants
+const params = { headers: { 'Accept-Encoding': 'br, gzip' } };
+
 export default function () {
   const url = 'http://localhost:3000';
-  let res = http.get(url);
+  let res = http.get(url, params);
   check(res, { 'status is 200': (r) => r.status === 200 });
+
+  // The script and stylesheet the page links to, as a browser with an empty cache loads them
+  const doc = res.html();
+  const assets = [doc.find('script[src]').attr('src'), doc.find('link[rel="stylesheet"]').attr('href')].filter(Boolean);
+  const responses = http.batch(assets.map((asset) => ['GET', `${url}/${asset}`, null, params]));
+  check(responses, { 'assets are 200': (rs) => rs.every((r) => r.status === 200) });
   sleep(1);
 }
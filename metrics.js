@@ -0,0 +1,180 @@
+// In-process metrics in the Prometheus text exposition format
+//
+// Counters, gauges and histograms keep one value (or set of buckets) per
+// label combination. `Registry#render()` returns the text Prometheus scrapes
+// from GET /metrics. Everything is cumulative since startup, so a client can
+// scrape before and after a piece of work and subtract to see what that work
+// cost on the server.
+
+// Request and write latencies in seconds, from 0.5ms to 10s
+const DEFAULT_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+function escapeLabelValue(value) {
+    return String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(names, values, extra = '') {
+    const pairs = names.map((name, index) => `${name}="${escapeLabelValue(values[index])}"`);
+    if (extra) {
+        pairs.push(extra);
+    }
+    return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+}
+
+class Metric {
+    constructor(type, name, help, labelNames = []) {
+        this.type = type;
+        this.name = name;
+        this.help = help;
+        this.labelNames = labelNames;
+        this.series = new Map(); // joined label values -> { values, value } (or buckets for histograms)
+    }
+
+    // Series for a { label: value } object, created on first use
+    seriesFor(labels = {}) {
+        const values = this.labelNames.map(name => labels[name] ?? '');
+        const key = values.join('\u0000');
+        let series = this.series.get(key);
+        if (!series) {
+            series = this.createSeries(values);
+            this.series.set(key, series);
+        }
+        return series;
+    }
+
+    createSeries(values) {
+        return { values, value: 0 };
+    }
+
+    render() {
+        const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+        this.series.forEach(series => lines.push(...this.renderSeries(series)));
+        return lines.join('\n');
+    }
+
+    renderSeries(series) {
+        return [`${this.name}${formatLabels(this.labelNames, series.values)} ${series.value}`];
+    }
+}
+
+class Counter extends Metric {
+    constructor(name, help, labelNames) {
+        super('counter', name, help, labelNames);
+    }
+
+    inc(labels, amount = 1) {
+        this.seriesFor(labels).value += amount;
+    }
+}
+
+class Gauge extends Metric {
+    constructor(name, help, labelNames) {
+        super('gauge', name, help, labelNames);
+    }
+
+    set(labels, value) {
+        this.seriesFor(labels).value = value;
+    }
+
+    inc(labels, amount = 1) {
+        this.seriesFor(labels).value += amount;
+    }
+
+    dec(labels, amount = 1) {
+        this.seriesFor(labels).value -= amount;
+    }
+}
+
+class Histogram extends Metric {
+    constructor(name, help, labelNames, buckets = DEFAULT_BUCKETS) {
+        super('histogram', name, help, labelNames);
+        this.buckets = buckets;
+    }
+
+    createSeries(values) {
+        return { values, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+    }
+
+    observe(labels, value) {
+        const series = this.seriesFor(labels);
+        const index = this.buckets.findIndex(bound => value <= bound);
+        if (index !== -1) {
+            series.counts[index]++;
+        }
+        series.sum += value;
+        series.count++;
+    }
+
+    // Start a timer; calling the returned function records the elapsed seconds
+    startTimer(labels) {
+        const start = process.hrtime.bigint();
+        return (extraLabels = {}) => {
+            const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+            this.observe({ ...labels, ...extraLabels }, seconds);
+            return seconds;
+        };
+    }
+
+    renderSeries(series) {
+        const lines = [];
+        let cumulative = 0;
+        this.buckets.forEach((bound, index) => {
+            cumulative += series.counts[index];
+            lines.push(`${this.name}_bucket${formatLabels(this.labelNames, series.values, `le="${bound}"`)} ${cumulative}`);
+        });
+        lines.push(`${this.name}_bucket${formatLabels(this.labelNames, series.values, 'le="+Inf"')} ${series.count}`);
+        lines.push(`${this.name}_sum${formatLabels(this.labelNames, series.values)} ${series.sum}`);
+        lines.push(`${this.name}_count${formatLabels(this.labelNames, series.values)} ${series.count}`);
+        return lines;
+    }
+}
+
+class Registry {
+    constructor() {
+        this.metrics = [];
+        this.collectors = []; // Called before each render to refresh sampled values
+    }
+
+    register(metric) {
+        if (metric.labelNames.length === 0) {
+            metric.seriesFor(); // Unlabelled metrics report 0 before their first update
+        }
+        this.metrics.push(metric);
+        return metric;
+    }
+
+    counter(name, help, labelNames) {
+        return this.register(new Counter(name, help, labelNames));
+    }
+
+    gauge(name, help, labelNames) {
+        return this.register(new Gauge(name, help, labelNames));
+    }
+
+    histogram(name, help, labelNames, buckets) {
+        return this.register(new Histogram(name, help, labelNames, buckets));
+    }
+
+    onCollect(collector) {
+        this.collectors.push(collector);
+    }
+
+    render() {
+        this.collectors.forEach(collect => collect());
+        return this.metrics.map(metric => metric.render()).join('\n') + '\n';
+    }
+}
+
+// Sample event loop lag: how late a timer that should fire every `intervalMs` actually fires
+function monitorEventLoopLag(histogram, intervalMs = 100) {
+    let expected = process.hrtime.bigint() + BigInt(intervalMs * 1e6);
+    const timer = setInterval(() => {
+        const now = process.hrtime.bigint();
+        histogram.observe({}, Math.max(0, Number(now - expected) / 1e9));
+        expected = now + BigInt(intervalMs * 1e6);
+    }, intervalMs);
+    timer.unref();
+    return timer;
+}
+
+module.exports = { Counter, Gauge, Histogram, Registry, DEFAULT_BUCKETS, monitorEventLoopLag };
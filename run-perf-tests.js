@@ -5,30 +5,39 @@ const http = require('http');
 
 console.log('🚀 Running performance tests with Allure integration...\n');
 
-// Function to check if server is ready
+// Function to check if server is ready (polls the health endpoint with exponential backoff)
 function checkServerReady(port, timeout = 10000) {
     return new Promise((resolve, reject) => {
         const startTime = Date.now();
+        let delay = 50;
+
+        const retry = () => {
+            if (Date.now() - startTime > timeout) {
+                reject(new Error(`Server not ready after ${timeout}ms`));
+            } else {
+                setTimeout(check, delay);
+                delay = Math.min(delay * 2, 500);
+            }
+        };
 
         const check = () => {
             const req = http.request({
                 hostname: 'localhost',
                 port: port,
-                path: '/api/tasks',
+                path: '/api/health',
                 method: 'GET',
                 timeout: 2000
             }, (res) => {
-                resolve(true);
-            });
-
-            req.on('error', () => {
-                if (Date.now() - startTime > timeout) {
-                    reject(new Error(`Server not ready after ${timeout}ms`));
+                res.resume();
+                if (res.statusCode === 200) {
+                    resolve(true);
                 } else {
-                    setTimeout(check, 500);
+                    retry();
                 }
             });
 
+            req.on('error', retry);
+
             req.end();
         };
 
@@ -80,6 +89,15 @@ async function runPerfTests() {
             }
         }
 
+        // Summarize the raw k6 output (streamed, constant memory)
+        console.log('📊 Summarizing K6 results...');
+        try {
+            execSync('npm run perf:analyze', { stdio: 'inherit' });
+            console.log('✅ Summaries written to k6-results\n');
+        } catch (error) {
+            console.log(`⚠️ Failed to summarize results: ${error.message}\n`);
+        }
+
         // Convert K6 results to Allure format
         console.log('🔄 Converting K6 results to Allure format...');
         try {
@@ -89,6 +107,20 @@ async function runPerfTests() {
             console.log(`❌ Failed to convert results: ${error.message}\n`);
         }
 
+        // Compare against the recorded baseline (k6/baseline.json)
+        console.log('📏 Checking for performance regressions...');
+        try {
+            execSync('npm run perf:gate', { stdio: 'inherit' });
+            if (fs.existsSync(path.join(__dirname, 'k6', 'baseline.json'))) {
+                console.log('✅ No regressions against the baseline\n');
+            } else {
+                console.log('⚠️ No baseline recorded (k6/baseline.json), so nothing was compared. Run `npm run perf:baseline` and commit it.\n');
+            }
+        } catch (error) {
+            console.log(`❌ Performance regression gate failed: ${error.message}\n`);
+            process.exitCode = 1;
+        }
+
         console.log('🎉 Performance testing completed!');
 
     } catch (error) {
@@ -1,4 +1,8 @@
 // TO-DO List Application
+
+// Columnar GET /api/tasks responses (see task-columns.js); far smaller and faster to parse than JSON for long lists
+const TASK_COLUMNS_TYPE = 'application/vnd.todo.task-columns';
+
 class TodoApp {
     constructor(autoInit = true) {
         this.todos = [];
@@ -8,6 +12,27 @@ class TodoApp {
         this.validStatuses = ['not started', 'in progress', 'completed'];
     this.apiBaseUrl = '/api/tasks'; // API endpoint
     this.useApi = autoInit; // Default to API only when auto-initializing
+        this.pageSize = 500; // Tasks per GET /api/tasks page
+        this.listAccept = `${TASK_COLUMNS_TYPE}, application/json;q=0.9`; // Formats asked for when loading pages
+        this.virtualizeAbove = 500; // Longer lists only mount the rows near the viewport
+        this.overscanRows = 10; // Rows mounted above and below the viewport
+        this.rowHeight = 120; // Estimate until a row has been measured
+        this.rowGap = 15; // .todo-list gap
+        this.version = null; // Server version this.todos reflects, for GET /api/tasks/changes
+        this.syncQueue = Promise.resolve();
+        this.eventSource = null;
+        this.mutations = []; // Writes applied locally but not yet acknowledged by the server
+        this.mutationWaiters = new Map(); // mutation key -> resolvers of queueMutation() promises
+        this.flushing = null; // Promise of the drain in progress
+        this.retryTimer = null;
+        this.retryAttempts = 0;
+        this.retryBaseDelay = 500; // First retry after a failed write, doubled per attempt
+        this.retryMaxDelay = 10000;
+        this.maxCreateBatch = 100; // Queued creates sent in one POST /api/tasks/bulk
+        this.maxClearBatch = 10000; // Deletes sent in one POST /api/tasks/batch by "Clear all" (the server's limit)
+        this.tempIdCounter = 0;
+        this.ready = false;
+        this.pendingOperations = 0;
         
         if (autoInit) {
             this.init();
@@ -15,11 +40,23 @@ class TodoApp {
     }
 
     async init() {
+        this.beginOperation();
+        
         // Try to detect if API is available
         await this.detectApiAvailability();
         
-        // Load todos from API or localStorage
+        // Load todos from API or localStorage, with writes still queued from the last visit on top
+        this.restoreMutations();
         await this.loadTodos();
+        this.subscribeToChanges();
+        this.flushMutations();
+        if (typeof window !== 'undefined') {
+            // Back online: resend queued writes and catch up on changes missed while offline
+            window.addEventListener('online', () => {
+                this.retryMutationsNow();
+                this.applyPushedChanges(null);
+            });
+        }
         
         // Event listeners
         const addBtn = document.getElementById('addTodoBtn');
@@ -39,11 +76,62 @@ class TodoApp {
         
         // Render initial list
         this.render();
+        
+        this.ready = true;
+        this.endOperation();
+    }
+
+    // Re-sync with the backend without a full page load (used by pooled E2E pages)
+    async refresh() {
+        this.beginOperation();
+        try {
+            this.currentEditingId = null;
+            await this.detectApiAvailability();
+            if (!this.useApi) {
+                this.todos = [];
+            }
+            await this.syncTodos();
+            this.subscribeToChanges();
+            this.render();
+            this.resetForm();
+            
+            const nameInput = document.getElementById('todoName');
+            if (nameInput) {
+                nameInput.blur();
+            }
+        } finally {
+            this.endOperation();
+        }
+    }
+
+    // Track in-flight API work and mirror it on <body> as data-app-ready /
+    // data-pending, so E2E tests can wait for the app to settle instead of sleeping
+    beginOperation() {
+        this.pendingOperations++;
+        this.updateStateAttributes();
+    }
+
+    endOperation() {
+        this.pendingOperations = Math.max(0, this.pendingOperations - 1);
+        this.updateStateAttributes();
+    }
+
+    updateStateAttributes() {
+        if (typeof document === 'undefined' || !document.body) {
+            return;
+        }
+        document.body.dataset.appReady = String(this.ready);
+        document.body.dataset.pending = String(this.pendingOperations);
+    }
+
+    isSettled() {
+        return this.ready && this.pendingOperations === 0;
     }
 
     async detectApiAvailability() {
         try {
-            const response = await fetch(this.apiBaseUrl, { method: 'GET' });
+            // A one-task, id-only page is enough to tell whether the API answers
+            const response = await fetch(`${this.apiBaseUrl}?limit=1&fields=id`, { method: 'GET' });
             this.useApi = response.ok;
             console.log(this.useApi ? '✅ Using API backend' : '⚠️ API unavailable, using localStorage');
         } catch (error) {
@@ -101,7 +189,7 @@ class TodoApp {
         };
 
         if (this.useApi) {
-            return this.addTodoViaApi({ name, priority, status }, newTodo);
+            return this.addTodoViaApi({ name, priority, status });
         }
 
         this.todos.push(newTodo);
@@ -111,31 +199,13 @@ class TodoApp {
         return true;
     }
 
-    async addTodoViaApi(payload, fallbackTodo) {
-        try {
-            const response = await fetch(this.apiBaseUrl, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(payload)
-            });
-            
-            if (response.ok) {
-                await this.loadTodos(); // Reload from API
-            } else {
-                alert('Failed to add task via API');
-                return false;
-            }
-        } catch (error) {
-            console.error('API error:', error);
-            alert('Failed to add task. Using localStorage fallback.');
-            this.useApi = false;
-            this.todos.push(fallbackTodo);
-            this.saveTodos();
-        }
-
+    // Show the new task at once and create it on the server in the background
+    addTodoViaApi(payload) {
+        const todo = { id: this.nextTempId(), ...payload };
+        this.todos.push(todo);
         this.render();
         this.resetForm();
-        return true;
+        return this.queueMutation('create', todo.id, { ...payload });
     }
     
     resetForm() {
@@ -182,28 +252,10 @@ class TodoApp {
         return true;
     }
 
-    async deleteTodoViaApi(id) {
-        try {
-            const response = await fetch(`${this.apiBaseUrl}/${id}`, {
-                method: 'DELETE'
-            });
-            
-            if (response.ok) {
-                await this.loadTodos();
-                this.render();
-                return true;
-            }
-
-            alert('Failed to delete task via API');
-            return false;
-        } catch (error) {
-            console.error('API error:', error);
-            this.useApi = false;
-            this.todos = this.todos.filter(todo => todo.id !== id);
-            this.saveTodos();
-            this.render();
-            return true;
-        }
+    deleteTodoViaApi(id) {
+        this.todos = this.todos.filter(todo => todo.id !== id);
+        this.render();
+        return this.queueMutation('delete', id);
     }
 
     toggleEdit(id) {
@@ -259,37 +311,12 @@ class TodoApp {
         todo.status = newStatus;
 
         if (this.useApi) {
-            // Update via API
-            fetch(`${this.apiBaseUrl}/${id}`, {
-                method: 'PUT',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ priority: newPriority, status: newStatus })
-            })
-            .then(response => {
-                if (response.ok) {
-                    return this.loadTodos();
-                } else {
-                    alert('Failed to update task via API');
-                    this.useApi = false;
-                    this.saveTodos();
-                }
-            })
-            .then(() => {
-                this.currentEditingId = null;
-                this.render();
-            })
-            .catch(error => {
-                console.error('API error:', error);
-                this.useApi = false;
-                this.saveTodos();
-                this.currentEditingId = null;
-                this.render();
-            });
+            this.queueMutation('update', id, { priority: newPriority, status: newStatus });
         } else {
             this.saveTodos();
-            this.currentEditingId = null;
-            this.render();
         }
+        this.currentEditingId = null;
+        this.render();
         
         return true;
     }
@@ -307,6 +334,10 @@ class TodoApp {
         return status.replace(/\s+/g, '-');
     }
 
+    // Update #todoList in place: only items whose name, priority, status or edit
+    // state changed are rebuilt, and unchanged items keep their DOM nodes.
+    // Lists longer than `virtualizeAbove` are windowed: only the rows near the
+    // viewport are mounted, between two spacers that stand in for the rest.
     render() {
         const todoList = document.getElementById('todoList');
         
@@ -314,87 +345,258 @@ class TodoApp {
             return;
         }
         
+        if (this.listElement !== todoList) {
+            // First render into this list: one delegated click handler instead of one per item
+            this.listElement = todoList;
+            this.renderedItems = new Map();
+            this.topSpacer = this.createSpacer();
+            this.bottomSpacer = this.createSpacer();
+            todoList.addEventListener('click', (e) => this.handleListClick(e));
+            this.listenForScroll();
+        }
+        
         if (this.todos.length === 0) {
             todoList.innerHTML = '<div class="empty-state">No TO-DO items yet. Add one above!</div>';
+            this.renderedItems.clear();
             return;
         }
+        
+        const { start, end } = this.visibleRange(todoList);
+        const visible = start === 0 && end === this.todos.length ? this.todos : this.todos.slice(start, end);
+        const virtual = visible !== this.todos;
+        this.renderedRange = { start, end };
+        
+        if (this.renderedItems.size === 0) {
+            // Nothing to keep: build the rows in one go
+            todoList.innerHTML = visible.map(todo => this.renderTodoHtml(todo)).join('');
+            Array.from(todoList.children).forEach((element, index) => {
+                const todo = visible[index];
+                this.renderedItems.set(todo.id, { element, signature: this.renderSignature(todo) });
+            });
+        } else {
+            this.updateItems(todoList, visible);
+        }
+        
+        if (virtual) {
+            this.measureRow();
+            const pitch = this.rowPitch();
+            this.topSpacer.style.height = `${Math.max(0, start * pitch - this.rowGap)}px`;
+            this.bottomSpacer.style.height = `${Math.max(0, (this.todos.length - end) * pitch - this.rowGap)}px`;
+            if (todoList.firstElementChild !== this.topSpacer) {
+                todoList.prepend(this.topSpacer);
+            }
+            if (todoList.lastElementChild !== this.bottomSpacer) {
+                todoList.append(this.bottomSpacer);
+            }
+        } else {
+            this.topSpacer.remove();
+            this.bottomSpacer.remove();
+        }
+    }
 
-        todoList.innerHTML = this.todos.map(todo => {
-            const isEditing = this.currentEditingId === todo.id;
-            const statusClass = this.getStatusClass(todo.status);
-            const highlightClass = `status-highlight-${statusClass}`;
+    // Reconcile the mounted rows with `visible`, touching only what changed
+    updateItems(todoList, visible) {
+        // Drop rows that were deleted or left the window first, so the walk below never has to step over them
+        const ids = new Set(visible.map(todo => todo.id));
+        this.renderedItems.forEach((item, id) => {
+            if (!ids.has(id)) {
+                item.element.remove();
+                this.renderedItems.delete(id);
+            }
+        });
+        
+        // Walk the rows in order, reusing, rebuilding or moving each one's node
+        let cursor = todoList.firstElementChild;
+        if (cursor === this.topSpacer) {
+            cursor = cursor.nextElementSibling;
+        }
+        visible.forEach(todo => {
+            const signature = this.renderSignature(todo);
+            let item = this.renderedItems.get(todo.id);
+            if (!item || item.signature !== signature || item.element.parentNode !== todoList) {
+                const element = this.createTodoElement(todo);
+                if (item && item.element.parentNode === todoList) {
+                    if (item.element === cursor) {
+                        cursor = element;
+                    }
+                    item.element.replaceWith(element);
+                }
+                item = { element, signature };
+                this.renderedItems.set(todo.id, item);
+            }
             
-            return `
-                <div class="todo-item ${isEditing ? 'editing' : ''} ${highlightClass}" data-id="${todo.id}">
-                    <div class="todo-header">
-                        <div class="todo-name">${this.escapeHtml(todo.name)}</div>
-                        <button class="btn btn-delete" onclick="app.deleteTodo(${todo.id}); event.stopPropagation();">Delete</button>
+            if (item.element === cursor) {
+                cursor = cursor.nextElementSibling;
+            } else {
+                todoList.insertBefore(item.element, cursor);
+            }
+        });
+    }
+
+    // Index range of the todos to mount: all of them, or the ones near the viewport
+    visibleRange(todoList) {
+        const count = this.todos.length;
+        if (count <= this.virtualizeAbove || typeof window === 'undefined') {
+            return { start: 0, end: count };
+        }
+        const pitch = this.rowPitch();
+        const firstVisible = Math.floor(-todoList.getBoundingClientRect().top / pitch);
+        const rows = Math.ceil((window.innerHeight || 800) / pitch);
+        const start = Math.min(Math.max(0, firstVisible - this.overscanRows), count);
+        const end = Math.min(Math.max(0, firstVisible + rows + this.overscanRows), count);
+        return { start, end: Math.max(end, start) };
+    }
+
+    // Height of a row plus the gap between rows
+    rowPitch() {
+        return this.rowHeight + this.rowGap;
+    }
+
+    // Learn the real row height from a mounted row that is not being edited
+    measureRow() {
+        const sample = Array.from(this.renderedItems.values()).find(item => !item.element.classList.contains('editing'));
+        const height = sample ? sample.element.offsetHeight : 0;
+        if (height > 0) {
+            this.rowHeight = height;
+        }
+    }
+
+    createSpacer() {
+        const spacer = document.createElement('div');
+        spacer.className = 'virtual-spacer';
+        spacer.setAttribute('aria-hidden', 'true');
+        return spacer;
+    }
+
+    // Re-render on scroll and resize (at most once per frame) when the window has moved
+    listenForScroll() {
+        if (typeof window === 'undefined') {
+            return;
+        }
+        let scheduled = false;
+        const onScroll = () => {
+            if (scheduled || this.todos.length <= this.virtualizeAbove) {
+                return;
+            }
+            scheduled = true;
+            requestAnimationFrame(() => {
+                scheduled = false;
+                const { start, end } = this.visibleRange(this.listElement);
+                if (!this.renderedRange || start !== this.renderedRange.start || end !== this.renderedRange.end) {
+                    this.render();
+                }
+            });
+        };
+        window.addEventListener('scroll', onScroll, { passive: true });
+        window.addEventListener('resize', onScroll);
+    }
+
+    // Scroll a task into view, mounting it first if the list is windowed. Returns false for an unknown id.
+    scrollToTask(id) {
+        const index = this.todos.findIndex(todo => todo.id === id);
+        if (index === -1) {
+            return false;
+        }
+        const todoList = document.getElementById('todoList');
+        if (todoList && this.todos.length > this.virtualizeAbove) {
+            const listTop = todoList.getBoundingClientRect().top + window.scrollY;
+            window.scrollTo(0, listTop + index * this.rowPitch());
+            this.render();
+        }
+        const item = this.renderedItems && this.renderedItems.get(id);
+        if (item && item.element.scrollIntoView) {
+            item.element.scrollIntoView({ block: 'center' });
+        }
+        return Boolean(item);
+    }
+
+    // Everything an item's markup depends on
+    renderSignature(todo) {
+        return `${todo.name}\u0000${todo.priority}\u0000${todo.status}\u0000${this.currentEditingId === todo.id}`;
+    }
+
+    createTodoElement(todo) {
+        const template = document.createElement('template');
+        template.innerHTML = this.renderTodoHtml(todo).trim();
+        return template.content.firstElementChild;
+    }
+
+    renderTodoHtml(todo) {
+        const isEditing = this.currentEditingId === todo.id;
+        const statusClass = this.getStatusClass(todo.status);
+        const highlightClass = `status-highlight-${statusClass}`;
+        
+        return `
+            <div class="todo-item ${isEditing ? 'editing' : ''} ${highlightClass}" data-id="${todo.id}">
+                <div class="todo-header">
+                    <div class="todo-name">${this.escapeHtml(todo.name)}</div>
+                    <button class="btn btn-delete" onclick="app.deleteTodo(${todo.id}); event.stopPropagation();">Delete</button>
+                </div>
+                
+                <div class="todo-info">
+                    <div class="todo-priority">
+                        <strong>Priority:</strong>
+                        <span class="priority-badge priority-${todo.priority}">
+                            ${todo.priority} (${this.getPriorityLabel(todo.priority)})
+                        </span>
                     </div>
-                    
-                    <div class="todo-info">
-                        <div class="todo-priority">
-                            <strong>Priority:</strong>
-                            <span class="priority-badge priority-${todo.priority}">
-                                ${todo.priority} (${this.getPriorityLabel(todo.priority)})
-                            </span>
-                        </div>
-                        <div class="todo-status">
-                            <strong>Status:</strong>
-                            <span class="status-badge status-${this.getStatusClass(todo.status)}">
-                                ${this.capitalizeFirst(todo.status)}
-                            </span>
+                    <div class="todo-status">
+                        <strong>Status:</strong>
+                        <span class="status-badge status-${this.getStatusClass(todo.status)}">
+                            ${this.capitalizeFirst(todo.status)}
+                        </span>
+                    </div>
+                </div>
+                
+                <div class="edit-controls ${isEditing ? 'visible' : ''}">
+                    <div class="edit-form-group">
+                        <label>Change Priority:</label>
+                        <div class="edit-radio-group">
+                            <label class="radio-label">
+                                <input type="radio" name="edit-priority-${todo.id}" value="1" ${todo.priority === '1' ? 'checked' : ''} />
+                                <span>1 (Low)</span>
+                            </label>
+                            <label class="radio-label">
+                                <input type="radio" name="edit-priority-${todo.id}" value="2" ${todo.priority === '2' ? 'checked' : ''} />
+                                <span>2 (Medium)</span>
+                            </label>
+                            <label class="radio-label">
+                                <input type="radio" name="edit-priority-${todo.id}" value="3" ${todo.priority === '3' ? 'checked' : ''} />
+                                <span>3 (High)</span>
+                            </label>
                         </div>
                     </div>
                     
-                    <div class="edit-controls ${isEditing ? 'visible' : ''}">
-                        <div class="edit-form-group">
-                            <label>Change Priority:</label>
-                            <div class="edit-radio-group">
-                                <label class="radio-label">
-                                    <input type="radio" name="edit-priority-${todo.id}" value="1" ${todo.priority === '1' ? 'checked' : ''} />
-                                    <span>1 (Low)</span>
-                                </label>
-                                <label class="radio-label">
-                                    <input type="radio" name="edit-priority-${todo.id}" value="2" ${todo.priority === '2' ? 'checked' : ''} />
-                                    <span>2 (Medium)</span>
-                                </label>
-                                <label class="radio-label">
-                                    <input type="radio" name="edit-priority-${todo.id}" value="3" ${todo.priority === '3' ? 'checked' : ''} />
-                                    <span>3 (High)</span>
-                                </label>
-                            </div>
-                        </div>
-                        
-                        <div class="edit-form-group">
-                            <label for="edit-status-${todo.id}">Change Status:</label>
-                            <select id="edit-status-${todo.id}">
-                                <option value="not started" ${todo.status === 'not started' ? 'selected' : ''}>Not Started</option>
-                                <option value="in progress" ${todo.status === 'in progress' ? 'selected' : ''}>In Progress</option>
-                                <option value="completed" ${todo.status === 'completed' ? 'selected' : ''}>Completed</option>
-                            </select>
-                        </div>
-                        
-                        <div class="edit-actions">
-                            <button class="btn btn-primary" onclick="app.updateTodo(${todo.id}); event.stopPropagation();">Save Changes</button>
-                        </div>
+                    <div class="edit-form-group">
+                        <label for="edit-status-${todo.id}">Change Status:</label>
+                        <select id="edit-status-${todo.id}">
+                            <option value="not started" ${todo.status === 'not started' ? 'selected' : ''}>Not Started</option>
+                            <option value="in progress" ${todo.status === 'in progress' ? 'selected' : ''}>In Progress</option>
+                            <option value="completed" ${todo.status === 'completed' ? 'selected' : ''}>Completed</option>
+                        </select>
+                    </div>
+                    
+                    <div class="edit-actions">
+                        <button class="btn btn-primary" onclick="app.updateTodo(${todo.id}); event.stopPropagation();">Save Changes</button>
                     </div>
                 </div>
-            `;
-        }).join('');
-
-        // Add click event to toggle edit mode
-        document.querySelectorAll('.todo-item').forEach(item => {
-            item.addEventListener('click', (e) => {
-                // Don't toggle if clicking on buttons or inputs
-                if (e.target.tagName === 'BUTTON' || 
-                    e.target.tagName === 'INPUT' || 
-                    e.target.tagName === 'SELECT') {
-                    return;
-                }
-                const id = parseInt(item.dataset.id);
-                this.toggleEdit(id);
-            });
-        });
+            </div>
+        `;
+    }
+
+    // Toggle edit mode when an item is clicked anywhere but its buttons or inputs
+    handleListClick(e) {
+        if (e.target.tagName === 'BUTTON' || 
+            e.target.tagName === 'INPUT' || 
+            e.target.tagName === 'SELECT') {
+            return;
+        }
+        const item = e.target.closest('.todo-item');
+        if (!item) {
+            return;
+        }
+        const id = parseInt(item.dataset.id);
+        this.toggleEdit(id);
     }
 
     saveTodos() {
@@ -417,6 +619,7 @@ class TodoApp {
         }
         
         // Fallback to localStorage
+        this.version = null;
         try {
             const stored = localStorage.getItem('todos');
             if (stored) {
@@ -435,26 +638,563 @@ class TodoApp {
         }
     }
 
+    // Fetch all tasks one page at a time (GET /api/tasks?limit=&after=).
+    // A failed load keeps the list already shown and the API backend: only
+    // detectApiAvailability picks the backend, and queued writes, the event
+    // stream or the online handler sync again once the server answers.
     async loadTodosFromApi() {
         try {
-            const response = await fetch(this.apiBaseUrl);
+            const todos = [];
+            let after = 0;
+            let version = null;
+            let response;
+            do {
+                response = await fetch(`${this.apiBaseUrl}?limit=${this.pageSize}&after=${after}`, { headers: { Accept: this.listAccept } });
+                if (!response.ok) {
+                    break;
+                }
+                const result = await this.readTaskList(response);
+                todos.push(...(result.data || []));
+                // Changes made while later pages load are fetched again by the next sync
+                version = version || result.version || null;
+                after = result.nextCursor;
+            } while (after);
+            
             if (response.ok) {
-                const result = await response.json();
-                this.todos = result.data || [];
+                this.todos = todos;
+                this.version = version;
+                this.reapplyMutations();
                 console.log(`Loaded ${this.todos.length} todos from API`);
                 return true;
             }
 
-            console.warn('API failed, falling back to localStorage');
-            this.useApi = false;
+            console.warn(`Failed to load from API (${response.status}), keeping the current list`);
         } catch (error) {
-            console.error('Failed to load from API:', error);
-            this.useApi = false;
+            console.error('Failed to load from API, keeping the current list:', error);
+        }
+
+        this.reapplyMutations();
+        return false;
+    }
+
+    // A GET /api/tasks body in whichever format the server chose
+    async readTaskList(response) {
+        const type = response.headers ? response.headers.get('Content-Type') : null;
+        if (type && type.startsWith(TASK_COLUMNS_TYPE)) {
+            return TodoApp.decodeTaskColumns(await response.arrayBuffer());
+        }
+        return response.json();
+    }
+
+    // Decode a columnar GET /api/tasks response (layout in task-columns.js) into
+    // the same { success, data, count, nextCursor, version } as the JSON one
+    static decodeTaskColumns(buffer) {
+        const bytes = new Uint8Array(buffer);
+        const utf8 = new TextDecoder();
+        let position = 0;
+        const varint = () => {
+            let value = 0;
+            let scale = 1;
+            let byte;
+            do {
+                byte = bytes[position++];
+                value += (byte & 0x7f) * scale;
+                scale *= 0x80;
+            } while (byte & 0x80);
+            return value;
+        };
+        const string = () => {
+            const length = varint();
+            position += length;
+            return utf8.decode(bytes.subarray(position - length, position));
+        };
+        const dictionary = () => {
+            const values = [];
+            for (let size = varint(); values.length < size;) {
+                values.push(string());
+            }
+            const codes = bytes.subarray(position, position + count);
+            position += count;
+            return { values, codes };
+        };
+
+        if (utf8.decode(bytes.subarray(0, 4)) !== 'TCOL' || bytes[4] !== 1) {
+            throw new Error('Not a task columns response');
         }
+        const columns = bytes[5];
+        position = 6;
+        const count = varint();
+        const version = string();
+        const cursorKind = bytes[position++];
+        const nextCursor = cursorKind === 1 ? varint() : cursorKind === 2 ? string() : null;
 
+        const ids = new Array(count);
+        for (let i = 0, id = 0; i < count; i++) {
+            // Zigzag varint, read inline: this loop runs once per task
+            let delta = 0;
+            let scale = 1;
+            let byte;
+            do {
+                byte = bytes[position++];
+                delta += (byte & 0x7f) * scale;
+                scale *= 0x80;
+            } while (byte & 0x80);
+            id += delta % 2 ? -(delta + 1) / 2 : delta / 2;
+            ids[i] = id;
+        }
+        const statuses = columns & 2 ? dictionary() : null;
+        const priorities = columns & 4 ? dictionary() : null;
+        let names = null;
+        if (columns & 1 && bytes[position++] === 0) {
+            names = count === 0 ? [] : string().split('\u0000');
+        } else if (columns & 1) {
+            // Some name contains the separator, so they come with their lengths instead
+            const lengths = new Array(count);
+            for (let i = 0; i < count; i++) {
+                lengths[i] = varint();
+            }
+            const text = string();
+            names = new Array(count);
+            for (let i = 0, start = 0; i < count; start += lengths[i], i++) {
+                names[i] = text.slice(start, start + lengths[i]);
+            }
+        }
+
+        const data = new Array(count);
+        const complete = names && statuses && priorities; // Built as literals, which is much faster than adding fields one by one
+        for (let i = 0; i < count; i++) {
+            if (complete) {
+                data[i] = { id: ids[i], name: names[i], status: statuses.values[statuses.codes[i]], priority: priorities.values[priorities.codes[i]] };
+                continue;
+            }
+            const task = { id: ids[i] };
+            if (names) task.name = names[i];
+            if (statuses) task.status = statuses.values[statuses.codes[i]];
+            if (priorities) task.priority = priorities.values[priorities.codes[i]];
+            data[i] = task;
+        }
+        return { success: true, data, count, nextCursor, version };
+    }
+
+    // Run syncs one at a time, so responses are applied in the order they were requested
+    queueSync(sync) {
+        const result = this.syncQueue.then(sync);
+        this.syncQueue = result.catch(() => {});
+        return result;
+    }
+
+    // Fetch only what changed since the last load or sync (GET /api/tasks/changes?since=).
+    // Falls back to a full load when there is no version yet or the server no longer has the changes.
+    syncTodos() {
+        return this.queueSync(() => this.fetchChanges());
+    }
+
+    async fetchChanges() {
+        if (!this.useApi || this.version === null) {
+            return this.loadTodos();
+        }
+        
+        try {
+            const response = await fetch(`${this.apiBaseUrl}/changes?since=${encodeURIComponent(this.version)}`);
+            if (response.ok) {
+                this.applyChanges(await response.json());
+                return true;
+            }
+        } catch (error) {
+            console.error('Failed to sync from API:', error);
+        }
+        
         return this.loadTodos();
     }
 
+    // Merge a GET /api/tasks/changes response into this.todos
+    applyChanges({ created = [], updated = [], deleted = [], version = null }) {
+        const indexById = new Map(this.todos.map((todo, index) => [todo.id, index]));
+        // Tasks with queued writes keep their local state until those writes are acknowledged
+        const queuedIds = new Set(this.mutations.map(mutation => mutation.id));
+        [...updated, ...created].forEach(task => {
+            if (queuedIds.has(task.id)) {
+                return;
+            }
+            if (indexById.has(task.id)) {
+                this.todos[indexById.get(task.id)] = task;
+            } else {
+                indexById.set(task.id, this.todos.push(task) - 1);
+            }
+        });
+        
+        if (deleted.length > 0) {
+            const deletedIds = new Set(deleted);
+            this.todos = this.todos.filter(todo => !deletedIds.has(todo.id));
+        }
+        this.version = version;
+    }
+
+    // Listen for changes made in other tabs (GET /api/tasks/stream, server-sent events)
+    subscribeToChanges() {
+        if (!this.useApi || this.eventSource || typeof EventSource === 'undefined') {
+            return;
+        }
+        this.eventSource = new EventSource(`${this.apiBaseUrl}/stream`);
+        this.eventSource.addEventListener('changes', event => this.applyPushedChanges(JSON.parse(event.data)));
+        // After a reset, or a reconnect that may have missed pushes, catch up through a sync
+        this.eventSource.addEventListener('reset', () => this.applyPushedChanges(null));
+        this.eventSource.addEventListener('ready', event => this.applyPushedChanges(JSON.parse(event.data)));
+    }
+
+    // Pushed changes are a delta from the previous push, so they only apply directly
+    // when this tab is at that version; otherwise fetch what is missing
+    async applyPushedChanges(changes) {
+        if (changes && changes.version === this.version) {
+            return;
+        }
+        this.beginOperation();
+        try {
+            await this.queueSync(() => {
+                if (changes && changes.since !== undefined && changes.since === this.version) {
+                    this.applyChanges(changes);
+                    return true;
+                }
+                return this.fetchChanges();
+            });
+            this.render();
+        } finally {
+            this.endOperation();
+        }
+    }
+
+    // Optimistic writes: the change is already applied to this.todos and rendered;
+    // queue it for the server. Queued writes are sent in order in the background,
+    // retried with backoff while the server is unreachable, and kept in localStorage
+    // so they survive offline periods and reloads. Resolves true once the server has
+    // the change, false if it rejected it.
+    queueMutation(type, id, fields = {}) {
+        // Fold into a queued write for the same task that has not been sent yet
+        const queued = this.mutations.filter(mutation => mutation.id === id && !mutation.sending);
+        if (type === 'update' && queued.length > 0 && queued[queued.length - 1].type !== 'delete') {
+            const target = queued[queued.length - 1];
+            Object.assign(target.fields, fields);
+            this.saveMutations();
+            return this.waitForMutation(target);
+        }
+        if (type === 'delete' && queued.length > 0) {
+            queued.forEach(mutation => {
+                this.dequeueMutations([mutation]);
+                this.finishMutation(mutation, true);
+            });
+            if (queued.some(mutation => mutation.type === 'create')) {
+                // The server never saw this task, so there is nothing to delete
+                return Promise.resolve(true);
+            }
+        }
+        
+        const mutation = { key: `${Date.now()}-${this.tempIdCounter++}`, type, id, fields };
+        const settled = this.waitForMutation(mutation);
+        this.mutations.push(mutation);
+        this.beginOperation();
+        this.saveMutations();
+        this.flushMutations();
+        return settled;
+    }
+
+    waitForMutation(mutation) {
+        return new Promise(resolve => {
+            const waiters = this.mutationWaiters.get(mutation.key) || [];
+            waiters.push(resolve);
+            this.mutationWaiters.set(mutation.key, waiters);
+        });
+    }
+
+    dequeueMutations(mutations) {
+        this.mutations = this.mutations.filter(mutation => !mutations.includes(mutation));
+        this.saveMutations();
+    }
+
+    finishMutation(mutation, saved) {
+        (this.mutationWaiters.get(mutation.key) || []).forEach(resolve => resolve(saved));
+        this.mutationWaiters.delete(mutation.key);
+        this.endOperation();
+    }
+
+    // Negative ids mark tasks the server has not assigned an id to yet
+    nextTempId() {
+        return -(Date.now() * 1000 + (this.tempIdCounter++ % 1000));
+    }
+
+    // Send queued writes, oldest first, one drain at a time. Resolves when the
+    // current drain is done.
+    flushMutations() {
+        if (!this.flushing) {
+            this.flushing = this.drainMutations().finally(() => {
+                this.flushing = null;
+                // Writes queued while the last batch was syncing
+                if (this.mutations.length > 0 && !this.retryTimer) {
+                    this.flushMutations();
+                }
+            });
+        }
+        return this.flushing;
+    }
+
+    // Then sync once to pick up the server's view of them
+    async drainMutations() {
+        if (this.retryTimer || !this.useApi || this.mutations.length === 0) {
+            return;
+        }
+        const done = [];
+        try {
+            while (this.mutations.length > 0) {
+                const batch = this.nextMutationBatch();
+                const outcome = await this.sendMutations(batch);
+                if (outcome === 'retry') {
+                    this.scheduleMutationRetry();
+                    break;
+                }
+                this.retryAttempts = 0;
+                this.dequeueMutations(batch);
+                if (outcome === 'rejected') {
+                    this.rollBackRejected(batch);
+                }
+                batch.forEach(mutation => done.push([mutation, outcome === 'saved']));
+            }
+            if (done.length > 0) {
+                await this.syncTodos();
+                this.render();
+            }
+        } finally {
+            done.forEach(([mutation, saved]) => this.finishMutation(mutation, saved));
+        }
+    }
+
+    // Consecutive creates at the head of the queue go in one request; anything else goes alone
+    nextMutationBatch() {
+        const batch = [];
+        for (const mutation of this.mutations) {
+            if (batch.length > 0 && (mutation.type !== 'create' || batch[0].type !== 'create' || batch.length === this.maxCreateBatch)) {
+                break;
+            }
+            batch.push(mutation);
+        }
+        return batch;
+    }
+
+    // A rejected write left no trace on the server, so no delta will undo it here:
+    // drop tasks that were only ever local and make the next sync a full load
+    rollBackRejected(batch) {
+        const localIds = new Set(batch.filter(mutation => mutation.type === 'create').map(mutation => mutation.id));
+        if (localIds.size > 0) {
+            this.todos = this.todos.filter(todo => !localIds.has(todo.id));
+        }
+        this.version = null;
+    }
+
+    // 'saved', 'rejected' (dropped and rolled back, see rollBackRejected) or 'retry'
+    async sendMutations(batch) {
+        const [first] = batch;
+        if (first.type !== 'create' && first.id < 0) {
+            // Its create was rejected, so the server has no such task
+            return 'rejected';
+        }
+        
+        batch.forEach(mutation => { mutation.sending = true; });
+        try {
+            let response;
+            if (first.type === 'create' && batch.length > 1) {
+                response = await fetch(`${this.apiBaseUrl}/bulk`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ tasks: batch.map(mutation => mutation.fields) })
+                });
+            } else if (first.type === 'create') {
+                response = await fetch(this.apiBaseUrl, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(first.fields)
+                });
+            } else if (first.type === 'clear') {
+                response = await this.sendClear(first);
+                if (!response) {
+                    return 'saved'; // Every task was already deleted elsewhere
+                }
+            } else if (first.type === 'update') {
+                response = await fetch(`${this.apiBaseUrl}/${first.id}`, {
+                    method: 'PUT',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(first.fields)
+                });
+            } else {
+                response = await fetch(`${this.apiBaseUrl}/${first.id}`, { method: 'DELETE' });
+            }
+            
+            if (response.ok) {
+                if (first.type === 'create') {
+                    await this.reconcileCreated(batch, response);
+                }
+                return 'saved';
+            }
+            if (response.status >= 500 || response.status === 429) {
+                return 'retry';
+            }
+            // 404: the task was deleted elsewhere, and the server's version wins
+            if (response.status !== 404) {
+                const action = { create: 'add', update: 'update', delete: 'delete', clear: 'delete' }[first.type];
+                alert(`Failed to ${action} task via API`);
+            }
+            return 'rejected';
+        } catch (error) {
+            console.error('API error:', error);
+            return 'retry';
+        } finally {
+            batch.forEach(mutation => { delete mutation.sending; });
+        }
+    }
+
+    // Delete the tasks of a "Clear all" in one POST /api/tasks/batch. The batch is
+    // all-or-nothing, so tasks already deleted elsewhere are dropped and the rest
+    // sent again; resolves null if none are left.
+    async sendClear(mutation) {
+        while (mutation.fields.ids.length > 0) {
+            const { ids } = mutation.fields;
+            const response = await fetch(`${this.apiBaseUrl}/batch`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ operations: ids.map(id => ({ op: 'delete', id })) })
+            });
+            if (response.status !== 400) {
+                return response;
+            }
+            let errors = [];
+            try {
+                errors = (await response.json()).errors || [];
+            } catch (error) {
+                return response;
+            }
+            const gone = new Set(errors
+                .filter(error => error && Array.isArray(error.errors) && error.errors.includes('Task not found'))
+                .map(error => error.index));
+            if (gone.size === 0 || gone.size !== errors.length) {
+                return response;
+            }
+            mutation.fields.ids = ids.filter((id, index) => !gone.has(index));
+            this.saveMutations();
+        }
+        return null;
+    }
+
+    // Give optimistically added tasks the ids the server assigned
+    async reconcileCreated(batch, response) {
+        let created = [];
+        try {
+            const result = await response.json();
+            created = Array.isArray(result.data) ? result.data : [result.data];
+        } catch (error) {
+            // No body to match up: drop the local copies and let the next sync bring the real ones
+        }
+        
+        batch.forEach((mutation, index) => {
+            const task = created[index];
+            const localIndex = this.todos.findIndex(todo => todo.id === mutation.id);
+            if (task && !this.todos.some(todo => todo.id === task.id)) {
+                if (localIndex !== -1) {
+                    this.todos[localIndex] = { ...this.todos[localIndex], id: task.id };
+                }
+            } else if (localIndex !== -1) {
+                // Unknown id, or the task already arrived through a sync or push
+                this.todos.splice(localIndex, 1);
+            }
+            if (task) {
+                const tempId = mutation.id;
+                this.mutations.forEach(queued => {
+                    if (queued.id === tempId) {
+                        queued.id = task.id;
+                    }
+                });
+                if (this.currentEditingId === tempId) {
+                    this.currentEditingId = task.id;
+                }
+            }
+        });
+        this.saveMutations();
+    }
+
+    scheduleMutationRetry() {
+        const delay = Math.min(this.retryMaxDelay, this.retryBaseDelay * 2 ** this.retryAttempts);
+        this.retryAttempts++;
+        this.retryTimer = setTimeout(() => {
+            this.retryTimer = null;
+            this.flushMutations();
+        }, delay);
+    }
+
+    // Forget queued writes that are not being sent, and the backoff (used by pooled
+    // E2E pages between tests); the next sync is a full load
+    discardMutations() {
+        if (this.retryTimer) {
+            clearTimeout(this.retryTimer);
+            this.retryTimer = null;
+        }
+        this.retryAttempts = 0;
+        const dropped = this.mutations.filter(mutation => !mutation.sending);
+        this.dequeueMutations(dropped);
+        dropped.forEach(mutation => this.finishMutation(mutation, false));
+        this.version = null;
+    }
+
+    // Back online: don't wait for the backoff timer
+    retryMutationsNow() {
+        if (this.retryTimer) {
+            clearTimeout(this.retryTimer);
+            this.retryTimer = null;
+        }
+        this.retryAttempts = 0;
+        this.flushMutations();
+    }
+
+    saveMutations() {
+        try {
+            localStorage.setItem('todoMutations', JSON.stringify(this.mutations.map(({ sending, ...mutation }) => mutation)));
+        } catch (error) {
+            console.error('Failed to save queued changes:', error);
+        }
+    }
+
+    // Pick up writes queued before the last reload
+    restoreMutations() {
+        if (!this.useApi) {
+            return;
+        }
+        try {
+            const stored = JSON.parse(localStorage.getItem('todoMutations') || '[]');
+            if (Array.isArray(stored)) {
+                stored.forEach(() => this.beginOperation());
+                this.mutations = stored;
+            }
+        } catch (error) {
+            console.error('Failed to restore queued changes:', error);
+        }
+    }
+
+    // Re-apply queued writes on top of a freshly loaded list
+    reapplyMutations() {
+        this.mutations.forEach(mutation => {
+            if (mutation.type === 'create') {
+                if (!this.todos.some(todo => todo.id === mutation.id)) {
+                    this.todos.push({ id: mutation.id, ...mutation.fields });
+                }
+            } else if (mutation.type === 'update') {
+                const todo = this.todos.find(todo => todo.id === mutation.id);
+                if (todo) {
+                    Object.assign(todo, mutation.fields);
+                }
+            } else if (mutation.type === 'clear') {
+                const ids = new Set(mutation.fields.ids);
+                this.todos = this.todos.filter(todo => !ids.has(todo.id));
+            } else {
+                this.todos = this.todos.filter(todo => todo.id !== mutation.id);
+            }
+        });
+    }
+
     escapeHtml(text) {
         if (text === null || text === undefined) {
             return '';
@@ -494,15 +1234,26 @@ class TodoApp {
         return true;
     }
 
-    async clearAllTodosViaApi() {
-        const deletePromises = this.todos.map(todo => 
-            fetch(`${this.apiBaseUrl}/${todo.id}`, { method: 'DELETE' })
-        );
-        await Promise.all(deletePromises);
-        await this.loadTodos();
+    // Tasks the server has go in one batch of deletes instead of a request each;
+    // local-only ones go through queueMutation('delete'), which drops their queued create
+    clearAllTodosViaApi() {
+        const ids = this.todos.map(todo => todo.id);
+        this.todos = [];
         this.currentEditingId = null;
         this.render();
-        return true;
+        
+        const serverIds = new Set(ids.filter(id => id > 0));
+        const settled = ids.filter(id => id < 0).map(id => this.queueMutation('delete', id));
+        // Unsent edits of these tasks are moot once they are deleted
+        const superseded = this.mutations.filter(mutation => serverIds.has(mutation.id) && !mutation.sending);
+        this.dequeueMutations(superseded);
+        superseded.forEach(mutation => this.finishMutation(mutation, true));
+        
+        const batchIds = Array.from(serverIds);
+        for (let start = 0; start < batchIds.length; start += this.maxClearBatch) {
+            settled.push(this.queueMutation('clear', null, { ids: batchIds.slice(start, start + this.maxClearBatch) }));
+        }
+        return Promise.all(settled).then(() => true);
     }
     
     getTodoById(id) {
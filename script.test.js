@@ -906,6 +906,102 @@ describe('TodoApp - Comprehensive Test Suite', () => {
       expect(editControls).toBeFalsy();
     });
 
+    test('HAPPY PATH: should only rebuild the items that changed', () => {
+      // Arrange
+      app.todos = [
+        { id: 1, name: 'Task 1', priority: '1', status: 'not started' },
+        { id: 2, name: 'Task 2', priority: '1', status: 'not started' },
+        { id: 3, name: 'Task 3', priority: '1', status: 'not started' }
+      ];
+      app.render();
+      const [first, second, third] = document.querySelectorAll('.todo-item');
+      
+      // Act
+      app.todos[1].status = 'completed';
+      app.render();
+      
+      // Assert
+      const todoItems = document.querySelectorAll('.todo-item');
+      expect(todoItems[0]).toBe(first);
+      expect(todoItems[1]).not.toBe(second);
+      expect(todoItems[1].classList.contains('status-highlight-completed')).toBe(true);
+      expect(todoItems[2]).toBe(third);
+    });
+
+    test('HAPPY PATH: should keep existing items when tasks are added and deleted', () => {
+      // Arrange
+      app.todos = [
+        { id: 1, name: 'Task 1', priority: '1', status: 'not started' },
+        { id: 2, name: 'Task 2', priority: '1', status: 'not started' },
+        { id: 3, name: 'Task 3', priority: '1', status: 'not started' }
+      ];
+      app.render();
+      const [first, , third] = document.querySelectorAll('.todo-item');
+      
+      // Act
+      app.todos = [app.todos[0], app.todos[2], { id: 4, name: 'Task 4', priority: '2', status: 'in progress' }];
+      app.render();
+      
+      // Assert
+      const todoItems = document.querySelectorAll('.todo-item');
+      expect(Array.from(todoItems).map(item => item.dataset.id)).toEqual(['1', '3', '4']);
+      expect(todoItems[0]).toBe(first);
+      expect(todoItems[1]).toBe(third);
+    });
+
+    test('HAPPY PATH: should toggle edit mode through the list click handler', () => {
+      // Arrange
+      app.todos = [
+        { id: 1, name: 'Task 1', priority: '1', status: 'not started' },
+        { id: 2, name: 'Task 2', priority: '1', status: 'not started' }
+      ];
+      app.render();
+      const other = document.querySelector('.todo-item[data-id="1"]');
+      
+      // Act
+      document.querySelector('.todo-item[data-id="2"] .todo-name').click();
+      
+      // Assert
+      expect(app.currentEditingId).toBe(2);
+      expect(document.querySelector('.todo-item[data-id="2"]').classList.contains('editing')).toBe(true);
+      expect(document.querySelector('.todo-item[data-id="1"]')).toBe(other);
+    });
+
+    test('LOAD: should only mount the rows near the viewport for a long list', () => {
+      // Arrange
+      app.todos = Array.from({ length: 5000 }, (_, i) => ({ id: i + 1, name: `Task ${i + 1}`, priority: '1', status: 'not started' }));
+      
+      // Act
+      app.render();
+      
+      // Assert
+      const todoItems = document.querySelectorAll('.todo-item');
+      expect(todoItems.length).toBeGreaterThan(0);
+      expect(todoItems.length).toBeLessThan(100);
+      expect(todoItems[0].dataset.id).toBe('1');
+      expect(document.querySelectorAll('.virtual-spacer')).toHaveLength(2);
+      expect(parseInt(document.querySelector('#todoList').lastElementChild.style.height)).toBeGreaterThan(0);
+    });
+
+    test('HAPPY PATH: should mount a far away row when scrolling to it', () => {
+      // Arrange
+      app.todos = Array.from({ length: 5000 }, (_, i) => ({ id: i + 1, name: `Task ${i + 1}`, priority: '1', status: 'not started' }));
+      app.render();
+      // jsdom has no layout, so fake the list scrolling past the first 4000 rows
+      const todoList = document.getElementById('todoList');
+      window.scrollTo = jest.fn();
+      todoList.getBoundingClientRect = () => ({ top: -4000 * app.rowPitch() });
+      
+      // Act
+      const found = app.scrollToTask(4000);
+      
+      // Assert
+      expect(found).toBe(true);
+      expect(document.querySelector('.todo-item[data-id="4000"]')).not.toBeNull();
+      expect(document.querySelector('.todo-item[data-id="1"]')).toBeNull();
+      expect(app.scrollToTask(99999)).toBe(false);
+    });
+
     test('EDGE CASE: should handle render when todoList element not found', () => {
       // Arrange
       document.getElementById('todoList').remove();
@@ -1320,6 +1416,469 @@ describe('TodoApp - Comprehensive Test Suite', () => {
     });
   });
 
+  // ============================================
+  // APP STATE TESTS
+  // ============================================
+  describe('App State Attributes', () => {
+
+    test('HAPPY PATH: should mark the app ready after init', async () => {
+      // Act
+      await app.init();
+      
+      // Assert
+      expect(document.body.dataset.appReady).toBe('true');
+      expect(document.body.dataset.pending).toBe('0');
+      expect(app.isSettled()).toBe(true);
+    });
+
+    test('HAPPY PATH: should report pending work while an API request is in flight', async () => {
+      // Arrange
+      let resolveFetch;
+      global.fetch = jest.fn()
+        .mockImplementationOnce(() => new Promise(resolve => { resolveFetch = resolve; }))
+        .mockResolvedValue({ ok: true, json: async () => ({ data: [] }) });
+      app.useApi = true;
+      app.ready = true;
+      
+      // Act
+      const pending = app.addTodoViaApi({ name: 'Task', priority: '1', status: 'not started' }, {});
+      
+      // Assert
+      expect(document.body.dataset.pending).toBe('1');
+      expect(app.isSettled()).toBe(false);
+      resolveFetch({ ok: true });
+      await pending;
+      expect(document.body.dataset.pending).toBe('0');
+      expect(app.isSettled()).toBe(true);
+    });
+
+    test('HAPPY PATH: refresh should reload state in place', async () => {
+      // Arrange
+      app.todos = [{ id: 1, name: 'Stale Task', priority: '1', status: 'not started' }];
+      app.currentEditingId = 1;
+      localStorage.setItem('todos', JSON.stringify([{ id: 2, name: 'Stored Task', priority: '2', status: 'completed' }]));
+      document.getElementById('todoName').value = 'Leftover input';
+      
+      // Act
+      await app.refresh();
+      
+      // Assert
+      expect(app.todos).toEqual([{ id: 2, name: 'Stored Task', priority: '2', status: 'completed' }]);
+      expect(app.currentEditingId).toBeNull();
+      expect(document.getElementById('todoName').value).toBe('');
+      expect(document.querySelectorAll('.todo-item')).toHaveLength(1);
+      expect(app.pendingOperations).toBe(0);
+    });
+
+    test('EDGE CASE: refresh should drop stale todos when nothing is stored', async () => {
+      // Arrange
+      app.todos = [{ id: 1, name: 'Stale Task', priority: '1', status: 'not started' }];
+      
+      // Act
+      await app.refresh();
+      
+      // Assert
+      expect(app.todos).toEqual([]);
+      expect(document.querySelector('.empty-state')).not.toBeNull();
+    });
+
+    test('HAPPY PATH: should load API tasks one page at a time', async () => {
+      // Arrange
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ data: [{ id: 1, name: 'Task 1', priority: '1', status: 'not started' }], nextCursor: 1 }) })
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ data: [{ id: 2, name: 'Task 2', priority: '2', status: 'completed' }], nextCursor: null }) });
+      app.useApi = true;
+      app.pageSize = 1;
+      
+      // Act
+      const loaded = await app.loadTodosFromApi();
+      
+      // Assert
+      expect(loaded).toBe(true);
+      expect(app.todos.map(todo => todo.id)).toEqual([1, 2]);
+      expect(global.fetch).toHaveBeenNthCalledWith(1, '/api/tasks?limit=1&after=0', { headers: { Accept: app.listAccept } });
+      expect(global.fetch).toHaveBeenNthCalledWith(2, '/api/tasks?limit=1&after=1', { headers: { Accept: app.listAccept } });
+    });
+
+    test('HAPPY PATH: should load pages sent in the columnar format', async () => {
+      // Arrange - one task, laid out as in task-columns.js
+      const ascii = (...parts) => Uint8Array.from(parts.flatMap(part => (typeof part === 'string' ? [...part].map(c => c.charCodeAt(0)) : [part])));
+      const body = ascii(
+        'TCOL', 1, 7, 1, 4, 'v-42', 0, // format 1, all columns, 1 task, version "v-42", no cursor
+        2, // id 1
+        1, 9, 'completed', 0, // status dictionary, code per task
+        1, 1, '2', 0, // priority dictionary, code per task
+        0, 8, 'Columnar' // names joined by U+0000
+      );
+      global.fetch = jest.fn().mockResolvedValue({
+        ok: true,
+        headers: { get: name => (name === 'Content-Type' ? 'application/vnd.todo.task-columns' : null) },
+        arrayBuffer: async () => body.buffer
+      });
+      app.useApi = true;
+      
+      // Act
+      const loaded = await app.loadTodosFromApi();
+      
+      // Assert
+      expect(loaded).toBe(true);
+      expect(app.listAccept).toMatch(/^application\/vnd\.todo\.task-columns, application\/json;q=0\.9$/);
+      expect(app.todos).toEqual([{ id: 1, name: 'Columnar', status: 'completed', priority: '2' }]);
+      expect(app.version).toBe('v-42');
+    });
+
+    test('FAILURE MODE: should keep the API backend and the current list when a page fails to load', async () => {
+      // Arrange
+      app.useApi = true;
+      app.todos = [{ id: 1, name: 'Shown', priority: '1', status: 'not started' }];
+      app.mutations = [{ key: 'k', type: 'create', id: -5, fields: { name: 'Queued', priority: '1', status: 'not started' } }];
+      localStorage.setItem('todos', JSON.stringify([{ id: 9, name: 'Stored', priority: '1', status: 'not started' }]));
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ data: [{ id: 2, name: 'Page 1', priority: '1', status: 'not started' }], nextCursor: 2 }) })
+        .mockResolvedValueOnce({ ok: false, status: 503 })
+        .mockRejectedValueOnce(new Error('Network error'));
+      
+      // Act
+      const afterBadPage = await app.loadTodosFromApi();
+      const afterNetworkError = await app.loadTodosFromApi();
+      
+      // Assert
+      expect(afterBadPage).toBe(false);
+      expect(afterNetworkError).toBe(false);
+      expect(app.useApi).toBe(true);
+      expect(app.todos.map(todo => todo.id)).toEqual([1, -5]);
+      expect(app.mutations).toHaveLength(1);
+    });
+
+    test('HAPPY PATH: should apply only the changes since the loaded version', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [
+        { id: 1, name: 'Keep', priority: '1', status: 'not started' },
+        { id: 2, name: 'Remove', priority: '1', status: 'not started' }
+      ];
+      global.fetch = jest.fn().mockResolvedValue({ ok: true, json: async () => ({
+        success: true,
+        version: 'abc-8',
+        created: [{ id: 3, name: 'New', priority: '2', status: 'not started' }],
+        updated: [{ id: 1, name: 'Keep', priority: '1', status: 'completed' }],
+        deleted: [2]
+      }) });
+      
+      // Act
+      const synced = await app.syncTodos();
+      
+      // Assert
+      expect(synced).toBe(true);
+      expect(global.fetch).toHaveBeenCalledWith('/api/tasks/changes?since=abc-5');
+      expect(app.todos.map(todo => [todo.id, todo.status])).toEqual([[1, 'completed'], [3, 'not started']]);
+      expect(app.version).toBe('abc-8');
+    });
+
+    test('FAILURE MODE: should reload the full list when the server no longer has the changes', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [{ id: 1, name: 'Stale', priority: '1', status: 'not started' }];
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: false, status: 410, json: async () => ({ success: false }) })
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ data: [{ id: 7, name: 'Fresh', priority: '1', status: 'not started' }], nextCursor: null, version: 'def-1' }) });
+      
+      // Act
+      await app.syncTodos();
+      
+      // Assert
+      expect(global.fetch).toHaveBeenNthCalledWith(2, '/api/tasks?limit=500&after=0', { headers: { Accept: app.listAccept } });
+      expect(app.todos.map(todo => todo.id)).toEqual([7]);
+      expect(app.version).toBe('def-1');
+    });
+
+    test('HAPPY PATH: should apply pushed changes that follow on from the current version', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [{ id: 1, name: 'Task 1', priority: '1', status: 'not started' }];
+      global.fetch = jest.fn();
+      
+      // Act
+      await app.applyPushedChanges({
+        since: 'abc-5',
+        version: 'abc-6',
+        created: [],
+        updated: [{ id: 1, name: 'Task 1', priority: '1', status: 'completed' }],
+        deleted: []
+      });
+      
+      // Assert
+      expect(global.fetch).not.toHaveBeenCalled();
+      expect(app.version).toBe('abc-6');
+      expect(document.querySelector('.todo-item').className).toContain('status-highlight-completed');
+    });
+
+    test('EDGE CASE: should fetch missing changes when a push skips ahead', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-3';
+      app.todos = [];
+      global.fetch = jest.fn().mockResolvedValue({ ok: true, json: async () => ({
+        success: true, version: 'abc-6', created: [{ id: 4, name: 'Missed', priority: '1', status: 'not started' }], updated: [], deleted: []
+      }) });
+      
+      // Act
+      await app.applyPushedChanges({ since: 'abc-5', version: 'abc-6', created: [], updated: [], deleted: [] });
+      
+      // Assert
+      expect(global.fetch).toHaveBeenCalledWith('/api/tasks/changes?since=abc-3');
+      expect(app.todos.map(todo => todo.name)).toEqual(['Missed']);
+      expect(app.pendingOperations).toBe(0);
+    });
+
+    test('HAPPY PATH: should show an added task before the server responds', async () => {
+      // Arrange
+      let resolveFetch;
+      global.fetch = jest.fn()
+        .mockImplementationOnce(() => new Promise(resolve => { resolveFetch = resolve; }))
+        .mockResolvedValue({ ok: true, json: async () => ({ success: true, version: 'abc-1', created: [], updated: [], deleted: [] }) });
+      app.useApi = true;
+      app.version = 'abc-0';
+
+      // Act
+      const saved = app.addTodoViaApi({ name: 'Fast', priority: '1', status: 'not started' });
+
+      // Assert
+      expect(document.querySelectorAll('.todo-item')).toHaveLength(1);
+      expect(app.todos[0].id).toBeLessThan(0);
+      resolveFetch({ ok: true, json: async () => ({ success: true, data: { id: 9, name: 'Fast', priority: '1', status: 'not started' } }) });
+      expect(await saved).toBe(true);
+      expect(app.todos.map(todo => todo.id)).toEqual([9]);
+      expect(app.mutations).toHaveLength(0);
+    });
+
+    test('FAILURE MODE: should keep queued changes and retry them when the network fails', async () => {
+      // Arrange
+      jest.useFakeTimers();
+      global.fetch = jest.fn()
+        .mockRejectedValueOnce(new TypeError('Failed to fetch'))
+        .mockResolvedValueOnce({ ok: true, status: 201, json: async () => ({ success: true, data: [
+          { id: 1, name: 'A', priority: '1', status: 'not started' },
+          { id: 2, name: 'B', priority: '1', status: 'not started' }
+        ] }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ success: true, version: 'abc-2', created: [], updated: [], deleted: [] }) });
+      app.useApi = true;
+      app.version = 'abc-0';
+
+      try {
+        // Act
+        const first = app.addTodoViaApi({ name: 'A', priority: '1', status: 'not started' });
+        const second = app.addTodoViaApi({ name: 'B', priority: '1', status: 'not started' });
+
+        // Assert
+        expect(app.useApi).toBe(true);
+        expect(JSON.parse(localStorage.getItem('todoMutations'))).toHaveLength(2);
+        expect(document.body.dataset.pending).toBe('2');
+        await jest.advanceTimersByTimeAsync(app.retryBaseDelay);
+        expect(await Promise.all([first, second])).toEqual([true, true]);
+        expect(global.fetch).toHaveBeenNthCalledWith(2, '/api/tasks/bulk', expect.objectContaining({ method: 'POST' }));
+        expect(app.todos.map(todo => todo.id)).toEqual([1, 2]);
+        expect(JSON.parse(localStorage.getItem('todoMutations'))).toEqual([]);
+      } finally {
+        jest.useRealTimers();
+      }
+    });
+
+    test('EDGE CASE: should fold an edit into a create that has not been sent yet', () => {
+      // Arrange
+      global.fetch = jest.fn(() => new Promise(() => {}));
+      app.useApi = true;
+      app.retryTimer = 1; // Hold the queue
+
+      // Act
+      app.addTodoViaApi({ name: 'Draft', priority: '1', status: 'not started' });
+      app.queueMutation('update', app.todos[0].id, { status: 'completed' });
+
+      // Assert
+      expect(app.mutations).toHaveLength(1);
+      expect(app.mutations[0].fields).toEqual({ name: 'Draft', priority: '1', status: 'completed' });
+    });
+
+    test('EDGE CASE: should not send anything for a task deleted before it was created', async () => {
+      // Arrange
+      global.fetch = jest.fn();
+      app.useApi = true;
+      app.retryTimer = 1; // Hold the queue
+      app.addTodoViaApi({ name: 'Oops', priority: '1', status: 'not started' });
+
+      // Act
+      const deleted = await app.deleteTodoViaApi(app.todos[0].id);
+
+      // Assert
+      expect(deleted).toBe(true);
+      expect(app.mutations).toHaveLength(0);
+      expect(app.pendingOperations).toBe(0);
+      expect(global.fetch).not.toHaveBeenCalled();
+    });
+
+    test('FAILURE MODE: should drop an edit to a task deleted elsewhere without an alert', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [{ id: 1, name: 'Gone', priority: '1', status: 'not started' }];
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: false, status: 404, json: async () => ({ success: false, error: 'Task not found' }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ success: true, version: 'abc-6', created: [], updated: [], deleted: [1] }) });
+
+      // Act
+      const saved = await app.queueMutation('update', 1, { status: 'completed' });
+
+      // Assert
+      expect(saved).toBe(false);
+      expect(global.alert).not.toHaveBeenCalled();
+      expect(app.todos).toEqual([]);
+    });
+
+    test('HAPPY PATH: should clear all tasks with one batch request', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [
+        { id: 1, name: 'A', priority: '1', status: 'not started' },
+        { id: 2, name: 'B', priority: '1', status: 'not started' },
+        { id: 3, name: 'C', priority: '1', status: 'not started' }
+      ];
+      global.confirm.mockReturnValue(true);
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ success: true, data: [], count: 3 }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ success: true, version: 'abc-6', created: [], updated: [], deleted: [1, 2, 3] }) });
+
+      // Act
+      const cleared = await app.clearAllTodos();
+
+      // Assert
+      expect(cleared).toBe(true);
+      expect(global.fetch).toHaveBeenNthCalledWith(1, '/api/tasks/batch', expect.objectContaining({ method: 'POST' }));
+      expect(JSON.parse(global.fetch.mock.calls[0][1].body)).toEqual({ operations: [
+        { op: 'delete', id: 1 }, { op: 'delete', id: 2 }, { op: 'delete', id: 3 }
+      ] });
+      expect(global.fetch).toHaveBeenCalledTimes(2); // The batch, then one sync
+      expect(app.todos).toEqual([]);
+    });
+
+    test('EDGE CASE: should resend a clear without the tasks already deleted elsewhere', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [
+        { id: 1, name: 'A', priority: '1', status: 'not started' },
+        { id: 2, name: 'B', priority: '1', status: 'not started' }
+      ];
+      global.confirm.mockReturnValue(true);
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: false, status: 400, json: async () => ({ success: false, errors: [{ index: 0, errors: ['Task not found'] }] }) })
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ success: true, data: [], count: 1 }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ success: true, version: 'abc-6', created: [], updated: [], deleted: [1, 2] }) });
+
+      // Act
+      const cleared = await app.clearAllTodos();
+
+      // Assert
+      expect(cleared).toBe(true);
+      expect(JSON.parse(global.fetch.mock.calls[1][1].body)).toEqual({ operations: [{ op: 'delete', id: 2 }] });
+      expect(global.alert).not.toHaveBeenCalled();
+      expect(app.todos).toEqual([]);
+    });
+
+    test('FAILURE MODE: should roll back a create the server rejects', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [{ id: 1, name: 'Keep', priority: '1', status: 'not started' }];
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: false, status: 400, json: async () => ({ success: false, errors: ['Task name cannot exceed 200 characters'] }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ data: [{ id: 1, name: 'Keep', priority: '1', status: 'not started' }], nextCursor: null, version: 'abc-5' }) });
+
+      // Act
+      const saved = await app.addTodoViaApi({ name: 'Rejected', priority: '1', status: 'not started' });
+
+      // Assert
+      expect(saved).toBe(false);
+      expect(app.todos.map(todo => todo.id)).toEqual([1]);
+      expect(global.fetch).toHaveBeenNthCalledWith(2, '/api/tasks?limit=500&after=0', { headers: { Accept: app.listAccept } });
+      expect(document.querySelectorAll('.todo-item')).toHaveLength(1);
+    });
+
+    test('FAILURE MODE: should restore the server state after a rejected update', async () => {
+      // Arrange
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.todos = [{ id: 1, name: 'Task', priority: '1', status: 'completed' }]; // Already applied optimistically
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: false, status: 400, json: async () => ({ success: false, errors: ['Invalid'] }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ data: [{ id: 1, name: 'Task', priority: '1', status: 'not started' }], nextCursor: null, version: 'abc-5' }) });
+
+      // Act
+      const saved = await app.queueMutation('update', 1, { status: 'completed' });
+
+      // Assert
+      expect(saved).toBe(false);
+      expect(app.todos).toEqual([{ id: 1, name: 'Task', priority: '1', status: 'not started' }]);
+      expect(app.version).toBe('abc-5');
+    });
+
+    test('HAPPY PATH: should restore queued changes after a reload', async () => {
+      // Arrange
+      localStorage.setItem('todoMutations', JSON.stringify([
+        { key: 'k1', type: 'create', id: -5, fields: { name: 'Offline', priority: '1', status: 'not started' } }
+      ]));
+      global.fetch = jest.fn()
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ data: [], nextCursor: null, version: 'abc-1' }) })
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ data: [], nextCursor: null, version: 'abc-1' }) })
+        .mockResolvedValueOnce({ ok: true, status: 201, json: async () => ({ success: true, data: { id: 4, name: 'Offline', priority: '1', status: 'not started' } }) })
+        .mockResolvedValue({ ok: true, json: async () => ({ success: true, version: 'abc-2', created: [], updated: [], deleted: [] }) });
+      const reloaded = new TodoApp(false);
+
+      // Act
+      await reloaded.init();
+      await reloaded.flushMutations();
+
+      // Assert
+      expect(global.fetch).toHaveBeenCalledWith('/api/tasks', expect.objectContaining({ method: 'POST' }));
+      expect(reloaded.todos.map(todo => [todo.id, todo.name])).toEqual([[4, 'Offline']]);
+      expect(reloaded.isSettled()).toBe(true);
+    });
+
+    test('EDGE CASE: should discard queued changes and the retry timer', async () => {
+      // Arrange
+      global.fetch = jest.fn();
+      app.useApi = true;
+      app.version = 'abc-5';
+      app.retryTimer = setTimeout(() => {}, 60000);
+      app.retryAttempts = 3;
+      const saved = app.queueMutation('update', 1, { status: 'completed' });
+
+      // Act
+      app.discardMutations();
+
+      // Assert
+      expect(await saved).toBe(false);
+      expect(app.mutations).toEqual([]);
+      expect(JSON.parse(localStorage.getItem('todoMutations'))).toEqual([]);
+      expect(app.retryTimer).toBeNull();
+      expect(app.retryAttempts).toBe(0);
+      expect(app.pendingOperations).toBe(0);
+      expect(app.version).toBeNull();
+      expect(global.fetch).not.toHaveBeenCalled();
+    });
+
+    test('EDGE CASE: should never report a negative pending count', () => {
+      // Act
+      app.endOperation();
+      
+      // Assert
+      expect(app.pendingOperations).toBe(0);
+    });
+  });
+
   // ============================================
   // INTEGRATION TESTS
   // ============================================
@@ -1,94 +1,407 @@
 const express = require('express');
 const cors = require('cors');
-const fs = require('fs').promises;
 const path = require('path');
+const { TaskLog } = require('./task-log');
+const { TaskStore } = require('./task-store');
+const { SORT_KEYS, tokenize } = require('./task-index');
+const { TaskWriter, VALID_PRIORITIES, VALID_STATUSES } = require('./task-writer');
+const { ClusterReplica } = require('./cluster-replication');
+const { Registry, monitorEventLoopLag } = require('./metrics');
+const { StaticAssets } = require('./static-assets');
+const { TASK_COLUMNS_TYPE, encodeTaskColumns } = require('./task-columns');
 
 const app = express();
 const PORT = process.env.PORT || 3000;
-const STORAGE_FILE = path.join(__dirname, 'tasks.json');
+const STORAGE_FILE = process.env.TASKS_FILE ? path.resolve(process.env.TASKS_FILE) : path.join(__dirname, 'tasks.json');
+
+// Metrics, served as Prometheus text at GET /metrics (see metrics.js)
+const metrics = new Registry();
+const httpDuration = metrics.histogram('http_request_duration_seconds', 'Time from request to response, by route pattern', ['method', 'route', 'status']);
+const httpInFlight = metrics.gauge('http_requests_in_flight', 'Requests received but not yet answered');
+const storageWriteDuration = metrics.histogram('todo_storage_write_duration_seconds', 'Time spent writing tasks to storage (append: one logged change, snapshot: saveTasks())', ['op']);
+const eventLoopLag = metrics.histogram('nodejs_eventloop_lag_seconds', 'How late a 100ms timer fires', [], [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]);
+monitorEventLoopLag(eventLoopLag);
+
+// Label requests by route pattern, not URL, so ids and query strings don't each get a series
+function routeLabel(req) {
+    if (req.route) {
+        return req.route.path;
+    }
+    return req.path.startsWith('/api/') ? 'unmatched' : 'static';
+}
 
 // Middleware
+app.use((req, res, next) => {
+    // Scrapes and long-lived event streams would skew the latency numbers
+    if (req.path === '/metrics' || req.path === '/api/tasks/stream') {
+        return next();
+    }
+    httpInFlight.inc();
+    const end = httpDuration.startTimer({ method: req.method });
+    let done = false;
+    // 'finish' once the response is sent; 'close' alone when the client goes away first
+    const record = () => {
+        if (done) {
+            return;
+        }
+        done = true;
+        httpInFlight.dec();
+        end({ route: routeLabel(req), status: res.statusCode });
+    };
+    res.once('finish', record);
+    res.once('close', record);
+    next();
+});
 app.use(cors());
-app.use(express.json());
-app.use(express.static(__dirname)); // Serve static files (index.html, etc.)
+app.use(express.json({ limit: '10mb' })); // Allow bulk requests
+
+// The UI, and nothing else from this directory (see static-assets.js)
+const STATIC_FILES = ['index.html', 'script.js', 'styles.css'];
+const staticAssets = new StaticAssets(__dirname, STATIC_FILES);
+app.use(staticAssets.middleware());
 
 // Initialize storage
-let tasks = [];
-let nextId = 1;
+const store = new TaskStore({
+    maxChanges: parseInt(process.env.TASKS_MAX_CHANGES, 10) || undefined,
+    indexed: process.env.TASKS_SEARCH_INDEX !== 'false'
+});
 
-// Load tasks from file on startup
+// Changes are appended to `<STORAGE_FILE>.log` and periodically compacted into STORAGE_FILE (see task-log.js)
+const taskLog = new TaskLog(STORAGE_FILE, {
+    snapshot: () => store.snapshot(),
+    compactBytes: parseInt(process.env.TASKS_COMPACT_BYTES, 10) || undefined,
+    fsync: process.env.TASKS_FSYNC === 'true'
+});
+
+// Load tasks from the snapshot and replay the log on startup
 async function loadTasks() {
+    if (replica) {
+        await replica.start();
+        console.log(`Worker ${process.pid} synced ${store.size} tasks from the cluster primary`);
+        return;
+    }
     try {
-        const data = await fs.readFile(STORAGE_FILE, 'utf8');
-        const parsedData = JSON.parse(data);
-        tasks = parsedData.tasks || [];
-        nextId = parsedData.nextId || 1;
-        console.log(`Loaded ${tasks.length} tasks from storage`);
+        const state = await taskLog.load();
+        store.load(state);
+        const replayed = state.replayed ? ` (${state.replayed} log entries replayed)` : '';
+        console.log(`Loaded ${store.size} tasks from storage${replayed}`);
     } catch (error) {
-        if (error.code === 'ENOENT') {
-            console.log('No existing storage file, starting fresh');
-            tasks = [];
-            nextId = 1;
-        } else {
-            console.error('Error loading tasks:', error.message);
-        }
+        console.error('Error loading tasks:', error.message);
     }
 }
 
-// Save tasks to file
+// Record a change already applied to the store; resolves once it is in the log
+async function persist(entry) {
+    const end = storageWriteDuration.startTimer({ op: 'append' });
+    await taskLog.append({ ...entry, nextId: store.nextId });
+    end();
+    notifyStreams();
+}
+
+// Write a full snapshot of the tasks and truncate the log
 async function saveTasks() {
+    const end = storageWriteDuration.startTimer({ op: 'snapshot' });
     try {
-        const data = JSON.stringify({ tasks, nextId }, null, 2);
-        await fs.writeFile(STORAGE_FILE, data, 'utf8');
+        await taskLog.compact();
+        end();
     } catch (error) {
         console.error('Error saving tasks:', error.message);
         throw error;
     }
 }
 
-// Validation helpers
-function validateTask(task) {
+// In cluster mode (see cluster.js) this process is a worker: the primary owns
+// storage and applies every write, and this process keeps a read replica of
+// its store. Otherwise writes are applied and logged right here.
+const replica = process.env.TASKS_CLUSTER_WORKER === 'true' ? new ClusterReplica(store, { onChange: () => notifyStreams() }) : null;
+const writer = replica || new TaskWriter(store, { persist, compact: saveTasks });
+
+// Upper bound for a single POST /api/tasks/bulk request
+const MAX_BULK_TASKS = 10000;
+
+// Upper bound for a single POST /api/tasks/batch request
+const MAX_BATCH_OPERATIONS = 10000;
+
+// Upper bound for ?limit= on GET /api/tasks
+const MAX_PAGE_SIZE = 1000;
+
+const TASK_FIELDS = ['id', 'name', 'status', 'priority'];
+
+// Longest ?q= accepted on GET /api/tasks
+const MAX_QUERY_LENGTH = 200;
+const SORT_PATTERN = new RegExp(`^(-?)(${Object.keys(SORT_KEYS).join('|')})$`);
+
+// Cursors for sorts other than id are [key, id] pairs, handed out as base64url JSON
+function encodeCursor(cursor) {
+    return Array.isArray(cursor) ? Buffer.from(JSON.stringify(cursor)).toString('base64url') : cursor;
+}
+
+function decodeCursor(value) {
+    try {
+        const cursor = JSON.parse(Buffer.from(String(value), 'base64url').toString());
+        const valid = Array.isArray(cursor) && cursor.length === 2 &&
+            ['string', 'number'].includes(typeof cursor[0]) && Number.isInteger(cursor[1]);
+        return valid ? cursor : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+// GET /api/tasks representations, negotiated by Accept: JSON unless the client
+// prefers the columnar format (see task-columns.js)
+const LIST_FORMATS = {
+    'application/json': { tag: '', contentType: 'application/json; charset=utf-8', encode: result => Buffer.from(JSON.stringify(result)) },
+    [TASK_COLUMNS_TYPE]: {
+        tag: '-columns',
+        contentType: TASK_COLUMNS_TYPE,
+        encode: ({ data, nextCursor, version }, fields) => encodeTaskColumns({ tasks: data, fields, nextCursor, version })
+    }
+};
+
+// Serialized GET /api/tasks responses for the current store version, keyed by
+// format and URL. Any change to the store bumps its version and drops them all.
+const MAX_CACHED_LISTS = 100;
+const listCache = new Map();
+let listCacheVersion = -1;
+
+// Versions handed to clients are "<epoch>-<store version>", so a version from
+// before a restart is never mistaken for one from this process
+const VERSION_EPOCH = process.env.TASKS_VERSION_EPOCH || Date.now().toString(36); // Shared by every worker in cluster mode
+const VERSION_PATTERN = /^([0-9a-z]+)-(\d+)$/;
+
+function currentVersion() {
+    return `${VERSION_EPOCH}-${store.version}`;
+}
+
+// Store version for a version string from this process, or null
+function parseVersion(value) {
+    const match = VERSION_PATTERN.exec(String(value));
+    return match && match[1] === VERSION_EPOCH ? Number(match[2]) : null;
+}
+
+// `build` returns the serialized body; `tag` tells this format's ETag apart from the others
+function cachedList(key, build, tag = '') {
+    if (listCacheVersion !== store.version) {
+        listCache.clear();
+        listCacheVersion = store.version;
+    }
+    let entry = listCache.get(key);
+    if (!entry) {
+        if (listCache.size >= MAX_CACHED_LISTS) {
+            listCache.delete(listCache.keys().next().value);
+        }
+        entry = { etag: `"${currentVersion()}${tag}"`, body: build() };
+        listCache.set(key, entry);
+    }
+    return entry;
+}
+
+// Open GET /api/tasks/stream responses. Changes are pushed to them as a delta
+// from `streamVersion`, the store version the previous push brought them to.
+// Writes in the same tick share one push.
+const STREAM_HEARTBEAT_MS = 25000;
+const streamClients = new Set();
+let streamVersion = 0;
+let streamPushScheduled = false;
+let streamHeartbeat = null;
+
+function notifyStreams() {
+    if (streamClients.size === 0 || streamPushScheduled) {
+        return;
+    }
+    streamPushScheduled = true;
+    setImmediate(pushChanges);
+}
+
+function pushChanges() {
+    streamPushScheduled = false;
+    if (store.version === streamVersion) {
+        return;
+    }
+    const changes = store.changesSince(streamVersion);
+    const since = `${VERSION_EPOCH}-${streamVersion}`;
+    streamVersion = store.version;
+    
+    // Without the changes (after a reset) clients are told to resync instead
+    const message = changes
+        ? `event: changes\ndata: ${JSON.stringify({ since, version: currentVersion(), ...changes })}\n\n`
+        : `event: reset\ndata: ${JSON.stringify({ version: currentVersion() })}\n\n`;
+    streamClients.forEach(client => client.write(message));
+}
+
+// Parse GET /api/tasks query parameters (limit, after, status, priority, fields)
+function parseListQuery(query) {
     const errors = [];
+    const options = { after: null, limit: Infinity, terms: [], sort: 'id', descending: false, fields: TASK_FIELDS };
+    
+    if (query.limit !== undefined) {
+        const limit = Number(query.limit);
+        if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PAGE_SIZE) {
+            errors.push(`limit must be an integer between 1 and ${MAX_PAGE_SIZE}`);
+        } else {
+            options.limit = limit;
+        }
+    }
     
-    if (task.name === null || task.name === undefined || typeof task.name !== 'string') {
-        errors.push('Task name is required and must be a string');
-    } else if (task.name.trim().length === 0) {
-        errors.push('Task name cannot be empty or whitespace only');
-    } else if (task.name.length > 200) {
-        errors.push('Task name cannot exceed 200 characters');
+    if (query.sort !== undefined) {
+        const match = String(query.sort).match(SORT_PATTERN);
+        if (!match) {
+            errors.push(`sort must be one of ${Object.keys(SORT_KEYS).join(', ')}, optionally prefixed with - for descending`);
+        } else {
+            options.descending = match[1] === '-';
+            options.sort = match[2];
+        }
     }
     
-    const validPriorities = ['1', '2', '3'];
-    if (task.priority && !validPriorities.includes(String(task.priority))) {
-        errors.push('Priority must be 1, 2, or 3');
+    if (query.after !== undefined) {
+        const after = options.sort === 'id' ? Number(query.after) : decodeCursor(query.after);
+        if (options.sort === 'id' && (!Number.isInteger(after) || after < 0)) {
+            errors.push('after must be a task ID');
+        } else if (after === null) {
+            errors.push('after must be a nextCursor returned for the same sort');
+        } else {
+            options.after = after;
+        }
     }
     
-    const validStatuses = ['not started', 'in progress', 'completed'];
-    if (task.status && !validStatuses.includes(task.status)) {
+    if (query.q !== undefined) {
+        const q = String(query.q);
+        options.terms = tokenize(q);
+        if (q.length > MAX_QUERY_LENGTH) {
+            errors.push(`q cannot exceed ${MAX_QUERY_LENGTH} characters`);
+        } else if (options.terms.length === 0) {
+            errors.push('q must contain at least one letter or digit');
+        }
+    }
+    
+    const { status, priority } = query;
+    if (status !== undefined && !VALID_STATUSES.includes(status)) {
         errors.push('Status must be "not started", "in progress", or "completed"');
     }
+    if (priority !== undefined && !VALID_PRIORITIES.includes(priority)) {
+        errors.push('Priority must be 1, 2, or 3');
+    }
+    options.status = status;
+    options.priority = priority;
+    
+    if (query.fields !== undefined) {
+        const fields = String(query.fields).split(',').map(field => field.trim()).filter(Boolean);
+        const unknown = fields.filter(field => !TASK_FIELDS.includes(field));
+        if (unknown.length > 0) {
+            errors.push(`Unknown fields: ${unknown.join(', ')}`);
+        } else {
+            // The id is always returned so clients can address the tasks
+            options.fields = ['id', ...fields.filter(field => field !== 'id')];
+        }
+    }
     
-    return errors;
+    return { errors, options };
 }
 
+// Sampled at scrape time
+const taskCount = metrics.gauge('todo_tasks', 'Tasks in the store');
+const streamClientCount = metrics.gauge('todo_stream_clients', 'Open GET /api/tasks/stream connections');
+const storageOperations = metrics.gauge('todo_storage_operations', 'Task log activity since startup (see GET /api/health)', ['kind']);
+metrics.onCollect(() => {
+    taskCount.set({}, store.size);
+    streamClientCount.set({}, streamClients.size);
+    Object.entries(taskLog.stats).forEach(([kind, value]) => storageOperations.set({ kind }, value));
+});
+
 // Routes
 
-// GET /api/tasks - Get all tasks
+// GET /metrics - Prometheus metrics: request latency by route, requests in flight, storage write time, event loop lag
+app.get('/metrics', (req, res) => {
+    res.type('text/plain; version=0.0.4; charset=utf-8').send(metrics.render());
+});
+
+// GET /api/health - Readiness probe; the server only listens once stored tasks are loaded, so any answer means ready
+app.get('/api/health', (req, res) => {
+    res.json({ success: true, status: 'ready', count: store.size, uptime: process.uptime(), pid: process.pid, storage: replica ? replica.storageStats : taskLog.stats });
+});
+
+// GET /api/tasks - Get tasks (conditional on If-None-Match), optionally paginated (?limit=&after=), filtered (?status=&priority=), searched by name (?q=), sorted (?sort=) and projected (?fields=), as JSON or columns (Accept)
 app.get('/api/tasks', (req, res) => {
     try {
-        // Return simplified task data (name and status) as requested
-        const simplifiedTasks = tasks.map(task => ({
-            id: task.id,
-            name: task.name,
-            status: task.status,
-            priority: task.priority
-        }));
-        res.json({ success: true, data: simplifiedTasks, count: tasks.length });
+        const { errors, options } = parseListQuery(req.query);
+        if (errors.length > 0) {
+            return res.status(400).json({ success: false, errors });
+        }
+        
+        const type = req.accepts(Object.keys(LIST_FORMATS)) || 'application/json';
+        const format = LIST_FORMATS[type];
+        let searchMs = null;
+        const { etag, body } = cachedList(`${type} ${req.originalUrl}`, () => {
+            const start = process.hrtime.bigint();
+            const { items, nextCursor } = store.search(options);
+            searchMs = Number(process.hrtime.bigint() - start) / 1e6;
+            const data = items.map(task => {
+                const projected = {};
+                options.fields.forEach(field => {
+                    projected[field] = task[field];
+                });
+                return projected;
+            });
+            return format.encode({ success: true, data, count: data.length, nextCursor: encodeCursor(nextCursor), version: currentVersion() }, options.fields);
+        }, format.tag);
+        
+        // Clients must revalidate, which costs them a 304 with no body while nothing has changed
+        res.set({ ETag: etag, 'Cache-Control': 'no-cache' });
+        res.vary('Accept');
+        // Time spent finding the tasks, or that the response came from the cache
+        res.set('Server-Timing', searchMs === null ? 'cache;desc="hit"' : `search;dur=${searchMs.toFixed(3)}`);
+        if (req.fresh) {
+            return res.status(304).end();
+        }
+        res.set('Content-Type', format.contentType).send(body);
     } catch (error) {
         res.status(500).json({ success: false, error: 'Failed to retrieve tasks' });
     }
 });
 
+// GET /api/tasks/changes?since=<version> - Tasks created, updated and deleted since a version
+app.get('/api/tasks/changes', (req, res) => {
+    try {
+        const { since } = req.query;
+        if (since === undefined || !VERSION_PATTERN.test(String(since))) {
+            return res.status(400).json({ success: false, errors: ['since must be a version returned by the API'] });
+        }
+        
+        const sinceVersion = parseVersion(since);
+        const changes = sinceVersion === null ? null : store.changesSince(sinceVersion);
+        if (!changes) {
+            // Restarted server or too far behind: the client has to reload the full list
+            return res.status(410).json({ success: false, error: 'Changes since this version are no longer available', version: currentVersion() });
+        }
+        
+        res.json({ success: true, version: currentVersion(), ...changes });
+    } catch (error) {
+        res.status(500).json({ success: false, error: 'Failed to retrieve changes' });
+    }
+});
+
+// GET /api/tasks/stream - Server-sent events with every change to the tasks
+app.get('/api/tasks/stream', (req, res) => {
+    res.set({ 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', Connection: 'keep-alive' });
+    res.flushHeaders();
+    
+    if (streamClients.size === 0) {
+        streamVersion = store.version;
+        // Comment lines keep idle connections from being closed by proxies
+        streamHeartbeat = setInterval(() => streamClients.forEach(client => client.write(': ping\n\n')), STREAM_HEARTBEAT_MS);
+        streamHeartbeat.unref();
+    }
+    streamClients.add(res);
+    res.write(`retry: 2000\nevent: ready\ndata: ${JSON.stringify({ version: currentVersion() })}\n\n`);
+    
+    res.on('close', () => {
+        streamClients.delete(res);
+        if (streamClients.size === 0) {
+            clearInterval(streamHeartbeat);
+        }
+    });
+});
+
 // GET /api/tasks/:id - Get a specific task
 app.get('/api/tasks/:id', (req, res) => {
     try {
@@ -97,7 +410,7 @@ app.get('/api/tasks/:id', (req, res) => {
             return res.status(400).json({ success: false, error: 'Invalid task ID' });
         }
         
-        const task = tasks.find(t => t.id === id);
+        const task = store.get(id);
         if (!task) {
             return res.status(404).json({ success: false, error: 'Task not found' });
         }
@@ -111,32 +424,63 @@ app.get('/api/tasks/:id', (req, res) => {
 // POST /api/tasks - Create a new task
 app.post('/api/tasks', async (req, res) => {
     try {
-        const { name, priority = '1', status = 'not started' } = req.body;
+        const { errors, task } = await writer.create(req.body || {});
+        if (errors) {
+            return res.status(400).json({ success: false, errors });
+        }
         
-        // Validate input
-        const errors = validateTask({ name, priority, status });
-        if (errors.length > 0) {
+        res.status(201).json({ success: true, data: task, message: 'Task created successfully' });
+    } catch (error) {
+        res.status(500).json({ success: false, error: 'Failed to create task' });
+    }
+});
+
+// POST /api/tasks/bulk - Create many tasks with a single write to storage
+app.post('/api/tasks/bulk', async (req, res) => {
+    try {
+        const items = req.body && req.body.tasks;
+        if (!Array.isArray(items) || items.length === 0) {
+            return res.status(400).json({ success: false, errors: ['Request body must contain a non-empty "tasks" array'] });
+        }
+        if (items.length > MAX_BULK_TASKS) {
+            return res.status(400).json({ success: false, errors: [`Cannot create more than ${MAX_BULK_TASKS} tasks per request`] });
+        }
+        
+        // Validated all up front, so the request is all-or-nothing
+        const { errors, tasks } = await writer.createMany(items);
+        if (errors) {
             return res.status(400).json({ success: false, errors });
         }
         
-        // Create new task
-        const newTask = {
-            id: nextId++,
-            name: name.trim(),
-            priority: String(priority),
-            status: status.toLowerCase()
-        };
+        res.status(201).json({ success: true, data: tasks, count: tasks.length, message: 'Tasks created successfully' });
+    } catch (error) {
+        res.status(500).json({ success: false, error: 'Failed to create tasks' });
+    }
+});
+
+// POST /api/tasks/batch - Create, update and delete many tasks in one all-or-nothing request
+app.post('/api/tasks/batch', async (req, res) => {
+    try {
+        const operations = req.body && req.body.operations;
+        if (!Array.isArray(operations) || operations.length === 0) {
+            return res.status(400).json({ success: false, errors: ['Request body must contain a non-empty "operations" array'] });
+        }
+        if (operations.length > MAX_BATCH_OPERATIONS) {
+            return res.status(400).json({ success: false, errors: [`Cannot apply more than ${MAX_BATCH_OPERATIONS} operations per request`] });
+        }
         
-        tasks.push(newTask);
-        await saveTasks();
+        const { errors, results } = await writer.batch(operations);
+        if (errors) {
+            return res.status(400).json({ success: false, errors });
+        }
         
-        res.status(201).json({ success: true, data: newTask, message: 'Task created successfully' });
+        res.json({ success: true, data: results, count: results.length, message: 'Batch applied successfully' });
     } catch (error) {
-        res.status(500).json({ success: false, error: 'Failed to create task' });
+        res.status(500).json({ success: false, error: 'Failed to apply batch' });
     }
 });
 
-// PUT /api/tasks/:id - Update an existing task
+// PUT /api/tasks/:id - Update an existing task (only the fields provided)
 app.put('/api/tasks/:id', async (req, res) => {
     try {
         const id = parseInt(req.params.id);
@@ -144,40 +488,15 @@ app.put('/api/tasks/:id', async (req, res) => {
             return res.status(400).json({ success: false, error: 'Invalid task ID' });
         }
         
-        const taskIndex = tasks.findIndex(t => t.id === id);
-        if (taskIndex === -1) {
+        const { notFound, errors, task } = await writer.update(id, req.body || {});
+        if (notFound) {
             return res.status(404).json({ success: false, error: 'Task not found' });
         }
-        
-        const { name, priority, status } = req.body;
-        const updateData = {};
-        
-        // Only update provided fields
-        if (name !== undefined) {
-            updateData.name = name;
-        }
-        if (priority !== undefined) {
-            updateData.priority = priority;
-        }
-        if (status !== undefined) {
-            updateData.status = status;
-        }
-        
-        // Validate updates
-        const taskToValidate = { ...tasks[taskIndex], ...updateData };
-        const errors = validateTask(taskToValidate);
-        if (errors.length > 0) {
+        if (errors) {
             return res.status(400).json({ success: false, errors });
         }
         
-        // Apply updates
-        if (name !== undefined) tasks[taskIndex].name = name.trim();
-        if (priority !== undefined) tasks[taskIndex].priority = String(priority);
-        if (status !== undefined) tasks[taskIndex].status = status.toLowerCase();
-        
-        await saveTasks();
-        
-        res.json({ success: true, data: tasks[taskIndex], message: 'Task updated successfully' });
+        res.json({ success: true, data: task, message: 'Task updated successfully' });
     } catch (error) {
         res.status(500).json({ success: false, error: 'Failed to update task' });
     }
@@ -191,21 +510,33 @@ app.delete('/api/tasks/:id', async (req, res) => {
             return res.status(400).json({ success: false, error: 'Invalid task ID' });
         }
         
-        const taskIndex = tasks.findIndex(t => t.id === id);
-        if (taskIndex === -1) {
+        const { notFound, task } = await writer.delete(id);
+        if (notFound) {
             return res.status(404).json({ success: false, error: 'Task not found' });
         }
         
-        const deletedTask = tasks[taskIndex];
-        tasks.splice(taskIndex, 1);
-        await saveTasks();
-        
-        res.json({ success: true, data: deletedTask, message: 'Task deleted successfully' });
+        res.json({ success: true, data: task, message: 'Task deleted successfully' });
     } catch (error) {
         res.status(500).json({ success: false, error: 'Failed to delete task' });
     }
 });
 
+// Test-only routes, enabled for Jest and for servers started by the E2E suite
+const TEST_ROUTES_ENABLED = process.env.NODE_ENV === 'test' || process.env.ENABLE_TEST_ROUTES === 'true';
+
+if (TEST_ROUTES_ENABLED) {
+    // POST /api/test/reset - Delete all tasks in a single request
+    app.post('/api/test/reset', async (req, res) => {
+        try {
+            const { count } = await resetStorage();
+            
+            res.json({ success: true, count, message: 'Storage reset successfully' });
+        } catch (error) {
+            res.status(500).json({ success: false, error: 'Failed to reset storage' });
+        }
+    });
+}
+
 // Start server
 async function startServer() {
     await loadTasks();
@@ -216,16 +547,35 @@ async function startServer() {
             console.log(`Server running on http://localhost:${PORT}`);
             console.log(`API endpoints available at http://localhost:${PORT}/api/tasks`);
         });
+        
+        if (replica) {
+            // The primary compacts storage when the cluster shuts down; if it dies, so do its workers
+            process.once('disconnect', () => process.exit(0));
+            return;
+        }
+        
+        // Fold the log into a snapshot on shutdown so the next start has nothing to replay
+        const shutdown = async () => {
+            try {
+                await saveTasks();
+            } finally {
+                process.exit(0);
+            }
+        };
+        process.once('SIGINT', shutdown);
+        process.once('SIGTERM', shutdown);
     }
 }
 
-// Reset function for testing
-function resetStorage() {
-    tasks = [];
-    nextId = 1;
+// Reset function for testing: deletes every task like any other write, so the
+// reset is logged and compacted and a reload does not bring the tasks back
+async function resetStorage() {
+    const result = await writer.reset();
+    notifyStreams();
+    return result;
 }
 
 startServer();
 
 // Export for testing
-module.exports = { app, loadTasks, saveTasks, resetStorage };
+module.exports = { app, loadTasks, saveTasks, resetStorage, store, taskLog, metrics, staticAssets };
@@ -0,0 +1,155 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+// The UI's files, served from memory with precompressed variants
+//
+// Only the files listed are served; nothing else in the directory is
+// reachable. Everything is built once at startup: each file gets a content
+// hash, and the entry page's links to the other files are rewritten to
+// hashed names (script.<hash>.js). Hashed files never change, so they are
+// cached for a year as immutable. The entry page and the plain names are
+// served with `no-cache` and revalidated by ETag. Brotli and gzip variants
+// are compressed once, at the highest levels, and kept only if smaller.
+
+const CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8'
+};
+
+const IMMUTABLE = 'public, max-age=31536000, immutable';
+const REVALIDATE = 'no-cache';
+
+// In order of preference
+const ENCODINGS = {
+    br: body => zlib.brotliCompressSync(body, {
+        params: {
+            [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+            [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length
+        }
+    }),
+    gzip: body => zlib.gzipSync(body, { level: zlib.constants.Z_BEST_COMPRESSION })
+};
+
+function contentHash(body) {
+    return crypto.createHash('sha256').update(body).digest('hex').slice(0, 10);
+}
+
+function hashedName(file, hash) {
+    const ext = path.extname(file);
+    return `${file.slice(0, -ext.length)}.${hash}${ext}`;
+}
+
+// Identity body plus any compressed variants that are smaller, each with its own strong ETag
+function buildAsset(file, body, cacheControl) {
+    const hash = contentHash(body);
+    const variants = { identity: { body, etag: `"${hash}"` } };
+    Object.entries(ENCODINGS).forEach(([encoding, compress]) => {
+        const compressed = compress(body);
+        if (compressed.length < body.length) {
+            variants[encoding] = { body: compressed, etag: `"${hash}-${encoding}"` };
+        }
+    });
+    return { file, hash, type: CONTENT_TYPES[path.extname(file)] || 'application/octet-stream', cacheControl, variants };
+}
+
+// Quality values from an Accept-Encoding header: "br;q=1.0, gzip;q=0.5, *;q=0" -> Map
+function parseAcceptEncoding(header = '') {
+    const accepted = new Map();
+    header.split(',').forEach(part => {
+        const [name, ...params] = part.trim().toLowerCase().split(';');
+        if (!name) {
+            return;
+        }
+        const q = params.map(param => param.trim()).find(param => param.startsWith('q='));
+        accepted.set(name, q ? parseFloat(q.slice(2)) || 0 : 1);
+    });
+    return accepted;
+}
+
+// The preferred encoding the client accepts and the asset has, then 'identity'
+// unless the client refused it ("identity;q=0", or "*;q=0" without an identity
+// entry); null if nothing is acceptable
+function negotiateEncoding(header, variants) {
+    const accepted = parseAcceptEncoding(header);
+    const wildcard = accepted.get('*') || 0;
+    const encoding = Object.keys(ENCODINGS).find(name => variants[name] && (accepted.has(name) ? accepted.get(name) : wildcard) > 0);
+    if (encoding) {
+        return encoding;
+    }
+    const identity = accepted.has('identity') ? accepted.get('identity') : accepted.has('*') ? wildcard : 1;
+    return identity > 0 ? 'identity' : null;
+}
+
+function matchesEtag(header, etag) {
+    if (!header) {
+        return false;
+    }
+    return header.split(',').some(tag => {
+        const value = tag.trim();
+        return value === '*' || value.replace(/^W\//, '') === etag;
+    });
+}
+
+class StaticAssets {
+    // `files` are relative to `root`; `index` is the entry page served at /
+    constructor(root, files, { index = 'index.html' } = {}) {
+        this.routes = new Map(); // URL path -> asset
+        const links = [];
+        files.filter(file => file !== index).forEach(file => {
+            const body = fs.readFileSync(path.join(root, file));
+            const hashed = buildAsset(file, body, IMMUTABLE);
+            const url = hashedName(file, hashed.hash);
+            this.routes.set(`/${url}`, hashed);
+            this.routes.set(`/${file}`, { ...hashed, cacheControl: REVALIDATE });
+            links.push([file, url]);
+        });
+
+        // Point the entry page at the hashed names, so a deploy changes the URLs it loads
+        let html = fs.readFileSync(path.join(root, index), 'utf8');
+        links.forEach(([file, url]) => {
+            const escaped = file.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+            html = html.replace(new RegExp(`((?:src|href)=["'])${escaped}(["'])`, 'g'), `$1${url}$2`);
+        });
+        const page = buildAsset(index, Buffer.from(html), REVALIDATE);
+        this.routes.set('/', page);
+        this.routes.set(`/${index}`, page);
+    }
+
+    // Hashed URL of a file, e.g. 'script.js' -> '/script.3f2a9c1b0d.js'
+    urlFor(file) {
+        const asset = this.routes.get(`/${file}`);
+        return asset ? `/${hashedName(file, asset.hash)}` : undefined;
+    }
+
+    middleware() {
+        return (req, res, next) => {
+            const asset = (req.method === 'GET' || req.method === 'HEAD') && this.routes.get(req.path);
+            if (!asset) {
+                return next();
+            }
+            const encoding = negotiateEncoding(req.headers['accept-encoding'], asset.variants);
+            res.setHeader('Vary', 'Accept-Encoding');
+            if (!encoding) {
+                return res.status(406).end();
+            }
+            const variant = asset.variants[encoding];
+
+            res.setHeader('Cache-Control', asset.cacheControl);
+            res.setHeader('ETag', variant.etag);
+            if (matchesEtag(req.headers['if-none-match'], variant.etag)) {
+                return res.status(304).end();
+            }
+            res.setHeader('Content-Type', asset.type);
+            res.setHeader('Content-Length', variant.body.length);
+            if (encoding !== 'identity') {
+                res.setHeader('Content-Encoding', encoding);
+            }
+            res.status(200).end(req.method === 'HEAD' ? undefined : variant.body);
+        };
+    }
+}
+
+module.exports = { StaticAssets, negotiateEncoding, parseAcceptEncoding };
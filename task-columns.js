@@ -0,0 +1,146 @@
+// Compact columnar encoding of a GET /api/tasks response
+//
+// JSON repeats every key on every task; for long lists most of the bytes are
+// keys, quotes and the same few status strings. This format sends one column
+// per field instead:
+//
+//   "TCOL", format version (1 byte), columns present (1 byte: 1 name, 2 status, 4 priority)
+//   count, version (string), nextCursor (0 none | 1 id, then the id | 2 string, then the string)
+//   ids: count zigzag varints, each the difference from the previous id (the first from 0)
+//   status, priority: a dictionary (size, then strings) and one byte per task indexing it
+//   names: all names as one string, either joined by U+0000 (layout byte 0) or, if a
+//     name contains U+0000, preceded by count varints of each name's length in UTF-16
+//     code units (layout byte 1)
+//
+// Varints are unsigned LEB128 and strings are a varint byte length followed
+// by UTF-8. Ids in creation order are one byte each. Names are one string so
+// a browser decodes them with a single TextDecoder call and a split.
+// Decoders: TodoApp.decodeTaskColumns in script.js and tests/api/task_columns.py.
+
+const TASK_COLUMNS_TYPE = 'application/vnd.todo.task-columns';
+
+const MAGIC = Buffer.from('TCOL');
+const FORMAT_VERSION = 1;
+const COLUMN_FLAGS = { name: 1, status: 2, priority: 4 };
+const CURSOR_NONE = 0;
+const CURSOR_ID = 1;
+const CURSOR_STRING = 2;
+const NAMES_JOINED = 0;
+const NAMES_WITH_LENGTHS = 1;
+const NAME_SEPARATOR = '\u0000';
+
+// Appends to a buffer that grows as needed
+class ByteWriter {
+    constructor(size = 1024) {
+        this.buffer = Buffer.allocUnsafe(size);
+        this.length = 0;
+    }
+
+    reserve(bytes) {
+        if (this.length + bytes > this.buffer.length) {
+            const grown = Buffer.allocUnsafe(Math.max(this.buffer.length * 2, this.length + bytes));
+            this.buffer.copy(grown, 0, 0, this.length);
+            this.buffer = grown;
+        }
+    }
+
+    byte(value) {
+        this.reserve(1);
+        this.buffer[this.length++] = value;
+    }
+
+    bytes(buffer) {
+        this.reserve(buffer.length);
+        buffer.copy(this.buffer, this.length);
+        this.length += buffer.length;
+    }
+
+    // Unsigned LEB128; arithmetic rather than bit operations so ids above 2^31 survive
+    varint(value) {
+        this.reserve(8);
+        while (value >= 0x80) {
+            this.buffer[this.length++] = (value % 0x80) | 0x80;
+            value = Math.floor(value / 0x80);
+        }
+        this.buffer[this.length++] = value;
+    }
+
+    // Signed values: 0, -1, 1, -2 ... as 0, 1, 2, 3 ...
+    zigzag(value) {
+        this.varint(value < 0 ? -2 * value - 1 : 2 * value);
+    }
+
+    string(value) {
+        const encoded = Buffer.from(value, 'utf8');
+        this.varint(encoded.length);
+        this.bytes(encoded);
+    }
+
+    toBuffer() {
+        return this.buffer.subarray(0, this.length);
+    }
+}
+
+// Values as indexes into a dictionary of the distinct values, in order of first appearance
+function writeDictionary(writer, values) {
+    const codes = new Map();
+    const column = Buffer.allocUnsafe(values.length);
+    values.forEach((value, index) => {
+        let code = codes.get(value);
+        if (code === undefined) {
+            code = codes.size;
+            codes.set(value, code);
+        }
+        column[index] = code;
+    });
+    if (codes.size > 256) {
+        throw new Error(`Too many distinct values for a dictionary column: ${codes.size}`);
+    }
+    writer.varint(codes.size);
+    codes.forEach((code, value) => writer.string(value));
+    writer.bytes(column);
+}
+
+// `tasks` hold `fields` ('id' always); `nextCursor` is an id, a string or null
+function encodeTaskColumns({ tasks, fields, nextCursor, version }) {
+    const writer = new ByteWriter(64 + tasks.length * 16);
+    writer.bytes(MAGIC);
+    writer.byte(FORMAT_VERSION);
+    writer.byte(fields.reduce((flags, field) => flags | (COLUMN_FLAGS[field] || 0), 0));
+    writer.varint(tasks.length);
+    writer.string(version);
+    if (nextCursor === null || nextCursor === undefined) {
+        writer.byte(CURSOR_NONE);
+    } else if (typeof nextCursor === 'number') {
+        writer.byte(CURSOR_ID);
+        writer.varint(nextCursor);
+    } else {
+        writer.byte(CURSOR_STRING);
+        writer.string(nextCursor);
+    }
+
+    let previous = 0;
+    tasks.forEach(task => {
+        writer.zigzag(task.id - previous);
+        previous = task.id;
+    });
+    ['status', 'priority'].forEach(field => {
+        if (fields.includes(field)) {
+            writeDictionary(writer, tasks.map(task => task[field]));
+        }
+    });
+    if (fields.includes('name')) {
+        const names = tasks.map(task => task.name);
+        if (names.some(name => name.includes(NAME_SEPARATOR))) {
+            writer.byte(NAMES_WITH_LENGTHS);
+            names.forEach(name => writer.varint(name.length));
+            writer.string(names.join(''));
+        } else {
+            writer.byte(NAMES_JOINED);
+            writer.string(names.join(NAME_SEPARATOR));
+        }
+    }
+    return writer.toBuffer();
+}
+
+module.exports = { TASK_COLUMNS_TYPE, encodeTaskColumns };
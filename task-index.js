@@ -0,0 +1,218 @@
+const { VALID_STATUSES } = require('./task-writer');
+
+// Secondary indexes over the tasks in a TaskStore, for search without a scan
+//
+// Status and priority each map a value to the set of task ids that have it,
+// and so does each pair of them, so filtering by both is one lookup rather
+// than an intersection of two large sets.
+// Names are split into lowercase words, and each word maps to the ids whose
+// name contains it. The distinct words are also kept sorted, so all words
+// starting with a prefix are one binary search and a short walk away. New
+// words are sorted into that list on the next prefix lookup, not on every
+// write: a few are inserted where they belong, many at once (a bulk create)
+// are sorted and merged in one pass. Removed words are skipped on lookup and
+// dropped by that one-pass merge, which also runs as soon as they make up
+// half of the word lists, so create/delete churn cannot grow them.
+//
+// The store keeps the index current on every change: `add` a new task,
+// `update(before, task)` with the fields as they were, `remove` a deleted one.
+
+// Sort orders for search(): each maps a task to the key it is ordered by (ties go by id)
+const SORT_KEYS = {
+    id: task => task.id,
+    name: task => task.name.toLowerCase(),
+    priority: task => Number(task.priority),
+    status: task => VALID_STATUSES.indexOf(task.status) // Workflow order, not alphabetical
+};
+
+// Lowercase words (runs of letters and digits), each once
+function tokenize(text) {
+    const words = String(text).toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+    return words.length > 1 ? words.filter((word, index) => words.indexOf(word) === index) : words;
+}
+
+// Up to this many new words are inserted one by one; more are sorted and merged
+const MAX_WORD_INSERTS = 64;
+
+// Index of the first item in the sorted array that is >= value
+function lowerBound(items, value) {
+    let low = 0;
+    let high = items.length;
+    while (low < high) {
+        const middle = (low + high) >>> 1;
+        if (items[middle] < value) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+
+// Bucket key for a status and priority pair
+function pairKey(status, priority) {
+    return `${status}\n${priority}`;
+}
+
+function addTo(buckets, value, id) {
+    let ids = buckets.get(value);
+    if (!ids) {
+        ids = new Set();
+        buckets.set(value, ids);
+    }
+    ids.add(id);
+}
+
+function removeFrom(buckets, value, id) {
+    const ids = buckets.get(value);
+    if (ids) {
+        ids.delete(id);
+        if (ids.size === 0) {
+            buckets.delete(value);
+        }
+    }
+}
+
+class TaskIndex {
+    constructor() {
+        this.clear();
+    }
+
+    clear() {
+        this.byStatus = new Map(); // status -> Set of ids
+        this.byPriority = new Map(); // priority -> Set of ids
+        this.byPair = new Map(); // pairKey(status, priority) -> Set of ids
+        this.byWord = new Map(); // word -> Set of ids
+        this.wordsById = new Map(); // id -> words of its name, to unindex it
+        this.sortedWords = []; // Distinct words in order; may still hold removed words
+        this.newWords = []; // Added since sortedWords was last merged
+        this.removedWords = 0; // Words whose last task went since the last full merge
+    }
+
+    add(task) {
+        addTo(this.byStatus, task.status, task.id);
+        addTo(this.byPriority, task.priority, task.id);
+        addTo(this.byPair, pairKey(task.status, task.priority), task.id);
+        this.addWords(task.id, tokenize(task.name));
+    }
+
+    // `before` holds the task's name, status and priority before the change
+    update(before, task) {
+        if (before.status !== task.status) {
+            removeFrom(this.byStatus, before.status, task.id);
+            addTo(this.byStatus, task.status, task.id);
+        }
+        if (before.priority !== task.priority) {
+            removeFrom(this.byPriority, before.priority, task.id);
+            addTo(this.byPriority, task.priority, task.id);
+        }
+        if (before.status !== task.status || before.priority !== task.priority) {
+            removeFrom(this.byPair, pairKey(before.status, before.priority), task.id);
+            addTo(this.byPair, pairKey(task.status, task.priority), task.id);
+        }
+        if (before.name !== task.name) {
+            this.removeWords(task.id);
+            this.addWords(task.id, tokenize(task.name));
+        }
+    }
+
+    remove(task) {
+        if (!this.wordsById.has(task.id)) {
+            return; // Never indexed (a placeholder from replication)
+        }
+        removeFrom(this.byStatus, task.status, task.id);
+        removeFrom(this.byPriority, task.priority, task.id);
+        removeFrom(this.byPair, pairKey(task.status, task.priority), task.id);
+        this.removeWords(task.id);
+    }
+
+    addWords(id, words) {
+        this.wordsById.set(id, words);
+        words.forEach(word => {
+            let ids = this.byWord.get(word);
+            if (!ids) {
+                ids = new Set();
+                this.byWord.set(word, ids);
+                this.newWords.push(word);
+            }
+            ids.add(id);
+        });
+    }
+
+    removeWords(id) {
+        (this.wordsById.get(id) || []).forEach(word => {
+            removeFrom(this.byWord, word, id);
+            if (!this.byWord.has(word)) {
+                this.removedWords++;
+            }
+        });
+        this.wordsById.delete(id);
+        if (this.removedWords > Math.max(MAX_WORD_INSERTS, (this.sortedWords.length + this.newWords.length) / 2)) {
+            this.mergeWords(true);
+        }
+    }
+
+    // Sort new words into sortedWords; `full` always rebuilds it, dropping removed words
+    mergeWords(full = false) {
+        if (this.newWords.length === 0 && !full) {
+            return;
+        }
+        if (this.newWords.length <= MAX_WORD_INSERTS && !full) {
+            this.newWords.forEach(word => {
+                const index = lowerBound(this.sortedWords, word);
+                if (this.sortedWords[index] !== word) { // Not left over from before it was removed
+                    this.sortedWords.splice(index, 0, word);
+                }
+            });
+            this.newWords = [];
+            return;
+        }
+        // One pass that also drops removed and repeated words
+        const added = this.newWords.sort();
+        const merged = [];
+        let i = 0;
+        let j = 0;
+        while (i < this.sortedWords.length || j < added.length) {
+            const word = j >= added.length || (i < this.sortedWords.length && this.sortedWords[i] <= added[j])
+                ? this.sortedWords[i++]
+                : added[j++];
+            if (this.byWord.has(word) && merged[merged.length - 1] !== word) {
+                merged.push(word);
+            }
+        }
+        this.sortedWords = merged;
+        this.newWords = [];
+        this.removedWords = 0;
+    }
+
+    // Ids of the tasks with this status and priority (empty if none)
+    withStatusAndPriority(status, priority) {
+        return this.byPair.get(pairKey(status, priority)) || new Set();
+    }
+
+    // Id sets of the words that start with `prefix`, and how many ids they hold in total
+    wordsStartingWith(prefix) {
+        this.mergeWords();
+        const sets = [];
+        let size = 0;
+        for (let index = lowerBound(this.sortedWords, prefix); index < this.sortedWords.length; index++) {
+            const word = this.sortedWords[index];
+            if (!word.startsWith(prefix)) {
+                break;
+            }
+            const ids = this.byWord.get(word);
+            if (ids) {
+                sets.push(ids);
+                size += ids.size;
+            }
+        }
+        return { sets, size };
+    }
+
+    // Whether a word of the task's name starts with `prefix`
+    hasWordStartingWith(id, prefix) {
+        return (this.wordsById.get(id) || []).some(word => word.startsWith(prefix));
+    }
+}
+
+module.exports = { TaskIndex, SORT_KEYS, tokenize };
@@ -0,0 +1,201 @@
+const fs = require('fs').promises;
+const path = require('path');
+
+// Append-only persistence for tasks
+//
+// The storage file (tasks.json) holds a snapshot: { tasks, nextId, seq }.
+// Every change since the snapshot is appended to `<storage file>.log` as one
+// JSON line with an increasing `seq`. Writes that arrive while a batch is
+// being written are grouped into the next batch (group commit), so N
+// concurrent requests cost one append instead of N full-file rewrites.
+// Once the log grows past `compactBytes` it is folded into a new snapshot,
+// written to a temp file and renamed over the old one (atomic on POSIX), and
+// only then is the log truncated. Replay skips entries the snapshot already
+// contains, so a crash at any point leaves a consistent state.
+
+const LOG_SUFFIX = '.log';
+const DEFAULT_COMPACT_BYTES = 1024 * 1024;
+
+// Apply one log entry to in-memory state ({ tasks: Map of id -> task, nextId })
+function applyOperation(state, entry) {
+    switch (entry.op) {
+        case 'put':
+            entry.tasks.forEach(task => state.tasks.set(task.id, task));
+            break;
+        case 'delete':
+            entry.ids.forEach(id => state.tasks.delete(id));
+            break;
+        case 'batch':
+            // Final state of the tasks a batch created or updated, then the ids it deleted
+            entry.tasks.forEach(task => state.tasks.set(task.id, task));
+            entry.ids.forEach(id => state.tasks.delete(id));
+            break;
+        case 'reset':
+            state.tasks.clear();
+            break;
+        default:
+            throw new Error(`Unknown log operation: ${entry.op}`);
+    }
+    state.nextId = entry.nextId;
+    return state;
+}
+
+// Read a storage file and its log without writing anything
+async function readState(storageFile) {
+    let snapshot = { tasks: [], nextId: 1, seq: 0 };
+    try {
+        const parsed = JSON.parse(await fs.readFile(storageFile, 'utf8'));
+        snapshot = { tasks: parsed.tasks || [], nextId: parsed.nextId || 1, seq: parsed.seq || 0 };
+    } catch (error) {
+        if (error.code !== 'ENOENT') {
+            throw error;
+        }
+    }
+
+    let logData = '';
+    try {
+        logData = await fs.readFile(storageFile + LOG_SUFFIX, 'utf8');
+    } catch (error) {
+        if (error.code !== 'ENOENT') {
+            throw error;
+        }
+    }
+
+    const state = { tasks: new Map(snapshot.tasks.map(task => [task.id, task])), nextId: snapshot.nextId };
+    let seq = snapshot.seq;
+    let replayed = 0;
+    for (const line of logData.split('\n')) {
+        if (!line.trim()) {
+            continue;
+        }
+        let entry;
+        try {
+            entry = JSON.parse(line);
+        } catch (error) {
+            // Torn write from a crash mid-append; everything after it is lost anyway
+            break;
+        }
+        if (entry.seq <= seq) {
+            continue; // Already folded into the snapshot
+        }
+        applyOperation(state, entry);
+        seq = entry.seq;
+        replayed++;
+    }
+
+    return { tasks: Array.from(state.tasks.values()), nextId: state.nextId, seq, replayed, logBytes: Buffer.byteLength(logData) };
+}
+
+class TaskLog {
+    constructor(storageFile, { snapshot, compactBytes = DEFAULT_COMPACT_BYTES, fsync = false } = {}) {
+        this.storageFile = storageFile;
+        this.logFile = storageFile + LOG_SUFFIX;
+        this.snapshot = snapshot; // () => ({ tasks, nextId }) of the current in-memory state
+        this.compactBytes = compactBytes;
+        this.fsync = fsync;
+        this.seq = 0;
+        this.logBytes = 0;
+        this.pending = [];
+        this.batchScheduled = false;
+        this.queue = Promise.resolve();
+        this.stats = { appends: 0, batches: 0, compactions: 0 };
+    }
+
+    // Load snapshot + log; returns { tasks, nextId, replayed }
+    async load() {
+        const state = await readState(this.storageFile);
+        this.seq = state.seq;
+        this.logBytes = state.logBytes;
+        return state;
+    }
+
+    // Record a change that has already been applied in memory.
+    // Resolves once it is written to the log (together with any concurrent changes).
+    append(entry) {
+        this.seq++;
+        this.stats.appends++;
+        const line = JSON.stringify({ seq: this.seq, ...entry }) + '\n';
+
+        return new Promise((resolve, reject) => {
+            this.pending.push({ line, resolve, reject });
+            if (!this.batchScheduled) {
+                this.batchScheduled = true;
+                this.queue = this.queue.then(() => this._writeBatch());
+            }
+        });
+    }
+
+    async _writeBatch() {
+        const batch = this.pending;
+        this.pending = [];
+        this.batchScheduled = false;
+
+        const data = batch.map(item => item.line).join('');
+        try {
+            await this._appendToLog(data);
+            this.logBytes += Buffer.byteLength(data);
+            this.stats.batches++;
+            batch.forEach(item => item.resolve());
+        } catch (error) {
+            console.error('Error writing task log:', error.message);
+            batch.forEach(item => item.reject(error));
+            return;
+        }
+
+        if (this.logBytes >= this.compactBytes) {
+            try {
+                await this._compact();
+            } catch (error) {
+                // The log still has every change, so this only delays compaction
+                console.error('Error compacting task log:', error.message);
+            }
+        }
+    }
+
+    async _appendToLog(data) {
+        // Opened per batch so the log can be deleted or replaced underneath us (tests, manual cleanup)
+        const handle = await fs.open(this.logFile, 'a');
+        try {
+            await handle.write(data);
+            if (this.fsync) {
+                await handle.datasync();
+            }
+        } finally {
+            await handle.close();
+        }
+    }
+
+    // Write the full in-memory state as a new snapshot and truncate the log
+    compact() {
+        const result = this.queue.then(() => this._compact());
+        this.queue = result.catch(() => {}); // A failed compaction must not block later writes
+        return result;
+    }
+
+    async _compact() {
+        const { tasks, nextId } = this.snapshot();
+        const data = JSON.stringify({ tasks, nextId, seq: this.seq });
+        const tempFile = path.join(path.dirname(this.storageFile), `.${path.basename(this.storageFile)}.${process.pid}.tmp`);
+
+        const handle = await fs.open(tempFile, 'w');
+        try {
+            await handle.write(data);
+            await handle.sync();
+        } finally {
+            await handle.close();
+        }
+        await fs.rename(tempFile, this.storageFile);
+
+        // Entries still pending have seq <= snapshot seq and are skipped on replay
+        await fs.writeFile(this.logFile, '');
+        this.logBytes = 0;
+        this.stats.compactions++;
+    }
+
+    // Wait for every change appended so far to be written
+    flush() {
+        return this.queue;
+    }
+}
+
+module.exports = { TaskLog, readState, applyOperation, LOG_SUFFIX };
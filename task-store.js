@@ -0,0 +1,442 @@
+// In-memory task store keyed by id
+//
+// A Map keeps insertion order (so listing returns tasks in creation order,
+// as the old array did) while get/update/delete by id are O(1) instead of
+// linear `find`/`findIndex`/`splice` over an array.
+//
+// Ids are handed out in increasing order, so creation order is also id
+// order. `order` keeps every id ever created (deleted ones are skipped when
+// read and swept out once they pile up), which lets a page cursor
+// (`after=<id>`) be found with a binary search instead of a scan from the start.
+//
+// `version` goes up on every change, so callers can tell whether anything
+// derived from the tasks (such as a serialized response) is still current.
+// The most recent changes are kept as (version, op, id) entries so that a
+// client holding an older version can be sent only what changed since.
+//
+// `search()` filters by status, priority and name prefix through the
+// secondary indexes in task-index.js, which every change below keeps current.
+
+const { TaskIndex, SORT_KEYS, tokenize } = require('./task-index');
+
+// Rebuild `order` once this many deleted ids are left in it (and they are the majority)
+const MIN_ORDER_SWEEP = 1024;
+
+// Default number of changes kept for changesSince()
+const MAX_CHANGES = 10000;
+
+// Index of the first item in the sorted array whose key is greater than `value`
+function firstIndexAfter(items, value, key = item => item) {
+    let low = 0;
+    let high = items.length;
+    while (low < high) {
+        const middle = (low + high) >>> 1;
+        if (key(items[middle]) <= value) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+
+// The first `limit` entries in `compare` order, without sorting all of them when only a few are wanted
+function firstInOrder(entries, limit, compare) {
+    if (entries.length <= limit * 4) {
+        return entries.sort(compare).slice(0, limit);
+    }
+    const first = [];
+    entries.forEach(entry => {
+        if (first.length === limit && compare(entry, first[limit - 1]) >= 0) {
+            return;
+        }
+        let low = 0;
+        let high = first.length;
+        while (low < high) {
+            const middle = (low + high) >>> 1;
+            if (compare(first[middle], entry) <= 0) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        first.splice(low, 0, entry);
+        if (first.length > limit) {
+            first.pop();
+        }
+    });
+    return first;
+}
+
+// Collects search() matches past the cursor and returns the first page of them in sort order
+class SearchResults {
+    constructor(sort, descending, after, limit) {
+        const direction = descending ? -1 : 1;
+        this.sort = sort;
+        this.key = SORT_KEYS[sort];
+        this.limit = limit;
+        this.compare = (a, b) => (a[0] < b[0] ? -direction : a[0] > b[0] ? direction : a[1] - b[1]);
+        this.cursor = after === null || after === undefined ? null : sort === 'id' ? [after, after] : after;
+        this.entries = []; // [sort key, id, task]
+    }
+
+    add(task) {
+        const entry = [this.key(task), task.id, task];
+        if (!this.cursor || this.compare(entry, this.cursor) > 0) {
+            this.entries.push(entry);
+        }
+    }
+
+    // { items, nextCursor } as returned by search()
+    page() {
+        const first = firstInOrder(this.entries, this.limit, this.compare);
+        const items = first.map(entry => entry[2]);
+        if (this.entries.length <= this.limit) {
+            return { items, nextCursor: null };
+        }
+        const last = first[first.length - 1];
+        return { items, nextCursor: this.sort === 'id' ? last[1] : [last[0], last[1]] };
+    }
+}
+
+class TaskStore {
+    // `indexed: false` makes search() scan every task instead (the baseline the indexes are measured against)
+    constructor({ maxChanges = MAX_CHANGES, indexed = true } = {}) {
+        this.tasks = new Map();
+        this.index = new TaskIndex();
+        this.indexed = indexed;
+        this.order = [];
+        this.deletedInOrder = 0;
+        this.nextId = 1;
+        this.version = 0;
+        this.maxChanges = maxChanges;
+        this.changes = [];
+        this.changesFrom = 0; // Oldest version changesSince() can answer for
+        this.onChange = null; // (op, id) after every change, used to replicate the store in cluster mode
+    }
+
+    // Bump the version and remember which task changed
+    record(op, id) {
+        this.version++;
+        this.changes.push({ version: this.version, op, id });
+        if (this.onChange) {
+            this.onChange(op, id);
+        }
+        // Trim in chunks so the array is not shifted on every change
+        if (this.changes.length > this.maxChanges * 2) {
+            this.changes = this.changes.slice(-this.maxChanges);
+            this.changesFrom = this.changes[0].version - 1;
+        }
+    }
+
+    // Start a new history; changes from before now can no longer be replayed
+    clearChanges() {
+        this.version++;
+        this.changes = [];
+        this.changesFrom = this.version;
+    }
+
+    // Replace the contents with loaded state ({ tasks: [...], nextId })
+    load({ tasks, nextId }) {
+        const sorted = [...tasks].sort((a, b) => a.id - b.id);
+        this.tasks = new Map(sorted.map(task => [task.id, task]));
+        this.order = sorted.map(task => task.id);
+        this.index.clear();
+        sorted.forEach(task => this.index.add(task));
+        this.deletedInOrder = 0;
+        this.nextId = nextId;
+        this.clearChanges();
+    }
+
+    get size() {
+        return this.tasks.size;
+    }
+
+    list() {
+        return Array.from(this.tasks.values());
+    }
+
+    get(id) {
+        return this.tasks.get(id);
+    }
+
+    has(id) {
+        return this.tasks.has(id);
+    }
+
+    // Create a task from already validated fields and return it
+    create({ name, priority, status }) {
+        const task = {
+            id: this.nextId++,
+            name: name.trim(),
+            priority: String(priority),
+            status: status.toLowerCase()
+        };
+        this.tasks.set(task.id, task);
+        this.order.push(task.id);
+        this.index.add(task);
+        this.record('create', task.id);
+        return task;
+    }
+
+    // Apply already validated fields; returns the updated task or undefined if it doesn't exist
+    update(id, { name, priority, status }) {
+        const task = this.tasks.get(id);
+        if (!task) {
+            return undefined;
+        }
+        const before = { name: task.name, priority: task.priority, status: task.status };
+        if (name !== undefined) task.name = name.trim();
+        if (priority !== undefined) task.priority = String(priority);
+        if (status !== undefined) task.status = status.toLowerCase();
+        this.index.update(before, task);
+        this.record('update', id);
+        return task;
+    }
+
+    // Remove a task; returns it or undefined if it doesn't exist
+    delete(id) {
+        const task = this.tasks.get(id);
+        if (task) {
+            this.tasks.delete(id);
+            this.index.remove(task);
+            this.record('delete', id);
+            this.deletedInOrder++;
+            if (this.deletedInOrder >= MIN_ORDER_SWEEP && this.deletedInOrder > this.order.length / 2) {
+                this.order = Array.from(this.tasks.keys());
+                this.deletedInOrder = 0;
+            }
+        }
+        return task;
+    }
+
+    reset() {
+        this.tasks.clear();
+        this.index.clear();
+        this.order = [];
+        this.deletedInOrder = 0;
+        this.nextId = 1;
+        this.clearChanges();
+        if (this.onChange) {
+            this.onChange('reset');
+        }
+    }
+
+    // Tasks created, updated and deleted after version `since`, each listed once
+    // with its current state. Returns null if `since` is older than the kept
+    // changes (or newer than the store), in which case the caller must reload everything.
+    changesSince(since) {
+        if (since < this.changesFrom || since > this.version) {
+            return null;
+        }
+        const touched = new Set();
+        const createdIds = new Set();
+        for (let index = firstIndexAfter(this.changes, since, change => change.version); index < this.changes.length; index++) {
+            const { op, id } = this.changes[index];
+            touched.add(id);
+            if (op === 'create') {
+                createdIds.add(id);
+            }
+        }
+        
+        const created = [];
+        const updated = [];
+        const deleted = [];
+        Array.from(touched).sort((a, b) => a - b).forEach(id => {
+            const task = this.tasks.get(id);
+            if (task) {
+                (createdIds.has(id) ? created : updated).push(task);
+            } else if (!createdIds.has(id)) {
+                // Created and deleted since `since`: the caller never saw it
+                deleted.push(id);
+            }
+        });
+        return { created, updated, deleted };
+    }
+
+    // Up to `limit` tasks with id > `after` that pass `filter`, in creation order
+    // (or with id < `after`, newest first, if `descending`). `nextCursor` is the
+    // id to pass as `after` for the next page, or null on the last page.
+    // `idFilter` is checked on the id before the task is looked up. Returns null
+    // instead if the page is not complete after `maxVisits` tasks.
+    page({ after = 0, limit = Infinity, filter = null, idFilter = null, descending = false, maxVisits = Infinity } = {}) {
+        const items = [];
+        const step = descending ? -1 : 1;
+        let index = descending
+            ? (after ? firstIndexAfter(this.order, after - 1) - 1 : this.order.length - 1)
+            : firstIndexAfter(this.order, after);
+        for (let visits = 0; index >= 0 && index < this.order.length; index += step, visits++) {
+            if (visits === maxVisits) {
+                return null;
+            }
+            const id = this.order[index];
+            if (idFilter && !idFilter(id)) {
+                continue;
+            }
+            const task = this.tasks.get(id);
+            if (!task || (filter && !filter(task))) {
+                continue;
+            }
+            if (items.length === limit) {
+                return { items, nextCursor: items[items.length - 1].id };
+            }
+            items.push(task);
+        }
+        return { items, nextCursor: null };
+    }
+
+    // A page of the tasks matching every given filter, in `sort` order
+    //
+    // `terms` are lowercase word prefixes that must each start a word of the
+    // name; `sort` is a key of SORT_KEYS, with ties in id order. For sort
+    // 'id' the cursor (`after`, `nextCursor`) is a task id, as in page();
+    // otherwise it is [key, id] of the last task returned. The smallest index
+    // set picks the candidates and the other filters are checked on each of
+    // them, unless walking creation order is expected to reach `limit`
+    // matches sooner.
+    search({ terms = [], status, priority, sort = 'id', descending = false, after = null, limit = Infinity } = {}) {
+        if (!this.indexed) {
+            return this.scan({ terms, status, priority, sort, descending, after, limit });
+        }
+        // Smallest first: it is the driver, and the id checks fail soonest on it
+        const filters = this.indexFilters(terms, status, priority).sort((a, b) => a.size - b.size);
+        const driver = filters[0];
+        const others = filters.slice(1).reduceRight((rest, filter) => (rest ? id => filter.test(id) && rest(id) : filter.test), null);
+        if (sort === 'id') {
+            if (!driver) {
+                return this.page({ after: after || 0, limit, descending });
+            }
+            // Walking creation order visits about limit / (fraction of tasks that match) tasks; going
+            // through the driver's candidates visits driver.size
+            const walk = limit / this.matchFraction(filters);
+            if (walk < driver.size) {
+                // The estimate assumes the filters are independent; if they are not, give up on the walk
+                // well before it has cost as much as the candidates would
+                const idFilter = others ? id => driver.test(id) && others(id) : driver.test;
+                const page = this.page({ after: after || 0, limit, idFilter, descending, maxVisits: Math.ceil(Math.min(walk * 4, driver.size / 2)) });
+                if (page) {
+                    return page;
+                }
+            }
+        }
+
+        const results = new SearchResults(sort, descending, after, limit);
+        if (!driver) {
+            this.tasks.forEach(task => results.add(task));
+            return results.page();
+        }
+        // Check the other filters on the id first; only matches need their task looked up
+        const seen = driver.sets.length > 1 ? new Set() : null; // A name can have several words with the prefix
+        driver.sets.forEach(ids => ids.forEach(id => {
+            if (seen) {
+                if (seen.has(id)) return;
+                seen.add(id);
+            }
+            if (!others || others(id)) {
+                results.add(this.tasks.get(id));
+            }
+        }));
+        return results.page();
+    }
+
+    // search() without the indexes: every task is checked against every filter
+    scan({ terms, status, priority, sort, descending, after, limit }) {
+        const filters = [
+            ...terms.map(term => task => tokenize(task.name).some(word => word.startsWith(term))),
+            ...(status === undefined ? [] : [task => task.status === status]),
+            ...(priority === undefined ? [] : [task => task.priority === priority])
+        ];
+        const filter = filters.length === 0 ? null : task => filters.every(test => test(task));
+        if (sort === 'id') {
+            return this.page({ after: after || 0, limit, filter, descending });
+        }
+        const results = new SearchResults(sort, descending, after, limit);
+        this.tasks.forEach(task => {
+            if (!filter || filter(task)) {
+                results.add(task);
+            }
+        });
+        return results.page();
+    }
+
+    // One filter per constraint (status and priority together are one): the index sets
+    // holding its candidates, their total size, and a check by id
+    indexFilters(terms, status, priority) {
+        const filters = terms.map(term => {
+            const { sets, size } = this.index.wordsStartingWith(term);
+            const test = sets.length === 1 ? id => sets[0].has(id) : id => this.index.hasWordStartingWith(id, term);
+            return { sets, size, test };
+        });
+        const bucket = status !== undefined && priority !== undefined ? this.index.withStatusAndPriority(status, priority)
+            : status !== undefined ? this.index.byStatus.get(status)
+            : priority !== undefined ? this.index.byPriority.get(priority)
+            : null;
+        if (bucket !== null) {
+            const ids = bucket || new Set();
+            filters.push({ sets: [ids], size: ids.size, test: id => ids.has(id) });
+        }
+        return filters;
+    }
+
+    // Expected fraction of tasks that pass every filter, if the filters are independent
+    matchFraction(filters) {
+        return filters.reduce((product, filter) => product * (filter.size / Math.max(this.size, 1)), 1);
+    }
+
+    snapshot() {
+        return { tasks: this.list(), nextId: this.nextId };
+    }
+
+    // Everything a replica needs to answer reads and changesSince() exactly like this store
+    replicaState() {
+        return {
+            tasks: this.list(),
+            nextId: this.nextId,
+            version: this.version,
+            changes: this.changes,
+            changesFrom: this.changesFrom
+        };
+    }
+
+    loadReplica({ tasks, nextId, version, changes, changesFrom }) {
+        this.load({ tasks, nextId });
+        this.version = version;
+        this.changes = changes;
+        this.changesFrom = changesFrom;
+    }
+
+    // Repeat changes made to another store, in the same order, so this store ends
+    // at the same version. `ops` are { op, id, task } with the task's state after
+    // the change (missing if a later change in the same group deleted it). Every
+    // op is recorded, even one with nothing left to change here, as the other
+    // store recorded it. Returns false if this store did not end at `version`.
+    applyReplicated(ops, nextId, version) {
+        ops.forEach(({ op, id, task }) => {
+            if (op === 'create') {
+                this.tasks.set(id, task || { id });
+                this.order.push(id);
+                if (task) {
+                    this.index.add(task);
+                }
+                this.record('create', id);
+            } else if (op === 'update') {
+                const before = this.tasks.get(id);
+                if (task && before) {
+                    this.tasks.set(id, task);
+                    this.index.update(before, task);
+                }
+                this.record('update', id);
+            } else if (op === 'delete') {
+                if (!this.delete(id)) {
+                    this.record('delete', id);
+                }
+            } else if (op === 'reset') {
+                this.reset();
+            }
+        });
+        this.nextId = nextId;
+        return this.version === version;
+    }
+}
+
+module.exports = { TaskStore };
@@ -0,0 +1,191 @@
+// Every change to the tasks goes through a TaskWriter
+//
+// It validates the request against the store, applies it, and hands the
+// log entry to `persist`. The whole check-and-apply part is synchronous, so
+// nothing else can change the store in between; only `persist` is awaited.
+// Results say what happened ({ task }, { errors }, { notFound: true }) and
+// the routes turn them into HTTP responses. In cluster mode the same writer
+// runs in the primary process only, and workers send it their writes (see
+// cluster-replication.js).
+
+const VALID_PRIORITIES = ['1', '2', '3'];
+const VALID_STATUSES = ['not started', 'in progress', 'completed'];
+const BATCH_OPS = ['create', 'update', 'delete'];
+
+function validateTask(task) {
+    const errors = [];
+
+    if (task.name === null || task.name === undefined || typeof task.name !== 'string') {
+        errors.push('Task name is required and must be a string');
+    } else if (task.name.trim().length === 0) {
+        errors.push('Task name cannot be empty or whitespace only');
+    } else if (task.name.length > 200) {
+        errors.push('Task name cannot exceed 200 characters');
+    }
+
+    if (task.priority && !VALID_PRIORITIES.includes(String(task.priority))) {
+        errors.push('Priority must be 1, 2, or 3');
+    }
+
+    if (task.status && !VALID_STATUSES.includes(task.status)) {
+        errors.push('Status must be "not started", "in progress", or "completed"');
+    }
+
+    return errors;
+}
+
+// A new task's fields, defaulting priority and status when they are missing or
+// empty (validateTask skips those too), so no create path can store '' or null
+function newTaskFields(input) {
+    const { name, priority, status } = input || {};
+    return { name, priority: priority || '1', status: status || 'not started' };
+}
+
+// Only the fields the caller provided
+function pickFields({ name, priority, status }) {
+    const fields = {};
+    if (name !== undefined) fields.name = name;
+    if (priority !== undefined) fields.priority = priority;
+    if (status !== undefined) fields.status = status;
+    return fields;
+}
+
+// Check every operation of a batch against the state the earlier operations
+// would leave, without changing anything. Returns [{ index, errors }] for the
+// operations that would fail.
+function validateBatch(store, operations) {
+    const errors = [];
+    const pending = new Map(); // id -> task as earlier updates in the batch leave it
+    const deleted = new Set();
+
+    operations.forEach((operation, index) => {
+        const { op, id } = operation || {};
+        let opErrors = [];
+        if (!BATCH_OPS.includes(op)) {
+            opErrors.push('op must be "create", "update" or "delete"');
+        } else if (op === 'create') {
+            opErrors = validateTask(newTaskFields(operation));
+        } else if (!Number.isInteger(id)) {
+            opErrors.push('id must be an integer');
+        } else if (deleted.has(id) || !store.has(id)) {
+            opErrors.push('Task not found');
+        } else if (op === 'update') {
+            const updated = { ...(pending.get(id) || store.get(id)), ...pickFields(operation) };
+            opErrors = validateTask(updated);
+            if (opErrors.length === 0) {
+                pending.set(id, updated);
+            }
+        } else {
+            deleted.add(id);
+        }
+        if (opErrors.length > 0) {
+            errors.push({ index, errors: opErrors });
+        }
+    });
+    return errors;
+}
+
+class TaskWriter {
+    // `persist(entry)` records a log entry for a change already applied to the store;
+    // `compact()` writes a full snapshot
+    constructor(store, { persist, compact }) {
+        this.store = store;
+        this.persist = persist;
+        this.compact = compact;
+    }
+
+    async create(input) {
+        const fields = newTaskFields(input);
+        const errors = validateTask(fields);
+        if (errors.length > 0) {
+            return { errors };
+        }
+        const task = this.store.create(fields);
+        await this.persist({ op: 'put', tasks: [task] });
+        return { task };
+    }
+
+    // All-or-nothing: errors are [{ index, errors }] and nothing is created if there are any
+    async createMany(items) {
+        const inputs = items.map(newTaskFields);
+        const errors = [];
+        inputs.forEach((input, index) => {
+            const taskErrors = validateTask(input);
+            if (taskErrors.length > 0) {
+                errors.push({ index, errors: taskErrors });
+            }
+        });
+        if (errors.length > 0) {
+            return { errors };
+        }
+
+        const tasks = inputs.map(input => this.store.create(input));
+        await this.persist({ op: 'put', tasks });
+        return { tasks };
+    }
+
+    async update(id, fields) {
+        const task = this.store.get(id);
+        if (!task) {
+            return { notFound: true };
+        }
+        const updateData = pickFields(fields || {});
+        const errors = validateTask({ ...task, ...updateData });
+        if (errors.length > 0) {
+            return { errors };
+        }
+        this.store.update(id, updateData);
+        await this.persist({ op: 'put', tasks: [task] });
+        return { task };
+    }
+
+    async delete(id) {
+        const task = this.store.delete(id);
+        if (!task) {
+            return { notFound: true };
+        }
+        await this.persist({ op: 'delete', ids: [id] });
+        return { task };
+    }
+
+    // Operations are applied in order, only if every one of them is valid, and logged as one entry
+    async batch(operations) {
+        const errors = validateBatch(this.store, operations);
+        if (errors.length > 0) {
+            return { errors };
+        }
+
+        const written = new Map();
+        const deletedIds = [];
+        const results = operations.map(operation => {
+            const { op, id } = operation;
+            if (op === 'create') {
+                const task = this.store.create(newTaskFields(operation));
+                written.set(task.id, task);
+                return { op, data: { ...task } };
+            }
+            if (op === 'update') {
+                const task = this.store.update(id, pickFields(operation));
+                written.set(id, task);
+                return { op, data: { ...task } };
+            }
+            written.delete(id);
+            deletedIds.push(id);
+            return { op, data: this.store.delete(id) };
+        });
+        await this.persist({ op: 'batch', tasks: Array.from(written.values()), ids: deletedIds });
+        return { results };
+    }
+
+    // Delete everything and start ids from 1 again. The reset is logged before
+    // the snapshot is rewritten, so a crash in between still replays it.
+    async reset() {
+        const count = this.store.size;
+        this.store.reset();
+        await this.persist({ op: 'reset' });
+        await this.compact();
+        return { count };
+    }
+}
+
+module.exports = { TaskWriter, validateTask, validateBatch, VALID_PRIORITIES, VALID_STATUSES };
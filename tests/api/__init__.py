@@ -0,0 +1 @@
+"""API client helpers package"""
@@ -0,0 +1,188 @@
+"""Pooled HTTP client for the TODO REST API"""
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from tests.api.task_columns import TASK_COLUMNS_TYPE, decode_task_columns
+
+
+DEFAULT_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3000")
+# Longest `q` the server accepts for GET /api/tasks
+MAX_QUERY_LENGTH = 200
+
+
+@dataclass
+class RequestTiming:
+    """Timing of a single API request"""
+    method: str
+    path: str
+    status: int
+    elapsed_ms: float
+
+
+class TodoApiClient:
+    """Keep-alive client for the TODO API backed by a pooled requests.Session"""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 5,
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.1,
+        record_timings: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.record_timings = record_timings
+        self.timings: List[RequestTiming] = []
+
+        # Connection errors are retried for every method (the request never
+        # reached the server); status retries stay limited to idempotent calls.
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, record: bool = True, **kwargs) -> requests.Response:
+        """Send a request to the API and record how long it took (unless `record` is false)"""
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        if self.record_timings and record:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.timings.append(RequestTiming(method, path, response.status_code, elapsed_ms))
+        return response
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    # Task helpers
+
+    def get_tasks(self, etag: Optional[str] = None, columns: bool = False, **params) -> requests.Response:
+        """GET /api/tasks, optionally with limit/after/q/status/priority/sort/fields query parameters.
+        With `etag` the request is conditional and answers 304 if the list has not changed.
+        With `columns` the columnar format is asked for instead of JSON; read it with `task_list`."""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if columns:
+            headers["Accept"] = f"{TASK_COLUMNS_TYPE}, application/json;q=0.9"
+        return self.get("/api/tasks", params=params or None, headers=headers or None)
+
+    @staticmethod
+    def task_list(response: requests.Response) -> dict:
+        """The body of a GET /api/tasks response, in whichever format the server sent"""
+        if response.headers.get("Content-Type", "").startswith(TASK_COLUMNS_TYPE):
+            return decode_task_columns(response.content)
+        return response.json()
+
+    def get_changes(self, since: str) -> requests.Response:
+        """GET /api/tasks/changes?since=<version>"""
+        return self.get("/api/tasks/changes", params={"since": since})
+
+    def get_task(self, task_id: int) -> requests.Response:
+        """GET /api/tasks/:id"""
+        return self.get(f"/api/tasks/{task_id}")
+
+    def create_task(self, name: str, priority: str = "1", status: str = "not started") -> requests.Response:
+        """POST /api/tasks"""
+        return self.post("/api/tasks", json={"name": name, "priority": priority, "status": status})
+
+    def create_tasks(self, tasks: List[dict]) -> requests.Response:
+        """POST /api/tasks/bulk"""
+        return self.post("/api/tasks/bulk", json={"tasks": tasks})
+
+    def batch(self, operations: List[dict]) -> requests.Response:
+        """POST /api/tasks/batch with {"op": "create" | "update" | "delete", ...} operations"""
+        return self.post("/api/tasks/batch", json={"operations": operations})
+
+    def update_task(self, task_id: int, **fields) -> requests.Response:
+        """PUT /api/tasks/:id with only the given fields"""
+        return self.put(f"/api/tasks/{task_id}", json=fields)
+
+    def delete_task(self, task_id: int) -> requests.Response:
+        """DELETE /api/tasks/:id"""
+        return self.delete(f"/api/tasks/{task_id}")
+
+    def get_metrics(self) -> requests.Response:
+        """GET /metrics (Prometheus text); scrapes are not test traffic, so they are never recorded"""
+        return self.get("/metrics", record=False)
+
+    def reset(self) -> requests.Response:
+        """POST /api/test/reset (only available when the server enables test routes)"""
+        return self.post("/api/test/reset")
+
+    def iter_tasks(self, page_size: int = 500, columns: bool = False, **params) -> Iterator[dict]:
+        """Yield tasks page by page using the `after` cursor; stops quietly if a request fails"""
+        after = 0
+        while True:
+            response = self.get_tasks(columns=columns, limit=page_size, after=after, **params)
+            if response.status_code != 200:
+                return
+            body = self.task_list(response)
+            yield from body.get("data", [])
+            after = body.get("nextCursor")
+            if not after:
+                return
+
+    def list_tasks(self, **params) -> list:
+        """Return the task list, or an empty list if the request failed"""
+        return list(self.iter_tasks(**params))
+
+    def search_tasks(self, q: str, **params) -> list:
+        """Return every task whose name has words starting with each word of `q`"""
+        return self.list_tasks(q=q, **params)
+
+    def find_task(self, name: str) -> Optional[dict]:
+        """Return the first task with the given name, if any"""
+        # The name's words narrow the list down on the server; a cut-off last word still matches as a prefix
+        params = {"q": name[:MAX_QUERY_LENGTH]} if re.search(r"[^\W_]", name) else {}
+        return next((task for task in self.iter_tasks(columns=True, **params) if task["name"] == name), None)
+
+    # Timing helpers
+
+    def reset_timings(self):
+        """Forget all recorded request timings"""
+        self.timings.clear()
+
+    def timing_report(self) -> str:
+        """Summarize recorded timings per method and path"""
+        groups = {}
+        for timing in self.timings:
+            route = re.sub(r"/\d+", "/:id", timing.path.split("?")[0])
+            groups.setdefault(f"{timing.method} {route}", []).append(timing.elapsed_ms)
+
+        lines = [f"{'request':<40} {'count':>6} {'avg ms':>9} {'max ms':>9}"]
+        for key, values in sorted(groups.items()):
+            lines.append(f"{key:<40} {len(values):>6} {sum(values) / len(values):>9.2f} {max(values):>9.2f}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
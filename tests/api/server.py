@@ -0,0 +1,129 @@
+"""Helpers for starting and probing the Express server"""
+import os
+import signal
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def find_free_port() -> int:
+    """Ask the OS for an unused TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def is_port_open(host: str, port: int) -> bool:
+    """Check whether something is already listening on host:port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex((host, port)) == 0
+
+
+def start_server(
+    port: int,
+    storage_file: Optional[Path] = None,
+    log_file: Optional[Path] = None,
+    env: Optional[dict] = None,
+    script: str = "server.js",
+) -> subprocess.Popen:
+    """Spawn `node server.js` (or `script`, e.g. cluster.js) on the given port with test routes enabled"""
+    server_env = {**os.environ, "PORT": str(port), "ENABLE_TEST_ROUTES": "true", **(env or {})}
+    if storage_file is not None:
+        server_env["TASKS_FILE"] = str(storage_file)
+
+    # Log to a file rather than a pipe so a chatty server can never block on a full buffer
+    output = open(log_file, "wb") if log_file is not None else subprocess.DEVNULL
+    try:
+        return subprocess.Popen(
+            ["node", script],
+            cwd=PROJECT_ROOT,
+            env=server_env,
+            stdout=output,
+            stderr=subprocess.STDOUT,
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
+        )
+    finally:
+        if log_file is not None:
+            output.close()
+
+
+def stop_server(server: subprocess.Popen, timeout: float = 5):
+    """Stop a server started with start_server()"""
+    if server.poll() is not None:
+        return
+    if os.name == 'nt':
+        # Windows
+        server.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        # Unix
+        server.terminate()
+    try:
+        server.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait(timeout=timeout)
+
+
+def wait_for_server_ready(
+    base_url: str,
+    process: Optional[subprocess.Popen] = None,
+    timeout: float = 15.0,
+    initial_delay: float = 0.05,
+    max_delay: float = 0.5,
+):
+    """Poll GET /api/health with exponential backoff until the server reports ready"""
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    last_error = "no response"
+
+    while True:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before becoming ready")
+
+        try:
+            response = requests.get(f"{base_url}/api/health", timeout=1)
+            if response.status_code == 200 and response.json().get("status") == "ready":
+                return
+            last_error = f"HTTP {response.status_code}"
+        except requests.RequestException as error:
+            last_error = str(error)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Server at {base_url} not ready after {timeout}s ({last_error})")
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+class IsolatedServer:
+    """A private server.js with its own storage that a test may crash and restart"""
+
+    def __init__(self, storage_dir: Path, env: Optional[dict] = None, script: str = "server.js"):
+        self.storage_file = storage_dir / "tasks.json"
+        self.log_file = storage_dir / "tasks.json.log"
+        self.output_file = storage_dir / "server.log"
+        self.env = env
+        self.script = script
+        self.port = find_free_port()
+        self.base_url = f"http://localhost:{self.port}"
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self):
+        self.process = start_server(self.port, storage_file=self.storage_file, log_file=self.output_file, env=self.env, script=self.script)
+        wait_for_server_ready(self.base_url, process=self.process)
+
+    def crash(self):
+        """SIGKILL: no shutdown hook, no final compaction"""
+        self.process.kill()
+        self.process.wait(timeout=5)
+
+    def stop(self):
+        stop_server(self.process)
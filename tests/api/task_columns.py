@@ -0,0 +1,112 @@
+"""Decoder for the columnar GET /api/tasks format (layout in task-columns.js)"""
+from itertools import accumulate
+from typing import List, Optional, Tuple, Union
+
+
+TASK_COLUMNS_TYPE = "application/vnd.todo.task-columns"
+
+MAGIC = b"TCOL"
+FORMAT_VERSION = 1
+NAME, STATUS, PRIORITY = 1, 2, 4
+CURSOR_ID, CURSOR_STRING = 1, 2
+NAMES_JOINED = 0
+# Id difference for each one-byte zigzag varint
+SMALL_DELTAS = [-((value + 1) >> 1) if value & 1 else value >> 1 for value in range(0x80)]
+
+
+class _Reader:
+    """Reads varints, strings and raw bytes from a position that moves forward"""
+
+    def __init__(self, data: bytes, position: int = 0):
+        self.data = data
+        self.position = position
+
+    def byte(self) -> int:
+        self.position += 1
+        return self.data[self.position - 1]
+
+    def varint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    def raw(self, length: int) -> bytes:
+        self.position += length
+        return self.data[self.position - length:self.position]
+
+    def string(self) -> str:
+        return self.raw(self.varint()).decode("utf-8")
+
+    def zigzag(self) -> int:
+        value = self.varint()
+        return -((value + 1) >> 1) if value & 1 else value >> 1
+
+    def zigzag_deltas(self, count: int) -> List[int]:
+        """`count` ids sent as zigzag varint differences from the previous one"""
+        if count == 0:
+            return []
+        first = self.zigzag()
+        rest = self.data[self.position:self.position + count - 1]
+        if len(rest) == count - 1 and (not rest or max(rest) < 0x80):
+            # Every later difference fits in one byte, as for ids in creation order
+            self.position += count - 1
+            return list(accumulate(map(SMALL_DELTAS.__getitem__, rest), initial=first))
+        ids = [first]
+        for _ in range(count - 1):
+            ids.append(ids[-1] + self.zigzag())
+        return ids
+
+    def dictionary(self, count: int) -> List[str]:
+        """A dictionary column, expanded to one value per task"""
+        values = [self.string() for _ in range(self.varint())]
+        return [values[code] for code in self.raw(count)]
+
+    def names(self, count: int) -> List[str]:
+        if self.byte() == NAMES_JOINED:
+            text = self.string()
+            return text.split("\x00") if count else []
+        # Lengths are in UTF-16 code units, as JavaScript counts them
+        lengths = [self.varint() for _ in range(count)]
+        units = self.string().encode("utf-16-le", "surrogatepass")
+        names, start = [], 0
+        for length in lengths:
+            names.append(units[start * 2:(start + length) * 2].decode("utf-16-le", "surrogatepass"))
+            start += length
+        return names
+
+
+def decode_task_columns(data: bytes) -> dict:
+    """Decode a columnar response into the same {success, data, count, nextCursor, version} as the JSON one"""
+    if data[:4] != MAGIC or data[4] != FORMAT_VERSION:
+        raise ValueError("Not a task columns response")
+    columns = data[5]
+    reader = _Reader(data, 6)
+    count = reader.varint()
+    version = reader.string()
+    cursor_kind = reader.byte()
+    next_cursor: Optional[Union[int, str]] = (
+        reader.varint() if cursor_kind == CURSOR_ID else reader.string() if cursor_kind == CURSOR_STRING else None
+    )
+
+    fields: List[Tuple[str, List]] = [("id", reader.zigzag_deltas(count))]
+    if columns & STATUS:
+        fields.append(("status", reader.dictionary(count)))
+    if columns & PRIORITY:
+        fields.append(("priority", reader.dictionary(count)))
+    if columns & NAME:
+        fields.append(("name", reader.names(count)))
+    if len(fields) == 4:
+        _, ids = fields[0]
+        statuses, priorities, names = (values for _, values in fields[1:])
+        tasks = [
+            {"id": task_id, "name": name, "status": status, "priority": priority}
+            for task_id, name, status, priority in zip(ids, names, statuses, priorities)
+        ]
+    else:
+        keys = [key for key, _ in fields]
+        tasks = [dict(zip(keys, row)) for row in zip(*(values for _, values in fields))]
+    return {"success": True, "data": tasks, "count": count, "nextCursor": next_cursor, "version": version}
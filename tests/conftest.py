@@ -4,10 +4,16 @@ import pytest
 import allure
 from playwright.sync_api import Page, Browser, sync_playwright
 from tests.pages.todo_page import TodoPage
-import subprocess
-import time
+from tests.pages.page_pool import PagePool
+from tests.api.client import DEFAULT_BASE_URL, TodoApiClient
+from tests.perf.server_metrics import diff_metrics, parse_metrics, timing_breakdown
+from tests.api.server import IsolatedServer, find_free_port, is_port_open, start_server, stop_server, wait_for_server_ready
+from typing import Callable, List, Optional, Union
+from urllib.parse import urlparse
 import os
-import signal
+import warnings
+
+import requests
 
 
 @pytest.fixture(scope="session")
@@ -21,9 +27,28 @@ def browser():
             browser.close()
 
 
+REUSE_CONTEXT = os.getenv("REUSE_CONTEXT", "false").lower() == "true"
+
+
+@pytest.fixture(scope="session")
+def page_pool(browser: Browser, server_process: str):
+    """Pool of warmed browser contexts (used when REUSE_CONTEXT=true)"""
+    pool = PagePool(browser, server_process, size=int(os.getenv("PAGE_POOL_SIZE", "1")))
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def page(browser: Browser):
-    """Create a new page for each test"""
+def page(request, browser: Browser):
+    """Create a new page for each test, or borrow a warmed one when REUSE_CONTEXT=true"""
+    if REUSE_CONTEXT:
+        pool = request.getfixturevalue("page_pool")
+        with allure.step("Borrow warmed page from pool"):
+            page = pool.acquire()
+        yield page
+        pool.release(page)
+        return
+
     with allure.step("Create new browser context and page"):
         context = browser.new_context()
         page = context.new_page()
@@ -33,101 +58,258 @@ def page(browser: Browser):
 
 
 @pytest.fixture(scope="function")
-def todo_page(page: Page):
+def todo_page(page: Page, server_process: str):
     """Create TodoPage object"""
     with allure.step("Create TodoPage object"):
-        return TodoPage(page)
+        return TodoPage(page, base_url=server_process)
 
 
 @pytest.fixture(scope="session")
-def server_process():
-    """Start the Express server for tests"""
-    # Check if server is already running
-    import socket
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = sock.connect_ex(('localhost', 3000))
-    sock.close()
-    
-    if result == 0:
-        # Server already running
-        print("\n✅ Server already running on port 3000")
-        yield None
-        return
-    
+def server_process(tmp_path_factory):
+    """Start the Express server for tests and return its base URL
+
+    Under pytest-xdist every worker gets its own server on an ephemeral port
+    with its own storage file, so workers never share state.
+    """
+    worker_id = os.getenv("PYTEST_XDIST_WORKER")
+    server_dir = tmp_path_factory.mktemp(f"server-{worker_id or 'main'}")
+    log_file = server_dir / "server.log"
+
+    if worker_id is None:
+        # Serial run: reuse a server that is already running on the default URL
+        parsed = urlparse(DEFAULT_BASE_URL)
+        port = parsed.port or 80
+        base_url = DEFAULT_BASE_URL.rstrip("/")
+        storage_file = None
+
+        if is_port_open(parsed.hostname, port):
+            print(f"\n✅ Server already running on port {port}")
+            yield base_url
+            return
+    else:
+        port = find_free_port()
+        base_url = f"http://localhost:{port}"
+        storage_file = server_dir / "tasks.json"
+
     # Start the server
-    print("\n🚀 Starting server on port 3000...")
-    server = subprocess.Popen(
-        ["node", "server.js"],
-        cwd=os.path.dirname(os.path.dirname(__file__)),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
-    )
-    
-    # Wait for server to start (increase to 5 seconds)
-    time.sleep(5)
-
-    # Verify server is running
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = sock.connect_ex(('localhost', 3000))
-    sock.close()
-
-    if result != 0:
-        # Print server stdout/stderr for debugging
-        try:
-            out, err = server.communicate(timeout=2)
-            print("\n--- server.js stdout ---\n", out.decode(errors="ignore"))
-            print("\n--- server.js stderr ---\n", err.decode(errors="ignore"))
-        except Exception as e:
-            print(f"Could not read server output: {e}")
-        raise Exception("Failed to start server")
+    print(f"\n🚀 Starting server on port {port}...")
+    server = start_server(port, storage_file=storage_file, log_file=log_file)
+
+    # Wait until the health endpoint reports that stored tasks are loaded
+    try:
+        wait_for_server_ready(base_url, process=server)
+    except (RuntimeError, TimeoutError) as error:
+        stop_server(server)
+        # Print server output for debugging
+        print("\n--- server.js output ---\n", log_file.read_text(errors="ignore"))
+        raise Exception(f"Failed to start server: {error}")
 
     print("✅ Server started successfully")
 
-    yield server
+    yield base_url
 
     # Cleanup: Stop the server
     print("\n🛑 Stopping server...")
-    if os.name == 'nt':
-        # Windows
-        server.send_signal(signal.CTRL_BREAK_EVENT)
-    else:
-        # Unix
-        server.terminate()
-    server.wait(timeout=5)
+    stop_server(server)
     print("✅ Server stopped")
 
 
+@pytest.fixture(scope="session")
+def api_client(server_process: str):
+    """Shared keep-alive API client for the test session"""
+    client = TodoApiClient(server_process)
+    yield client
+    allure.attach(
+        client.timing_report(),
+        name="API request timings",
+        attachment_type=allure.attachment_type.TEXT
+    )
+    client.close()
+
+
+@pytest.fixture
+def isolated_server(tmp_path):
+    """Factory for private servers with their own storage, for tests that crash, restart or overload them
+
+    Keyword arguments become server environment variables, e.g.
+    `isolated_server(TASKS_COMPACT_BYTES=2048)`; `script="cluster.js"` starts
+    the server in cluster mode.
+    """
+    servers: List[IsolatedServer] = []
+
+    def start(script: str = "server.js", **env) -> IsolatedServer:
+        server_dir = tmp_path / f"server-{len(servers)}"
+        server_dir.mkdir()
+        server = IsolatedServer(server_dir, env={key: str(value) for key, value in env.items()}, script=script)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        stop_server(server.process)
+
+
+@pytest.fixture
+def todo_pages(browser: Browser, server_process: str):
+    """Factory for several loaded TodoPages, each in its own browser context, like separate tabs or users"""
+    contexts = []
+
+    def open_pages(count: int) -> List[TodoPage]:
+        pages = []
+        with allure.step(f"Open {count} TODO pages"):
+            for _ in range(count):
+                context = browser.new_context()
+                contexts.append(context)
+                todo_page = TodoPage(context.new_page(), base_url=server_process)
+                todo_page.navigate()
+                pages.append(todo_page)
+        return pages
+
+    yield open_pages
+    for context in contexts:
+        context.close()
+
+
+class NetworkConditions:
+    """Take the page's browser context offline or slow its requests down"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.cdp = None
+
+    def offline(self):
+        with allure.step("Go offline"):
+            self.page.context.set_offline(True)
+
+    def online(self):
+        with allure.step("Go back online"):
+            self.page.context.set_offline(False)
+
+    def throttle(self, latency_ms: float):
+        """Add latency to every request (Chromium only)"""
+        with allure.step(f"Throttle network to {latency_ms} ms latency"):
+            self.cdp = self.cdp or self.page.context.new_cdp_session(self.page)
+            self.cdp.send("Network.enable")
+            self.cdp.send("Network.emulateNetworkConditions", {
+                "offline": False,
+                "latency": latency_ms,
+                "downloadThroughput": -1,
+                "uploadThroughput": -1,
+            })
+
+    def restore(self):
+        self.page.context.set_offline(False)
+        if self.cdp:
+            self.cdp.send("Network.emulateNetworkConditions", {
+                "offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1,
+            })
+            self.cdp.detach()
+            self.cdp = None
+
+
+@pytest.fixture
+def network(page: Page):
+    """Control the test page's network: offline(), online(), throttle(latency_ms)"""
+    conditions = NetworkConditions(page)
+    yield conditions
+    conditions.restore()
+
+
+SEED_CHUNK_SIZE = 1000
+
+
+@pytest.fixture
+def seed_tasks(api_client: TodoApiClient):
+    """Create tasks through the bulk API, without driving the browser
+
+    Accepts a list of task dicts, or a count plus an optional factory that
+    maps an index to a task dict. Returns the created tasks.
+    """
+    def seed(tasks: Union[int, List[dict]], factory: Optional[Callable[[int], dict]] = None) -> List[dict]:
+        if isinstance(tasks, int):
+            factory = factory or (lambda i: {"name": f"Seeded Task {i}"})
+            tasks = [factory(i) for i in range(1, tasks + 1)]
+
+        created = []
+        with allure.step(f"Seed {len(tasks)} tasks via API"):
+            for start in range(0, len(tasks), SEED_CHUNK_SIZE):
+                chunk = tasks[start:start + SEED_CHUNK_SIZE]
+                response = api_client.create_tasks(chunk)
+                if response.status_code == 404:
+                    # Server without the bulk route: fall back to one request per task
+                    for task in chunk:
+                        single = api_client.create_task(**task)
+                        assert single.status_code == 201, single.text
+                        created.append(single.json()["data"])
+                    continue
+                assert response.status_code == 201, response.text
+                created.extend(response.json()["data"])
+        return created
+
+    return seed
+
+
+def _reset_tasks(api_client: TodoApiClient):
+    """Remove every task, using the bulk reset route when the server exposes it"""
+    try:
+        response = api_client.reset()
+    except requests.ConnectionError as error:
+        warnings.warn(f"Tasks not reset, the server is unreachable: {error}")
+        return
+    if response.status_code == 200:
+        return
+    if response.status_code != 404:
+        pytest.fail(f"Task reset failed: HTTP {response.status_code} {response.text}")
+
+    # Server started without test routes: fall back to one delete per task
+    for task in api_client.iter_tasks(fields="id"):
+        response = api_client.delete_task(task["id"])
+        if response.status_code not in (200, 404):
+            pytest.fail(f"Task reset failed deleting task {task['id']}: HTTP {response.status_code} {response.text}")
+
+
 @pytest.fixture(scope="function", autouse=True)
-def cleanup_tasks(server_process):
+def cleanup_tasks(request):
     """Clean up tasks before and after each test"""
-    import requests
-    import json
-    import time
-    
-    # Clean up before test
-    try:
-        response = requests.get("http://localhost:3000/api/tasks", timeout=5)
-        if response.status_code == 200:
-            tasks = response.json().get("data", [])
-            for task in tasks:
-                requests.delete(f"http://localhost:3000/api/tasks/{task['id']}", timeout=5)
-        time.sleep(0.5)  # Wait for cleanup to complete
-    except:
-        pass
-    
+    if request.node.get_closest_marker("offline"):
+        # Offline tests never touch the server, so don't start one for them
+        yield
+        return
+    api_client = request.getfixturevalue("api_client")
+    _reset_tasks(api_client)
     yield
-    
-    # Clean up after test
+    _reset_tasks(api_client)
+
+
+SERVER_METRICS = os.getenv("SERVER_METRICS", "true").lower() == "true"
+
+
+def _scrape_metrics(api_client: TodoApiClient) -> Optional[dict]:
+    """Parsed /metrics samples, or None if the server does not expose them"""
     try:
-        response = requests.get("http://localhost:3000/api/tasks", timeout=5)
-        if response.status_code == 200:
-            tasks = response.json().get("data", [])
-            for task in tasks:
-                requests.delete(f"http://localhost:3000/api/tasks/{task['id']}", timeout=5)
-        time.sleep(0.5)  # Wait for cleanup to complete
-    except:
-        pass
+        response = api_client.get_metrics()
+    except Exception:
+        return None
+    return parse_metrics(response.text) if response.status_code == 200 else None
+
+
+@pytest.fixture(scope="function", autouse=True)
+def server_timings(request, cleanup_tasks):
+    """Attach the server-side timings of each test's requests (scraped from /metrics) to the report"""
+    if not SERVER_METRICS or request.node.get_closest_marker("offline"):
+        yield
+        return
+    api_client = request.getfixturevalue("api_client")
+    before = _scrape_metrics(api_client)
+    yield
+    after = _scrape_metrics(api_client) if before is not None else None
+    if after is not None:
+        allure.attach(
+            timing_breakdown(diff_metrics(before, after)),
+            name="Server timings",
+            attachment_type=allure.attachment_type.TEXT
+        )
 
 
 @pytest.fixture
@@ -142,6 +324,8 @@ def alert_messages(page: Page):
     page.on("dialog", handle_dialog)
     
     yield messages
+    
+    page.remove_listener("dialog", handle_dialog)
 
 
 @pytest.fixture
@@ -155,3 +339,5 @@ def console_messages(page: Page):
     page.on("console", handle_console)
     
     yield messages
+    
+    page.remove_listener("console", handle_console)
@@ -0,0 +1,90 @@
+"""Pool of warmed browser contexts for reuse between UI tests"""
+from typing import List
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+
+READY_SELECTOR = "body[data-app-ready='true'][data-pending='0']"
+SETTLE_TIMEOUT_MS = 5000
+# Drops the app's queued writes and backoff timer, then its storage
+RESET_APP = """() => {
+    window.app.discardMutations();
+    localStorage.clear();
+    sessionStorage.clear();
+}"""
+# For a page that has to be loaded again: blocks further writes from the outgoing
+# document, so a retry timer that fires before the reload cannot store its queue again
+CLEAR_STORAGE = """() => {
+    Storage.prototype.setItem = () => {};
+    localStorage.clear();
+    sessionStorage.clear();
+}"""
+
+
+class PagePool:
+    """Keeps browser contexts with the TODO app already loaded
+
+    Released pages have the app's queued writes, retry timer and storage
+    dropped in place, and are returned once nothing is in flight. Borrowing
+    one then only needs an in-place `app.refresh()` (see TodoPage.navigate),
+    which reloads the server's tasks, instead of a new context and a full
+    page load. Pages that left the app or broke it are loaded again.
+    """
+
+    def __init__(self, browser: Browser, base_url: str, size: int = 1):
+        self.browser = browser
+        self.base_url = base_url
+        self.size = size
+        self._idle: List[Page] = []
+
+    def _create_page(self) -> Page:
+        """Open a new context and load the app in it"""
+        context = self.browser.new_context()
+        page = context.new_page()
+        self._load(page)
+        return page
+
+    def _load(self, page: Page):
+        """Load the app and wait until it has settled"""
+        page.goto(self.base_url)
+        page.locator(READY_SELECTOR).wait_for(state="attached")
+
+    def _app_loaded(self, page: Page) -> bool:
+        return page.url.startswith(self.base_url) and page.evaluate("() => Boolean(window.app && window.app.ready)")
+
+    def acquire(self) -> Page:
+        """Borrow a warmed page, creating one if the pool is empty"""
+        if self._idle:
+            return self._idle.pop()
+        return self._create_page()
+
+    def release(self, page: Page):
+        """Reset a borrowed page's app state and storage, and return the page to the pool"""
+        context: BrowserContext = page.context
+        if page.is_closed() or len(self._idle) >= self.size:
+            context.close()
+            return
+
+        try:
+            context.set_offline(False)
+            context.clear_cookies()
+            if self._app_loaded(page):
+                page.evaluate(RESET_APP)
+                page.locator(READY_SELECTOR).wait_for(state="attached", timeout=SETTLE_TIMEOUT_MS)
+            else:
+                if not page.url.startswith(self.base_url):
+                    page.goto(self.base_url)
+                page.evaluate(CLEAR_STORAGE)
+                self._load(page)
+        except Exception:
+            # A page in an unknown state is not worth reusing
+            context.close()
+            return
+
+        self._idle.append(page)
+
+    def close(self):
+        """Close every pooled context"""
+        for page in self._idle:
+            page.context.close()
+        self._idle.clear()
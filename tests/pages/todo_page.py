@@ -3,6 +3,20 @@ from playwright.sync_api import Page, expect
 from typing import Literal
 
 
+# Long lists are windowed: rows far from the viewport are not in the DOM until scrolled to.
+# Mount the named task's row (no-op for short lists or unknown names).
+MOUNT_TASK_BY_NAME = """(name) => {
+    const app = window.app;
+    if (!app || app.todos.length <= app.virtualizeAbove) {
+        return;
+    }
+    const todo = app.todos.find(todo => todo.name === name);
+    if (todo) {
+        app.scrollToTask(todo.id);
+    }
+}"""
+
+
 class TodoPage:
     """Page object for the TODO List application"""
     
@@ -19,26 +33,51 @@ class TodoPage:
         self.empty_message = page.locator(".empty-state")
         
     def navigate(self):
-        """Navigate to the TODO app"""
-        self.page.goto(self.base_url)
-        self.page.wait_for_load_state("networkidle")
+        """Navigate to the TODO app (refreshes in place if a pooled page already has it loaded)"""
+        if self.is_app_loaded():
+            self.page.evaluate("() => window.app.refresh()")
+        else:
+            self.page.goto(self.base_url)
+        self.wait_for_settled()
+    
+    def is_app_loaded(self) -> bool:
+        """Check whether this page already shows an initialized TodoApp"""
+        if not self.page.url.startswith(self.base_url):
+            return False
+        return self.page.evaluate("() => Boolean(window.app && window.app.ready)")
+    
+    def wait_for_settled(self, timeout: float = 5000):
+        """Wait until TodoApp has initialized and has no API request in flight"""
+        self.page.locator("body[data-app-ready='true'][data-pending='0']").wait_for(state="attached", timeout=timeout)
         
     def get_priority_radio(self, priority: str):
         """Get priority radio button by value"""
         return self.page.locator(f'input[name="priority"][value="{priority}"]')
     
-    def add_task(self, name: str, priority: str = "1", status: str = "not started"):
-        """Add a new task"""
+    def add_task(self, name: str, priority: str = "1", status: str = "not started", settle: bool = True):
+        """Add a new task (settle=False returns once it is shown, before the server has it)"""
         self.task_name_input.fill(name)
         self.get_priority_radio(priority).check()
         self.status_select.select_option(status)
         self.add_button.click()
+        if settle:
+            self.wait_for_settled()
         expect(self.get_task_by_name(name)).to_be_visible(timeout=3000)
         
     def get_task_by_name(self, name: str):
-        """Get task element by name"""
+        """Get task element by name, scrolling it into the mounted window of a long list"""
+        self.page.evaluate(MOUNT_TASK_BY_NAME, name)
         return self.page.locator(f'.todo-item:has-text("{name}")')
     
+    def scroll_to_task(self, task_id: int) -> bool:
+        """Scroll a task into view by id, mounting its row if the list is windowed"""
+        return self.page.evaluate("(id) => window.app.scrollToTask(id)", task_id)
+    
+    def find_task_by_id(self, task_id: int):
+        """Get task element by id, wherever it is in the list"""
+        self.scroll_to_task(task_id)
+        return self.page.locator(f'.todo-item[data-id="{task_id}"]')
+    
     def get_task_priority(self, task_name: str) -> str:
         """Get task priority text"""
         task = self.get_task_by_name(task_name)
@@ -89,13 +128,15 @@ class TodoPage:
         status_select = self.page.locator(f'#edit-status-{task_id}')
         status_select.select_option(new_status)
         
-    def save_task_changes(self, task_name: str):
+    def save_task_changes(self, task_name: str, settle: bool = True):
         """Click Save Changes button for a task"""
         task = self.get_task_by_name(task_name)
         save_button = task.locator('button:has-text("Save Changes")')
         save_button.click()
+        if settle:
+            self.wait_for_settled()
         
-    def delete_task(self, task_name: str, confirm: bool = True):
+    def delete_task(self, task_name: str, confirm: bool = True, settle: bool = True):
         """Delete a task"""
         task = self.get_task_by_name(task_name)
         delete_button = task.locator('button:has-text("Delete")')
@@ -107,11 +148,22 @@ class TodoPage:
             self.page.once("dialog", lambda dialog: dialog.dismiss())
         
         delete_button.click()
+        if settle:
+            self.wait_for_settled()
         if confirm:
             expect(self.get_task_by_name(task_name)).to_have_count(0, timeout=3000)
         
     def get_task_count(self) -> int:
-        """Get the number of tasks in the list"""
+        """Get the number of tasks in the list, including rows a long list has not mounted"""
+        count = self.page.evaluate("() => window.app ? window.app.getTodoCount() : null")
+        return self.todo_items.count() if count is None else count
+    
+    def get_pending_count(self) -> int:
+        """Get the number of changes shown in the list but not yet saved on the server"""
+        return self.page.evaluate("() => window.app.mutations.length")
+    
+    def get_mounted_task_count(self) -> int:
+        """Get the number of task rows currently in the DOM"""
         return self.todo_items.count()
     
     def is_empty_state_visible(self) -> bool:
@@ -122,6 +174,14 @@ class TodoPage:
         """Get empty state message text"""
         return self.empty_message.text_content().strip()
     
+    def wait_for_task(self, task_name: str, timeout: float = 5000):
+        """Wait until a task appears, e.g. pushed from another tab"""
+        self.get_task_by_name(task_name).first.wait_for(state="visible", timeout=timeout)
+    
+    def wait_for_task_removed(self, task_name: str, timeout: float = 5000):
+        """Wait until no task with this name is shown"""
+        expect(self.get_task_by_name(task_name)).to_have_count(0, timeout=timeout)
+    
     def task_exists(self, task_name: str) -> bool:
         """Check if a task exists in the list"""
         return self.get_task_by_name(task_name).count() > 0
@@ -129,6 +189,7 @@ class TodoPage:
     def press_enter_on_input(self):
         """Press Enter key on the task name input"""
         self.task_name_input.press("Enter")
+        self.wait_for_settled()
         
     def get_alert_text(self) -> str:
         """Get alert dialog text (needs to be set up with dialog handler)"""
@@ -149,4 +210,4 @@ class TodoPage:
     
     def wait_for_api_detection(self):
         """Wait for API detection to complete"""
-        self.page.wait_for_timeout(1000)  # Give time for API detection
+        self.wait_for_settled()
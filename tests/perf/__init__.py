@@ -0,0 +1 @@
+"""Performance tooling package (load generation, k6 result analysis)"""
@@ -0,0 +1,221 @@
+"""Performance baseline store and regression comparator for k6 summaries
+
+The baseline (`k6/baseline.json`, committed) keeps the last few recorded runs
+of every k6 scenario as flat metric maps, e.g.
+
+    "create-task": {"runs": [{"recorded": "...", "metrics": {
+        "http_req_duration.p95": 12.3,
+        "endpoint[POST /api/tasks].p95": 12.3,
+        "throughput.mean_rps": 48.7,
+        "http_req_failed.rate": 0.0}}]}
+
+A new run regresses when a metric is worse than the recorded median by more
+than the relative tolerance, more than `stddev_k` standard deviations of the
+recorded runs, and more than an absolute noise floor, all at once.
+
+Usage:
+    python -m tests.perf.baseline update k6-results     # record the current summaries
+    python -m tests.perf.baseline compare k6-results    # exit 1 on regression
+
+A scenario with no recorded runs is not compared. That is reported as a
+warning, or as an error with `--require-baseline` / PERF_REQUIRE_BASELINE=true.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.perf.k6_analyzer import SUMMARY_SUFFIX
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_BASELINE_FILE = Path(os.getenv("PERF_BASELINE_FILE", PROJECT_ROOT / "k6" / "baseline.json"))
+COMPARED_PERCENTILES = ("p50", "p95", "p99")
+REQUIRE_BASELINE = os.getenv("PERF_REQUIRE_BASELINE", "false").lower() == "true"
+
+
+@dataclass
+class Thresholds:
+    """How far a metric may move before it counts as a regression"""
+    tolerance: float = 0.2  # relative to the baseline median
+    stddev_k: float = 3.0  # standard deviations of the recorded runs
+    latency_floor_ms: float = 5.0  # ignore latency changes smaller than this
+    error_rate_floor: float = 0.01  # ignore failure rate changes smaller than this
+
+    @classmethod
+    def from_env(cls) -> "Thresholds":
+        return cls(
+            tolerance=float(os.getenv("PERF_REGRESSION_TOLERANCE", cls.tolerance)),
+            stddev_k=float(os.getenv("PERF_REGRESSION_STDDEV_K", cls.stddev_k)),
+            latency_floor_ms=float(os.getenv("PERF_LATENCY_FLOOR_MS", cls.latency_floor_ms)),
+            error_rate_floor=float(os.getenv("PERF_ERROR_RATE_FLOOR", cls.error_rate_floor)),
+        )
+
+
+@dataclass
+class Comparison:
+    """One metric of the current run checked against its baseline"""
+    metric: str
+    current: float
+    baseline: float
+    limit: float
+    regressed: bool
+
+    def describe(self) -> str:
+        change = (self.current - self.baseline) / self.baseline * 100 if self.baseline else 0.0
+        marker = "REGRESSION" if self.regressed else "ok"
+        return f"{self.metric:<45} {self.baseline:>10.2f} {self.current:>10.2f} {change:>+8.1f}% {self.limit:>10.2f}  {marker}"
+
+
+def scenario_name(summary: dict) -> str:
+    """"k6-results-create-task.json" -> "create-task\""""
+    return summary["source"].replace("k6-results-", "").rsplit(".json", 1)[0]
+
+
+def extract_metrics(summary: dict) -> Dict[str, float]:
+    """Flatten an analyzer summary into the metrics the gate compares"""
+    metrics = {}
+    duration = summary["metrics"].get("http_req_duration")
+    if duration:
+        for key in COMPARED_PERCENTILES:
+            metrics[f"http_req_duration.{key}"] = duration[key]
+    for label, stats in summary.get("tags", {}).get("http_req_duration", {}).items():
+        if label.startswith("endpoint="):
+            for key in COMPARED_PERCENTILES:
+                metrics[f"endpoint[{label[len('endpoint='):]}].{key}"] = stats[key]
+    failed = summary["metrics"].get("http_req_failed")
+    if failed:
+        metrics["http_req_failed.rate"] = failed["rate"]
+    if summary.get("throughput", {}).get("windows"):
+        metrics["throughput.mean_rps"] = summary["throughput"]["mean_rps"]
+    return metrics
+
+
+def compare_metric(metric: str, current: float, history: List[float], thresholds: Thresholds) -> Comparison:
+    center = statistics.median(history)
+    spread = statistics.stdev(history) if len(history) > 1 else 0.0
+
+    if metric.startswith("throughput."):
+        # Lower throughput is worse
+        limit = min(center * (1 - thresholds.tolerance), center - thresholds.stddev_k * spread)
+        return Comparison(metric, current, center, limit, current < limit)
+
+    floor = thresholds.error_rate_floor if metric.endswith(".rate") else thresholds.latency_floor_ms
+    limit = max(center * (1 + thresholds.tolerance), center + thresholds.stddev_k * spread, center + floor)
+    return Comparison(metric, current, center, limit, current > limit)
+
+
+def compare(summary: dict, runs: List[dict], thresholds: Optional[Thresholds] = None) -> List[Comparison]:
+    """Compare a run against recorded runs; metrics missing from the baseline are skipped"""
+    thresholds = thresholds or Thresholds()
+    comparisons = []
+    for metric, current in extract_metrics(summary).items():
+        history = [run["metrics"][metric] for run in runs if metric in run["metrics"]]
+        if history:
+            comparisons.append(compare_metric(metric, current, history, thresholds))
+    return comparisons
+
+
+def format_comparisons(scenario: str, comparisons: List[Comparison]) -> str:
+    lines = [
+        f"scenario={scenario}",
+        f"{'metric':<45} {'baseline':>10} {'current':>10} {'change':>9} {'limit':>10}",
+    ]
+    lines.extend(comparison.describe() for comparison in comparisons)
+    return "\n".join(lines)
+
+
+def report_missing_baseline(scenarios: List[str], path: Path = DEFAULT_BASELINE_FILE, required: bool = False) -> str:
+    """Print that these scenarios were not compared, as a GitHub Actions annotation in CI"""
+    message = (
+        f"no baseline recorded for {', '.join(scenarios)} in {path}, so nothing was compared; "
+        "run `npm run perf:baseline` and commit the file"
+    )
+    level = "error" if required else "warning"
+    prefix = f"::{level}::" if os.getenv("GITHUB_ACTIONS") == "true" else f"{level.upper()}: "
+    print(prefix + message, file=sys.stderr)
+    return message
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE_FILE) -> dict:
+    if not path.exists():
+        return {"scenarios": {}}
+    with open(path, "r", encoding="utf-8") as baseline:
+        return json.load(baseline)
+
+
+def record_run(baseline: dict, summary: dict, keep: int = 5) -> dict:
+    """Append a run to its scenario, keeping only the latest `keep` runs"""
+    runs = baseline["scenarios"].setdefault(scenario_name(summary), {"runs": []})["runs"]
+    runs.append({
+        "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "metrics": extract_metrics(summary),
+    })
+    del runs[:-keep]
+    return baseline
+
+
+def save_baseline(baseline: dict, path: Path = DEFAULT_BASELINE_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(baseline, output, indent=2, sort_keys=True)
+        output.write("\n")
+
+
+def summary_files(results_dir: Path) -> List[Path]:
+    return sorted(results_dir.glob(f"*{SUMMARY_SUFFIX}"))
+
+
+def load_summary(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as summary:
+        return json.load(summary)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record or check k6 performance baselines")
+    parser.add_argument("command", choices=["update", "compare"])
+    parser.add_argument("results_dir", nargs="?", default="k6-results", help="directory with *.summary.json files")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_FILE)
+    parser.add_argument("--keep", type=int, default=5, help="runs kept per scenario (update)")
+    parser.add_argument("--require-baseline", action="store_true", default=REQUIRE_BASELINE,
+                        help="exit 1 when a scenario has no baseline (compare)")
+    args = parser.parse_args(argv)
+
+    files = summary_files(Path(args.results_dir))
+    if not files:
+        print(f"No k6 summaries in {args.results_dir}; run `npm run perf:analyze` first", file=sys.stderr)
+        return 1
+
+    baseline = load_baseline(args.baseline)
+    if args.command == "update":
+        for path in files:
+            record_run(baseline, load_summary(path), keep=args.keep)
+        save_baseline(baseline, args.baseline)
+        print(f"Recorded {len(files)} scenario(s) in {args.baseline}")
+        return 0
+
+    regressed = False
+    missing = []
+    thresholds = Thresholds.from_env()
+    for path in files:
+        summary = load_summary(path)
+        scenario = scenario_name(summary)
+        runs = baseline["scenarios"].get(scenario, {}).get("runs", [])
+        if not runs:
+            missing.append(scenario)
+            continue
+        comparisons = compare(summary, runs, thresholds)
+        print(format_comparisons(scenario, comparisons))
+        regressed = regressed or any(comparison.regressed for comparison in comparisons)
+    if missing:
+        report_missing_baseline(missing, args.baseline, required=args.require_baseline)
+    return 1 if regressed or (missing and args.require_baseline) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""Streaming analyzer for k6 NDJSON results (`k6 run --out json=...`)
+
+Reads result files line by line and keeps only fixed-size aggregates
+(log-bucketed histograms, counters and throughput windows), so memory stays
+constant no matter how large the file is. Writes a compact
+`<name>.summary.json` next to each result file, which k6-to-allure-converter.js
+attaches to the Allure report.
+
+Usage:
+    python -m tests.perf.k6_analyzer k6-results
+    python -m tests.perf.k6_analyzer k6-results/k6-results-create-task.json --window 5
+"""
+import argparse
+import json
+import math
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from tests.perf.stats import PERCENTILES
+
+
+DEFAULT_TAG_KEYS = ("name", "method", "status", "scenario", "endpoint")
+SUMMARY_SUFFIX = ".summary.json"
+OTHER = "__other__"
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Stable per-route label, e.g. "PUT /api/tasks/:id" for http://localhost:3000/api/tasks/1"""
+    path = re.sub(r"/\d+", "/:id", urlparse(url).path or url)
+    return f"{method} {path}"
+
+
+class Histogram:
+    """Log-bucketed histogram with bounded relative error (HDR-style)
+
+    Each bucket covers values within `precision` of each other, so
+    percentiles are accurate to about that relative error while the bucket
+    count only grows with the logarithm of the value range.
+    """
+
+    def __init__(self, precision: float = 0.01):
+        self._log_base = math.log1p(precision)
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.buckets[math.floor(math.log(value) / self._log_base)] += 1
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint of the bucket [base^i, base^(i+1))
+        return math.exp((index + 0.5) * self._log_base)
+
+    def percentile(self, p: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        if rank <= self.zeros:
+            return 0.0
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        result = {
+            "count": self.count,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "mean": self.total / self.count if self.count else 0.0,
+        }
+        for p in PERCENTILES:
+            result[f"p{p}"] = self.percentile(p)
+        return result
+
+
+class ThroughputWindows:
+    """Request counts per fixed time window; doubles the window width instead of growing unbounded"""
+
+    def __init__(self, window_s: float = 1.0, max_windows: int = 3600):
+        self.window_s = window_s
+        self.max_windows = max_windows
+        self.origin: Optional[float] = None
+        self.counts: Dict[int, int] = defaultdict(int)
+
+    def add(self, timestamp: float, value: float = 1):
+        if self.origin is None:
+            self.origin = timestamp
+        self.counts[math.floor((timestamp - self.origin) / self.window_s)] += value
+        if len(self.counts) > self.max_windows:
+            self._coarsen()
+
+    def _coarsen(self):
+        merged: Dict[int, int] = defaultdict(int)
+        for index, count in self.counts.items():
+            merged[index // 2] += count
+        self.counts = merged
+        self.window_s *= 2
+
+    def summary(self) -> dict:
+        if not self.counts:
+            return {"window_s": self.window_s, "windows": [], "peak_rps": 0.0, "mean_rps": 0.0}
+        first, last = min(self.counts), max(self.counts)
+        windows = []
+        for index in range(first, last + 1):
+            count = self.counts.get(index, 0)
+            start = datetime.fromtimestamp(self.origin + index * self.window_s).astimezone()
+            windows.append({"start": start.isoformat(), "requests": count, "rps": count / self.window_s})
+        rates = [window["rps"] for window in windows]
+        return {
+            "window_s": self.window_s,
+            "windows": windows,
+            "peak_rps": max(rates),
+            "mean_rps": sum(rates) / len(rates),
+        }
+
+
+class K6Analyzer:
+    """Aggregates one k6 NDJSON stream"""
+
+    def __init__(self, tag_keys: Iterable[str] = DEFAULT_TAG_KEYS, window_s: float = 1.0, max_tag_values: int = 200):
+        self.tag_keys = tuple(tag_keys)
+        self.max_tag_values = max_tag_values
+        self.metric_types: Dict[str, str] = {}
+        self.trends: Dict[str, Histogram] = {}
+        self.tagged_trends: Dict[str, Dict[str, Histogram]] = defaultdict(dict)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.rates: Dict[str, List[int]] = defaultdict(lambda: [0, 0])  # [non-zero, zero]
+        self.gauges: Dict[str, float] = {}
+        self.checks: Dict[str, List[int]] = defaultdict(lambda: [0, 0])  # [passes, fails]
+        self.errors: Dict[tuple, int] = defaultdict(int)
+        self.throughput = ThroughputWindows(window_s)
+        self.lines = 0
+        self.points = 0
+        self.invalid_lines = 0
+        self.first_time: Optional[datetime] = None
+        self.last_time: Optional[datetime] = None
+
+    def feed(self, lines: Iterable[str]):
+        for line in lines:
+            self.lines += 1
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                # A killed k6 process can leave a truncated last line
+                self.invalid_lines += 1
+                continue
+            if item.get("type") == "Metric":
+                self.metric_types[item["data"]["name"]] = item["data"]["type"]
+            elif item.get("type") == "Point":
+                self._add_point(item["metric"], item["data"])
+
+    def _tag_histogram(self, metric: str, key: str, value: str) -> Histogram:
+        groups = self.tagged_trends[metric]
+        label = f"{key}={value}"
+        if label not in groups and sum(1 for existing in groups if existing.startswith(f"{key}=")) >= self.max_tag_values:
+            label = f"{key}={OTHER}"
+        if label not in groups:
+            groups[label] = Histogram()
+        return groups[label]
+
+    def _add_point(self, metric: str, data: dict):
+        self.points += 1
+        value = data.get("value", 0)
+        tags = data.get("tags") or {}
+        if "method" in tags and "name" in tags:
+            tags = {**tags, "endpoint": endpoint_label(tags["method"], tags["name"])}
+        timestamp = datetime.fromisoformat(data["time"])
+        if self.first_time is None or timestamp < self.first_time:
+            self.first_time = timestamp
+        if self.last_time is None or timestamp > self.last_time:
+            self.last_time = timestamp
+
+        metric_type = self.metric_types.get(metric, "trend")
+        if metric_type == "trend":
+            self.trends.setdefault(metric, Histogram()).add(value)
+            for key in self.tag_keys:
+                if key in tags:
+                    self._tag_histogram(metric, key, tags[key]).add(value)
+        elif metric_type == "counter":
+            self.counters[metric] += value
+        elif metric_type == "rate":
+            self.rates[metric][0 if value else 1] += 1
+        else:
+            self.gauges[metric] = value
+
+        if metric == "checks" and "check" in tags:
+            self.checks[tags["check"]][0 if value else 1] += 1
+        if metric == "http_reqs":
+            self.throughput.add(timestamp.timestamp(), value)
+            if tags.get("error_code") or tags.get("error"):
+                self.errors[(tags.get("error_code", ""), tags.get("error", ""), tags.get("status", ""))] += value
+
+    def summary(self) -> dict:
+        metrics = {}
+        for metric, histogram in sorted(self.trends.items()):
+            metrics[metric] = {"type": "trend", **histogram.summary()}
+        for metric, total in sorted(self.counters.items()):
+            metrics[metric] = {"type": "counter", "count": total}
+        for metric, (hits, misses) in sorted(self.rates.items()):
+            metrics[metric] = {"type": "rate", "passes": hits, "fails": misses, "rate": hits / (hits + misses)}
+        for metric, value in sorted(self.gauges.items()):
+            metrics[metric] = {"type": "gauge", "value": value}
+
+        duration = (self.last_time - self.first_time).total_seconds() if self.first_time else 0.0
+        return {
+            "lines": self.lines,
+            "points": self.points,
+            "invalid_lines": self.invalid_lines,
+            "start": self.first_time.isoformat() if self.first_time else None,
+            "end": self.last_time.isoformat() if self.last_time else None,
+            "duration_s": duration,
+            "metrics": metrics,
+            "tags": {
+                metric: {label: histogram.summary() for label, histogram in sorted(groups.items())}
+                for metric, groups in sorted(self.tagged_trends.items())
+            },
+            "checks": {name: {"passes": passes, "fails": fails} for name, (passes, fails) in sorted(self.checks.items())},
+            "errors": [
+                {"error_code": code, "error": error, "status": status, "count": count}
+                for (code, error, status), count in sorted(self.errors.items(), key=lambda item: -item[1])
+            ],
+            "throughput": self.throughput.summary(),
+        }
+
+
+def analyze_file(path: Path, **options) -> dict:
+    """Stream one k6 result file and return its summary"""
+    analyzer = K6Analyzer(**options)
+    with open(path, "r", encoding="utf-8") as results:
+        analyzer.feed(results)
+    return {"source": path.name, **analyzer.summary()}
+
+
+def summary_path(path: Path) -> Path:
+    return path.with_name(path.name[:-len(".json")] + SUMMARY_SUFFIX)
+
+
+def result_files(paths: Iterable[str]) -> List[Path]:
+    """Expand directories into their k6 result files (skipping existing summaries)"""
+    files = []
+    for raw in paths:
+        path = Path(raw)
+        candidates = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        files.extend(candidate for candidate in candidates if not candidate.name.endswith(SUMMARY_SUFFIX))
+    return files
+
+
+def format_summary(summary: dict) -> str:
+    """One-screen text report"""
+    lines = [f"{summary['source']}: {summary['points']} points over {summary['duration_s']:.1f}s"]
+    duration = summary["metrics"].get("http_req_duration")
+    if duration:
+        lines.append(
+            "  http_req_duration ms: " + " ".join(f"p{p}={duration[f'p{p}']:.2f}" for p in PERCENTILES)
+            + f" max={duration['max']:.2f}"
+        )
+    throughput = summary["throughput"]
+    lines.append(f"  throughput: mean={throughput['mean_rps']:.1f} req/s peak={throughput['peak_rps']:.1f} req/s")
+    for name, check in summary["checks"].items():
+        lines.append(f"  check '{name}': {check['passes']} passed, {check['fails']} failed")
+    for error in summary["errors"][:5]:
+        lines.append(f"  error {error['error_code']} ({error['error']}): {error['count']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize k6 NDJSON result files in constant memory")
+    parser.add_argument("paths", nargs="+", help="result files or directories containing them")
+    parser.add_argument("--window", type=float, default=1.0, help="throughput window in seconds")
+    parser.add_argument("--tags", default=",".join(DEFAULT_TAG_KEYS), help="tag keys to break trends down by")
+    args = parser.parse_args(argv)
+
+    files = result_files(args.paths)
+    if not files:
+        print("No k6 result files found", file=sys.stderr)
+        return 1
+
+    for path in files:
+        summary = analyze_file(path, tag_keys=[key for key in args.tags.split(",") if key], window_s=args.window)
+        with open(summary_path(path), "w", encoding="utf-8") as output:
+            json.dump(summary, output, indent=2)
+        print(format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""Asyncio load generator for the TODO API
+
+Runs the same create/get/update/delete calls as TestAPIDirect, either as a closed model (a fixed number of virtual
+users looping with think time, like the k6 scripts) or as an open model
+(requests arrive at a fixed rate regardless of how fast the server answers).
+
+The event loop only schedules: requests run on a thread pool, and each worker
+thread sends through its own TodoApiClient, since a requests.Session is not
+safe to share between threads. Reads, updates and deletes pick from ids
+created before the run (--seed-tasks); deletes use them up, and the run stops
+with an error rather than timing an extra create when none are left.
+
+Usage:
+    python -m tests.perf.loadgen --model closed --users 50 --think-time 1 --duration 30 --mix create=1
+    python -m tests.perf.loadgen --model open --rate 200 --duration 30 --mix get=3,update=1
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from tests.api.client import DEFAULT_BASE_URL, TodoApiClient
+from tests.perf.stats import summarize
+
+
+STATUSES = ["not started", "in progress", "completed"]
+
+
+class PoolExhausted(RuntimeError):
+    """No task ids left for a get/update/delete; seed more tasks"""
+
+
+class ScenarioContext:
+    """Shared state for scenarios: a pool of existing task ids to read, update and delete"""
+
+    def __init__(self, client: TodoApiClient):
+        self.template = client
+        self.task_ids: List[int] = []
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._local = threading.local()
+        self._clients: List[TodoApiClient] = []
+
+    @property
+    def client(self) -> TodoApiClient:
+        """The calling thread's client, built on first use with the template's settings"""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = TodoApiClient(
+                self.template.base_url,
+                timeout=self.template.timeout,
+                pool_size=1,
+                retries=0,
+                record_timings=self.template.record_timings,
+            )
+            self._local.client = client
+            with self._lock:
+                self._clients.append(client)
+        return client
+
+    def close(self):
+        """Close the per-thread clients"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+
+    def next_name(self) -> str:
+        with self._lock:
+            self._counter += 1
+            return f"Load Task {self._counter}"
+
+    def seed(self, count: int):
+        """Create tasks up front so get/update/delete have something to work on"""
+        for start in range(0, count, 1000):
+            size = min(1000, count - start)
+            response = self.client.create_tasks([{"name": self.next_name()} for _ in range(size)])
+            response.raise_for_status()
+            self.add_ids(task["id"] for task in response.json()["data"])
+
+    def add_ids(self, ids):
+        with self._lock:
+            self.task_ids.extend(ids)
+
+    def any_id(self) -> int:
+        """Return an existing task id"""
+        with self._lock:
+            if self.task_ids:
+                return random.choice(self.task_ids)
+        raise PoolExhausted("No task ids left; raise --seed-tasks or add creates to the mix")
+
+    def take_id(self) -> int:
+        """Remove an id from the pool (for deletes)"""
+        with self._lock:
+            if self.task_ids:
+                return self.task_ids.pop()
+        raise PoolExhausted("No task ids left to delete; raise --seed-tasks or add creates to the mix")
+
+
+def scenario_create(ctx: ScenarioContext) -> requests.Response:
+    response = ctx.client.create_task(ctx.next_name(), priority=random.choice("123"))
+    if response.status_code == 201:
+        ctx.add_ids([response.json()["data"]["id"]])
+    return response
+
+
+def scenario_get_all(ctx: ScenarioContext) -> requests.Response:
+    return ctx.client.get_tasks()
+
+
+def scenario_get_one(ctx: ScenarioContext) -> requests.Response:
+    return ctx.client.get_task(ctx.any_id())
+
+
+def scenario_update(ctx: ScenarioContext) -> requests.Response:
+    return ctx.client.update_task(ctx.any_id(), status=random.choice(STATUSES))
+
+
+def scenario_delete(ctx: ScenarioContext) -> requests.Response:
+    return ctx.client.delete_task(ctx.take_id())
+
+
+SCENARIOS: Dict[str, Callable[[ScenarioContext], requests.Response]] = {
+    "create": scenario_create,
+    "get": scenario_get_all,
+    "get_one": scenario_get_one,
+    "update": scenario_update,
+    "delete": scenario_delete,
+}
+
+
+@dataclass
+class LoadResult:
+    """Latencies and outcomes collected during a run"""
+    model: str
+    duration: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, scenario: str, latency_ms: float, status: Optional[int]):
+        self.latencies[scenario].append(latency_ms)
+        self.statuses[scenario][status or 0] += 1
+        # 4xx answers are expected under races (e.g. an update hitting a task a
+        # concurrent delete just removed); they stay visible in `statuses`
+        if status is None or status >= 500:
+            self.errors[scenario] += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    def summary(self) -> dict:
+        """Per-scenario percentiles, throughput and error counts"""
+        scenarios = {}
+        for name, values in sorted(self.latencies.items()):
+            stats = summarize(values)
+            stats["errors"] = self.errors.get(name, 0)
+            stats["throughput_rps"] = len(values) / self.duration if self.duration else 0.0
+            stats["statuses"] = {str(code): count for code, count in sorted(self.statuses[name].items())}
+            scenarios[name] = stats
+        return {
+            "model": self.model,
+            "duration_s": self.duration,
+            "total_requests": self.total_requests,
+            "throughput_rps": self.total_requests / self.duration if self.duration else 0.0,
+            "scenarios": scenarios,
+        }
+
+    def format_report(self) -> str:
+        """Human readable table of the summary"""
+        summary = self.summary()
+        lines = [
+            f"model={summary['model']} duration={summary['duration_s']:.1f}s "
+            f"requests={summary['total_requests']} throughput={summary['throughput_rps']:.1f} req/s",
+            f"{'scenario':<10} {'count':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}",
+        ]
+        for name, stats in summary["scenarios"].items():
+            lines.append(
+                f"{name:<10} {stats['count']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8.1f} "
+                f"{stats['p50']:>8.2f} {stats['p90']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f} {stats['max']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    """Drives scenarios against the API using asyncio and a thread pool
+
+    `client` is only a template: every worker thread gets its own client with
+    the same base URL, timeout and timing settings.
+    """
+
+    def __init__(self, client: TodoApiClient, mix: Dict[str, float], max_in_flight: int = 50, seed_tasks: int = 100):
+        unknown = set(mix) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.max_in_flight = max_in_flight
+        self.context = ScenarioContext(client)
+        self.seed_tasks = seed_tasks
+
+    def _pick(self) -> str:
+        return random.choices(self.names, weights=self.weights)[0]
+
+    def _execute(self, name: str):
+        """Run one scenario on a worker thread, returning (status, start time, end time)"""
+        start = time.perf_counter()
+        try:
+            status = SCENARIOS[name](self.context).status_code
+        except requests.RequestException:
+            status = None
+        return status, start, time.perf_counter()
+
+    async def run_closed(self, users: int, duration: float, think_time: float = 0.0) -> LoadResult:
+        """Closed model: `users` loops, each waiting for its response (plus think time) before the next request"""
+        result = LoadResult(model="closed")
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            async def user():
+                while time.perf_counter() < deadline:
+                    name = self._pick()
+                    status, start, end = await loop.run_in_executor(executor, self._execute, name)
+                    result.record(name, (end - start) * 1000, status)
+                    if think_time:
+                        await asyncio.sleep(think_time)
+
+            try:
+                await loop.run_in_executor(executor, self.context.seed, self.seed_tasks)
+                started = time.perf_counter()
+                deadline = started + duration
+                await asyncio.gather(*(user() for _ in range(users)))
+                result.duration = time.perf_counter() - started
+            finally:
+                self.context.close()
+        return result
+
+    async def run_open(self, rate: float, duration: float, poisson: bool = True) -> LoadResult:
+        """Open model: requests arrive at `rate` per second whether or not earlier ones finished
+
+        Latency is measured from the scheduled arrival time, so time spent
+        queued behind a slow server counts (no coordinated omission).
+        """
+        result = LoadResult(model="open")
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            async def request(name: str, scheduled: float):
+                status, _, end = await loop.run_in_executor(executor, self._execute, name)
+                result.record(name, (end - scheduled) * 1000, status)
+
+            try:
+                await loop.run_in_executor(executor, self.context.seed, self.seed_tasks)
+                started = time.perf_counter()
+                deadline = started + duration
+                next_arrival = started
+                pending = []
+                while next_arrival < deadline:
+                    delay = next_arrival - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    pending.append(asyncio.ensure_future(request(self._pick(), next_arrival)))
+                    next_arrival += random.expovariate(rate) if poisson else 1 / rate
+                await asyncio.gather(*pending)
+                result.duration = time.perf_counter() - started
+            finally:
+                self.context.close()
+        return result
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse "create=1,get=3" into a weight map"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Python load generator for the TODO API")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--model", choices=["closed", "open"], default="closed")
+    parser.add_argument("--users", type=int, default=50, help="virtual users (closed model)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="seconds between a user's requests (closed model)")
+    parser.add_argument("--rate", type=float, default=50.0, help="arrivals per second (open model)")
+    parser.add_argument("--constant-arrivals", action="store_true", help="evenly spaced instead of Poisson arrivals (open model)")
+    parser.add_argument("--max-in-flight", type=int, default=100, help="concurrent requests cap (open model)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("create=1"), help="weighted scenarios, e.g. create=1,get=3,update=1,delete=1")
+    parser.add_argument("--seed-tasks", type=int, default=100, help="tasks created before the run; deletes use them up")
+    parser.add_argument("--output", help="write the JSON summary to this file")
+    args = parser.parse_args(argv)
+
+    client = TodoApiClient(args.base_url, pool_size=1, retries=0, record_timings=False)
+    generator = LoadGenerator(client, args.mix, max_in_flight=args.max_in_flight, seed_tasks=args.seed_tasks)
+    try:
+        if args.model == "closed":
+            result = asyncio.run(generator.run_closed(args.users, args.duration, args.think_time))
+        else:
+            result = asyncio.run(generator.run_open(args.rate, args.duration, poisson=not args.constant_arrivals))
+    finally:
+        client.close()
+
+    print(result.format_report())
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(result.summary(), output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
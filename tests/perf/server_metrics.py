@@ -0,0 +1,101 @@
+"""Parse the server's Prometheus /metrics text and report what changed between two scrapes"""
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+Labels = Tuple[Tuple[str, str], ...]
+Samples = Dict[Tuple[str, Labels], float]
+
+SAMPLE_LINE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$")
+LABEL_PAIR = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+REQUEST_METRIC = "http_request_duration_seconds"
+STORAGE_METRIC = "todo_storage_write_duration_seconds"
+LAG_METRIC = "nodejs_eventloop_lag_seconds"
+
+# Routes left out of the breakdown: the scrapes that produce it are not test traffic
+SCRAPE_ROUTES = {"/metrics"}
+
+
+def parse_metrics(text: str) -> Samples:
+    """Map (metric name, sorted label pairs) to value for every sample line"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE_LINE.match(line.strip())
+        if not match:
+            continue
+        name, raw_labels, value = match.groups()
+        labels = tuple(sorted(
+            (key, value.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\"))
+            for key, value in LABEL_PAIR.findall(raw_labels or "")
+        ))
+        samples[(name, labels)] = float(value)
+    return samples
+
+
+def diff_metrics(before: Samples, after: Samples) -> Samples:
+    """Per-sample increase from `before` to `after` (series that did not change are dropped)"""
+    delta = {}
+    for key, value in after.items():
+        change = value - before.get(key, 0.0)
+        if change:
+            delta[key] = change
+    return delta
+
+
+def histogram_series(samples: Samples, name: str) -> Dict[Labels, dict]:
+    """Group a histogram's _count, _sum and _bucket samples by series labels"""
+    series = {}
+    for (sample_name, labels), value in samples.items():
+        if sample_name == f"{name}_count":
+            series.setdefault(labels, {"buckets": []})["count"] = value
+        elif sample_name == f"{name}_sum":
+            series.setdefault(labels, {"buckets": []})["sum"] = value
+        elif sample_name == f"{name}_bucket":
+            bound = dict(labels)["le"]
+            key = tuple(pair for pair in labels if pair[0] != "le")
+            series.setdefault(key, {"buckets": []})["buckets"].append(
+                (math.inf if bound == "+Inf" else float(bound), value)
+            )
+    return {labels: data for labels, data in series.items() if data.get("count")}
+
+
+def bucket_quantile(buckets: List[Tuple[float, float]], count: float, q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th quantile (None if it is past the last bound)"""
+    for bound, cumulative in sorted(buckets):
+        if cumulative >= q * count:
+            return None if math.isinf(bound) else bound
+    return None
+
+
+def _format_row(key: str, data: dict) -> str:
+    count = data["count"]
+    mean_ms = data.get("sum", 0.0) / count * 1000
+    p95 = bucket_quantile(data["buckets"], count, 0.95)
+    p95_text = f"<= {p95 * 1000:g}" if p95 is not None else "> max"
+    return f"{key:<45} {count:>6.0f} {mean_ms:>9.2f} {p95_text:>10}"
+
+
+def timing_breakdown(delta: Samples) -> str:
+    """Server-side timings for the requests and writes in `delta`, one row per route or write type"""
+    lines = [f"{'server timing':<45} {'count':>6} {'avg ms':>9} {'p95 ms':>10}"]
+
+    requests = histogram_series(delta, REQUEST_METRIC)
+    for labels, data in sorted(requests.items()):
+        label = dict(labels)
+        if label.get("route") in SCRAPE_ROUTES:
+            continue
+        lines.append(_format_row(f"{label.get('method')} {label.get('route')} {label.get('status')}", data))
+
+    for labels, data in sorted(histogram_series(delta, STORAGE_METRIC).items()):
+        lines.append(_format_row(f"storage write ({dict(labels).get('op')})", data))
+
+    for data in histogram_series(delta, LAG_METRIC).values():
+        lines.append(_format_row("event loop lag", data))
+
+    if len(lines) == 1:
+        lines.append("(no server activity)")
+    return "\n".join(lines)
@@ -0,0 +1,29 @@
+"""Latency statistics helpers"""
+from typing import Dict, List, Sequence
+
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Linearly interpolated percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """count/mean/min/max and p50-p99 for a list of latencies"""
+    ordered = sorted(values)
+    summary = {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "min": ordered[0] if ordered else 0.0,
+        "max": ordered[-1] if ordered else 0.0,
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}"] = percentile(ordered, p)
+    return summary
@@ -1,6 +1,7 @@
 """E2E tests for API integration"""
 import pytest
-import requests
+from tests.api.client import TodoApiClient
+from tests.perf.server_metrics import REQUEST_METRIC, STORAGE_METRIC, diff_metrics, histogram_series, parse_metrics
 from tests.pages.todo_page import TodoPage
 
 
@@ -24,7 +25,7 @@ class TestAPIIntegration:
         api_detected = any("Using API backend" in log for log in console_logs)
         assert api_detected, f"Should detect API. Console logs: {console_logs}"
     
-    def test_create_task_via_api(self, todo_page: TodoPage, server_process):
+    def test_create_task_via_api(self, todo_page: TodoPage, api_client: TodoApiClient):
         """
         Scenario: Create task via API
         When I add a task "API Test Task"
@@ -37,19 +38,18 @@ class TestAPIIntegration:
         
         # When
         todo_page.add_task("API Test Task", priority="2", status="in progress")
-        todo_page.page.wait_for_timeout(1000)
         
         # Then - Check UI
         assert todo_page.task_exists("API Test Task")
         
         # Then - Check API
-        response = requests.get("http://localhost:3000/api/tasks")
+        response = api_client.get_tasks()
         assert response.status_code == 200
         tasks = response.json()["data"]
         api_task_names = [task["name"] for task in tasks]
         assert "API Test Task" in api_task_names
     
-    def test_update_task_via_api(self, todo_page: TodoPage, server_process):
+    def test_update_task_via_api(self, todo_page: TodoPage, api_client: TodoApiClient, seed_tasks):
         """
         Scenario: Update task via API
         Given I have a task
@@ -57,29 +57,26 @@ class TestAPIIntegration:
         Then the task should be updated in the API
         """
         # Given
+        seed_tasks([{"name": "API Task to Update", "priority": "1", "status": "not started"}])
         todo_page.navigate()
         todo_page.wait_for_api_detection()
-        todo_page.add_task("API Task to Update", priority="1", status="not started")
-        todo_page.page.wait_for_timeout(1000)
         
         # When
         todo_page.click_task("API Task to Update")
-        todo_page.page.wait_for_timeout(500)
         todo_page.edit_task_status("API Task to Update", "completed")
         todo_page.save_task_changes("API Task to Update")
-        todo_page.page.wait_for_timeout(1000)
         
         # Then - Check UI
         assert "Completed" in todo_page.get_task_status("API Task to Update")
         
         # Then - Check API
-        response = requests.get("http://localhost:3000/api/tasks")
+        response = api_client.get_tasks()
         tasks = response.json()["data"]
         updated_task = next((t for t in tasks if t["name"] == "API Task to Update"), None)
         assert updated_task is not None
         assert updated_task["status"] == "completed"
     
-    def test_delete_task_via_api(self, todo_page: TodoPage, server_process):
+    def test_delete_task_via_api(self, todo_page: TodoPage, api_client: TodoApiClient, seed_tasks):
         """
         Scenario: Delete task via API
         Given I have a task
@@ -87,30 +84,21 @@ class TestAPIIntegration:
         Then the task should be removed from the API
         """
         # Given
+        task_id = seed_tasks([{"name": "API Task to Delete", "priority": "1", "status": "not started"}])[0]["id"]
         todo_page.navigate()
         todo_page.wait_for_api_detection()
-        todo_page.add_task("API Task to Delete", priority="1", status="not started")
-        todo_page.page.wait_for_timeout(1000)
-        
-        # Get task ID from API
-        response = requests.get("http://localhost:3000/api/tasks")
-        tasks = response.json()["data"]
-        task_to_delete = next((t for t in tasks if t["name"] == "API Task to Delete"), None)
-        assert task_to_delete is not None
-        task_id = task_to_delete["id"]
         
         # When
         todo_page.delete_task("API Task to Delete", confirm=True)
-        todo_page.page.wait_for_timeout(1000)
         
         # Then - Check UI
         assert not todo_page.task_exists("API Task to Delete")
         
         # Then - Check API
-        response = requests.get(f"http://localhost:3000/api/tasks/{task_id}")
+        response = api_client.get_task(task_id)
         assert response.status_code == 404, "Task should not exist in API"
     
-    def test_load_existing_tasks_from_api(self, todo_page: TodoPage, server_process):
+    def test_load_existing_tasks_from_api(self, todo_page: TodoPage, seed_tasks):
         """
         Scenario: Load existing tasks from API on startup
         Given the API server has tasks stored
@@ -118,26 +106,15 @@ class TestAPIIntegration:
         Then all tasks should be loaded
         """
         # Given - Create tasks via API
-        requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Preloaded Task 1",
-            "priority": "1",
-            "status": "not started"
-        })
-        requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Preloaded Task 2",
-            "priority": "2",
-            "status": "in progress"
-        })
-        requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Preloaded Task 3",
-            "priority": "3",
-            "status": "completed"
-        })
+        seed_tasks([
+            {"name": "Preloaded Task 1", "priority": "1", "status": "not started"},
+            {"name": "Preloaded Task 2", "priority": "2", "status": "in progress"},
+            {"name": "Preloaded Task 3", "priority": "3", "status": "completed"},
+        ])
         
         # When
         todo_page.navigate()
         todo_page.wait_for_api_detection()
-        todo_page.page.wait_for_timeout(1000)
         
         # Then
         assert todo_page.get_task_count() == 3, "Should load all 3 tasks"
@@ -150,7 +127,7 @@ class TestAPIIntegration:
         assert todo_page.get_task_highlight_class("Preloaded Task 2") == "orange"
         assert todo_page.get_task_highlight_class("Preloaded Task 3") == "green"
     
-    def test_data_persistence_after_page_refresh(self, todo_page: TodoPage, server_process):
+    def test_data_persistence_after_page_refresh(self, todo_page: TodoPage, api_client: TodoApiClient):
         """
         Scenario: Data persistence after page refresh
         Given I have added tasks via the application
@@ -162,12 +139,10 @@ class TestAPIIntegration:
         todo_page.wait_for_api_detection()
         todo_page.add_task("Persistent Task 1", priority="1", status="not started")
         todo_page.add_task("Persistent Task 2", priority="2", status="in progress")
-        todo_page.page.wait_for_timeout(1000)
         
         # When
         todo_page.page.reload()
         todo_page.wait_for_api_detection()
-        todo_page.page.wait_for_timeout(1000)
         
         # Then
         assert todo_page.get_task_count() == 2
@@ -183,98 +158,178 @@ class TestAPIIntegration:
 class TestAPIDirect:
     """Direct API tests without UI"""
     
-    def test_api_get_all_tasks(self, server_process):
+    def test_api_get_all_tasks(self, api_client: TodoApiClient):
         """Test GET /api/tasks endpoint"""
-        response = requests.get("http://localhost:3000/api/tasks")
+        response = api_client.get_tasks()
         assert response.status_code == 200
         data = response.json()
         assert "success" in data
         assert "data" in data
         assert isinstance(data["data"], list)
     
-    def test_api_create_task(self, server_process):
+    def test_api_create_task(self, api_client: TodoApiClient):
         """Test POST /api/tasks endpoint"""
-        response = requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Direct API Task",
-            "priority": "2",
-            "status": "not started"
-        })
+        response = api_client.create_task("Direct API Task", priority="2", status="not started")
         assert response.status_code == 201
         data = response.json()
         assert data["success"] is True
         assert data["data"]["name"] == "Direct API Task"
         assert "id" in data["data"]
+        assert api_client.find_task("Direct API Task") == data["data"]
     
-    def test_api_update_task(self, server_process):
+    def test_api_update_task(self, api_client: TodoApiClient):
         """Test PUT /api/tasks/:id endpoint"""
         # Create task first
-        create_response = requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Task to Update",
-            "priority": "1",
-            "status": "not started"
-        })
+        create_response = api_client.create_task("Task to Update", priority="1", status="not started")
         task_id = create_response.json()["data"]["id"]
         
         # Update task
-        update_response = requests.put(f"http://localhost:3000/api/tasks/{task_id}", json={
-            "status": "completed",
-            "priority": "3"
-        })
+        update_response = api_client.update_task(task_id, status="completed", priority="3")
         assert update_response.status_code == 200
         data = update_response.json()
         assert data["success"] is True
         assert data["data"]["status"] == "completed"
         assert data["data"]["priority"] == "3"
     
-    def test_api_delete_task(self, server_process):
+    def test_api_delete_task(self, api_client: TodoApiClient):
         """Test DELETE /api/tasks/:id endpoint"""
         # Create task first
-        create_response = requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Task to Delete",
-            "priority": "1",
-            "status": "not started"
-        })
+        create_response = api_client.create_task("Task to Delete", priority="1", status="not started")
         task_id = create_response.json()["data"]["id"]
         
         # Delete task
-        delete_response = requests.delete(f"http://localhost:3000/api/tasks/{task_id}")
+        delete_response = api_client.delete_task(task_id)
         assert delete_response.status_code == 200
         assert delete_response.json()["success"] is True
         
         # Verify deletion
-        get_response = requests.get(f"http://localhost:3000/api/tasks/{task_id}")
+        get_response = api_client.get_task(task_id)
         assert get_response.status_code == 404
     
-    def test_api_validation_empty_name(self, server_process):
+    def test_api_validation_empty_name(self, api_client: TodoApiClient):
         """Test API validates empty task name"""
-        response = requests.post("http://localhost:3000/api/tasks", json={
-            "name": "",
-            "priority": "1",
-            "status": "not started"
-        })
+        response = api_client.create_task("", priority="1", status="not started")
         assert response.status_code == 400
         data = response.json()
         assert data["success"] is False
         assert "errors" in data
     
-    def test_api_validation_invalid_priority(self, server_process):
+    def test_api_validation_invalid_priority(self, api_client: TodoApiClient):
         """Test API validates invalid priority"""
-        response = requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Test Task",
-            "priority": "10",
-            "status": "not started"
-        })
+        response = api_client.create_task("Test Task", priority="10", status="not started")
         assert response.status_code == 400
         data = response.json()
         assert data["success"] is False
     
-    def test_api_validation_invalid_status(self, server_process):
+    def test_api_validation_invalid_status(self, api_client: TodoApiClient):
         """Test API validates invalid status"""
-        response = requests.post("http://localhost:3000/api/tasks", json={
-            "name": "Test Task",
-            "priority": "1",
-            "status": "invalid status"
-        })
+        response = api_client.create_task("Test Task", priority="1", status="invalid status")
+        assert response.status_code == 400
+        data = response.json()
+        assert data["success"] is False
+    
+    def test_api_paginate_tasks(self, api_client: TodoApiClient, seed_tasks):
+        """Test GET /api/tasks pages through every task with limit and after"""
+        seeded = seed_tasks(25)
+        
+        first_page = api_client.get_tasks(limit=10).json()
+        assert first_page["count"] == 10
+        assert first_page["nextCursor"] == first_page["data"][-1]["id"]
+        
+        ids = [task["id"] for task in api_client.iter_tasks(page_size=10)]
+        assert ids == [task["id"] for task in seeded]
+    
+    def test_api_filter_and_project_tasks(self, api_client: TodoApiClient, seed_tasks):
+        """Test GET /api/tasks filters by status/priority and returns only requested fields"""
+        seed_tasks([
+            {"name": "Done High", "priority": "3", "status": "completed"},
+            {"name": "Done Low", "priority": "1", "status": "completed"},
+            {"name": "Open High", "priority": "3", "status": "in progress"},
+        ])
+        
+        response = api_client.get_tasks(status="completed", priority="3", fields="name")
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [task["name"] for task in data] == ["Done High"]
+        assert set(data[0]) == {"id", "name"}
+    
+    def test_api_validation_invalid_page_params(self, api_client: TodoApiClient):
+        """Test API rejects out-of-range limit and unknown fields"""
+        response = api_client.get_tasks(limit=5000, fields="name,owner")
         assert response.status_code == 400
         data = response.json()
         assert data["success"] is False
+        assert len(data["errors"]) == 2
+    
+    def test_api_conditional_get_not_modified(self, api_client: TodoApiClient, seed_tasks):
+        """Test GET /api/tasks answers 304 with no body while the list is unchanged"""
+        seed_tasks(3)
+        
+        first = api_client.get_tasks()
+        etag = first.headers.get("ETag")
+        assert first.status_code == 200
+        assert etag
+        
+        second = api_client.get_tasks(etag=etag)
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers.get("ETag") == etag
+    
+    def test_api_conditional_get_invalidated_by_writes(self, api_client: TodoApiClient, seed_tasks):
+        """Test every create, update and delete invalidates the cached GET /api/tasks response"""
+        task_id = seed_tasks(1)[0]["id"]
+        etag = api_client.get_tasks().headers["ETag"]
+        
+        writes = [
+            ("create", lambda: api_client.create_task("Cache Buster")),
+            ("update", lambda: api_client.update_task(task_id, status="completed")),
+            ("delete", lambda: api_client.delete_task(task_id)),
+        ]
+        for name, write in writes:
+            assert write().status_code in (200, 201)
+            response = api_client.get_tasks(etag=etag)
+            assert response.status_code == 200, f"list still cached after {name}"
+            assert response.headers["ETag"] != etag
+            etag = response.headers["ETag"]
+        
+        assert [task["name"] for task in response.json()["data"]] == ["Cache Buster"]
+    
+    def test_api_delta_sync_sends_only_changes(self, api_client: TodoApiClient, seed_tasks):
+        """Test GET /api/tasks/changes returns just the changed tasks, not the whole list"""
+        seeded = seed_tasks(500)
+        full = api_client.get_tasks()
+        version = full.json()["version"]
+        
+        api_client.update_task(seeded[0]["id"], status="completed")
+        api_client.delete_task(seeded[1]["id"])
+        created = api_client.create_task("Delta Task").json()["data"]
+        
+        response = api_client.get_changes(version)
+        assert response.status_code == 200
+        changes = response.json()
+        assert [task["id"] for task in changes["created"]] == [created["id"]]
+        assert [(task["id"], task["status"]) for task in changes["updated"]] == [(seeded[0]["id"], "completed")]
+        assert changes["deleted"] == [seeded[1]["id"]]
+        assert len(response.content) < len(full.content) / 50
+        
+        assert api_client.get_changes(changes["version"]).json()["created"] == []
+    
+    def test_api_metrics_time_each_route(self, api_client: TodoApiClient):
+        """Test GET /metrics counts and times requests per route pattern and storage writes"""
+        before = parse_metrics(api_client.get_metrics().text)
+        
+        task = api_client.create_task("Metered Task").json()["data"]
+        api_client.get_task(task["id"])
+        api_client.delete_task(task["id"])
+        
+        response = api_client.get_metrics()
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        delta = diff_metrics(before, parse_metrics(response.text))
+        requests = {
+            (dict(labels)["method"], dict(labels)["route"]): data["count"]
+            for labels, data in histogram_series(delta, REQUEST_METRIC).items()
+        }
+        assert requests == {("POST", "/api/tasks"): 1, ("GET", "/api/tasks/:id"): 1, ("DELETE", "/api/tasks/:id"): 1}
+        writes = histogram_series(delta, STORAGE_METRIC)
+        assert writes[(("op", "append"),)]["count"] == 2
@@ -0,0 +1,116 @@
+"""Tests for POST /api/tasks/batch: many creates, updates and deletes in one all-or-nothing request"""
+import os
+import time
+from typing import List
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+
+
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
+# The batch must be at least this many times faster than the same operations sent one by one
+BATCH_MIN_SPEEDUP = float(os.getenv("BATCH_MIN_SPEEDUP", "5"))
+BATCH_LIMIT_MS = float(os.getenv("BATCH_LIMIT_MS", "1000"))
+
+
+def storage_appends(client: TodoApiClient) -> int:
+    return client.get("/api/health").json()["storage"]["appends"]
+
+
+@pytest.mark.api
+class TestBatchOperations:
+    """Every operation is validated before any is applied, and the batch is stored once"""
+
+    def test_mixed_batch_is_applied_in_order(self, api_client: TodoApiClient, seed_tasks):
+        keep, remove = seed_tasks([{"name": "Keep"}, {"name": "Remove"}])
+        appends = storage_appends(api_client)
+
+        response = api_client.batch([
+            {"op": "create", "name": "Added", "priority": "3"},
+            {"op": "update", "id": keep["id"], "status": "in progress"},
+            {"op": "update", "id": keep["id"], "priority": "2"},
+            {"op": "delete", "id": remove["id"]},
+        ])
+
+        assert response.status_code == 200, response.text
+        results = response.json()["data"]
+        assert [result["op"] for result in results] == ["create", "update", "update", "delete"]
+        assert results[2]["data"] == {**keep, "status": "in progress", "priority": "2"}
+        tasks = {task["name"]: task for task in api_client.list_tasks()}
+        assert set(tasks) == {"Keep", "Added"}
+        assert tasks["Keep"]["status"] == "in progress"
+        assert storage_appends(api_client) - appends == 1
+
+    def test_partial_validation_failure_changes_nothing(self, api_client: TodoApiClient, seed_tasks):
+        tasks = seed_tasks(3)
+        before = api_client.list_tasks()
+
+        response = api_client.batch([
+            {"op": "update", "id": tasks[0]["id"], "status": "completed"},
+            {"op": "delete", "id": tasks[1]["id"]},
+            {"op": "create", "name": "   "},
+            {"op": "update", "id": tasks[1]["id"], "status": "completed"},
+            {"op": "update", "id": tasks[2]["id"], "status": "finished"},
+            {"op": "create", "name": "Valid"},
+        ])
+
+        assert response.status_code == 400
+        body = response.json()
+        assert body["success"] is False
+        assert [error["index"] for error in body["errors"]] == [2, 3, 4]
+        assert body["errors"][1]["errors"] == ["Task not found"]
+        assert api_client.list_tasks() == before
+
+    def test_large_batch_completes_every_task(self, api_client: TodoApiClient, seed_tasks):
+        """BATCH_SIZE updates in one batch; the time is attached, not asserted"""
+        tasks = seed_tasks(BATCH_SIZE)
+        appends = storage_appends(api_client)
+
+        with allure.step(f"Update {BATCH_SIZE} tasks in one batch"):
+            start = time.perf_counter()
+            response = api_client.batch([{"op": "update", "id": task["id"], "status": "completed"} for task in tasks])
+            batch_ms = (time.perf_counter() - start) * 1000
+        allure.attach(f"one batch: {batch_ms:.0f}ms ({BATCH_SIZE / batch_ms * 1000:.0f} ops/s)",
+                      name=f"{BATCH_SIZE} updates", attachment_type=allure.attachment_type.TEXT)
+
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["count"] == BATCH_SIZE
+        assert [result["data"]["id"] for result in body["data"]] == [task["id"] for task in tasks]
+        assert len(api_client.list_tasks(status="completed")) == BATCH_SIZE
+        assert storage_appends(api_client) - appends == 1
+
+    @pytest.mark.perf
+    def test_batch_throughput(self, api_client: TodoApiClient, seed_tasks):
+        """Completing BATCH_SIZE tasks in one batch vs one PUT per task"""
+        tasks = seed_tasks(BATCH_SIZE * 2)
+        one_by_one, batched = tasks[:BATCH_SIZE], tasks[BATCH_SIZE:]
+
+        with allure.step(f"Update {BATCH_SIZE} tasks one request at a time"):
+            start = time.perf_counter()
+            for task in one_by_one:
+                assert api_client.update_task(task["id"], status="completed").status_code == 200
+            single_ms = (time.perf_counter() - start) * 1000
+
+        with allure.step(f"Update {BATCH_SIZE} tasks in one batch"):
+            operations: List[dict] = [{"op": "update", "id": task["id"], "status": "completed"} for task in batched]
+            start = time.perf_counter()
+            response = api_client.batch(operations)
+            batch_ms = (time.perf_counter() - start) * 1000
+            assert response.status_code == 200, response.text
+            assert response.json()["count"] == BATCH_SIZE
+
+        speedup = single_ms / batch_ms
+        report = (
+            f"single requests: {single_ms:.0f}ms ({BATCH_SIZE / single_ms * 1000:.0f} ops/s)\n"
+            f"one batch:       {batch_ms:.0f}ms ({BATCH_SIZE / batch_ms * 1000:.0f} ops/s)\n"
+            f"speedup:         {speedup:.1f}x"
+        )
+        allure.attach(report, name=f"{BATCH_SIZE} updates", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        assert len(api_client.list_tasks(status="completed")) == BATCH_SIZE * 2
+        assert batch_ms <= BATCH_LIMIT_MS, f"Batch of {BATCH_SIZE} took {batch_ms:.0f}ms (limit {BATCH_LIMIT_MS:.0f}ms)"
+        assert speedup >= BATCH_MIN_SPEEDUP, f"Batch was only {speedup:.1f}x faster (need {BATCH_MIN_SPEEDUP}x)\n{report}"
@@ -0,0 +1,110 @@
+"""Consistency tests for cluster mode (node cluster.js): many workers, one writer"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+
+
+CLUSTER_WORKERS = int(os.getenv("CLUSTER_WORKERS", "4"))
+CLUSTER_OPS = int(os.getenv("CLUSTER_OPS", "500"))
+CLUSTER_THREADS = int(os.getenv("CLUSTER_THREADS", "16"))
+# Workers apply other workers' writes asynchronously; how long they may take to agree
+CONVERGE_TIMEOUT_S = float(os.getenv("CLUSTER_CONVERGE_TIMEOUT_S", "2"))
+
+# A new connection per request, so the cluster spreads consecutive requests over its workers
+NEW_CONNECTION = {"Connection": "close"}
+
+
+def worker_pids(client: TodoApiClient) -> set:
+    """Pids of the workers that answered a round of requests"""
+    return {client.get("/api/health", headers=NEW_CONNECTION).json()["pid"] for _ in range(CLUSTER_WORKERS * 4)}
+
+
+def wait_for_agreement(client: TodoApiClient) -> List[dict]:
+    """Poll until a round of requests spread over the workers all return the same task list, and return it"""
+    deadline = time.monotonic() + CONVERGE_TIMEOUT_S
+    while True:
+        lists = [client.get("/api/tasks", headers=NEW_CONNECTION).json()["data"] for _ in range(CLUSTER_WORKERS * 4)]
+        if all(tasks == lists[0] for tasks in lists):
+            return lists[0]
+        if time.monotonic() > deadline:
+            raise AssertionError(f"Workers still disagree after {CONVERGE_TIMEOUT_S}s: task counts {[len(tasks) for tasks in lists]}")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def cluster(isolated_server):
+    """A private cluster of CLUSTER_WORKERS workers and a client for it"""
+    server = isolated_server(script="cluster.js", CLUSTER_WORKERS=CLUSTER_WORKERS)
+    client = TodoApiClient(server.base_url, pool_size=CLUSTER_THREADS, record_timings=False)
+    yield server, client
+    client.close()
+
+
+@pytest.mark.api
+class TestClusterConsistency:
+    """Workers share one store: no lost writes, no duplicate ids, the same answer from every worker"""
+
+    def test_concurrent_creates_and_deletes_across_workers(self, cluster):
+        server, client = cluster
+
+        def create_and_maybe_delete(i: int) -> dict:
+            created = client.post("/api/tasks", json={"name": f"Cluster {i}"}, headers=NEW_CONNECTION)
+            assert created.status_code == 201, created.text
+            task = created.json()["data"]
+            deleted = i % 2 == 0
+            if deleted:
+                # Usually lands on a different worker than the create did
+                response = client.delete(f"/api/tasks/{task['id']}", headers=NEW_CONNECTION)
+                assert response.status_code == 200, response.text
+            return {"id": task["id"], "deleted": deleted}
+
+        with allure.step(f"{CLUSTER_OPS} creates and {CLUSTER_OPS // 2 + CLUSTER_OPS % 2} deletes on {CLUSTER_THREADS} threads"):
+            with ThreadPoolExecutor(max_workers=CLUSTER_THREADS) as pool:
+                results = list(pool.map(create_and_maybe_delete, range(CLUSTER_OPS)))
+
+        ids = [result["id"] for result in results]
+        assert len(set(ids)) == len(ids), "Two creates got the same id"
+        assert sorted(ids) == list(range(1, CLUSTER_OPS + 1)), "Ids skipped or reused a value"
+        expected = sorted(result["id"] for result in results if not result["deleted"])
+
+        with allure.step("Every worker returns the same tasks"):
+            tasks = wait_for_agreement(client)
+            assert [task["id"] for task in tasks] == expected
+            assert len(worker_pids(client)) > 1 or CLUSTER_WORKERS == 1, "Every request went to the same worker"
+
+        with allure.step("Restart the cluster; the tasks and ids carry on"):
+            server.stop()
+            server.start()
+            assert wait_for_agreement(client) == tasks
+            assert client.create_task("After Restart").json()["data"]["id"] == CLUSTER_OPS + 1
+
+    def test_concurrent_updates_to_the_same_task_are_not_lost(self, cluster):
+        """Two workers changing different fields of one task at once both take effect"""
+        _, client = cluster
+        created = client.create_tasks([{"name": f"Shared {i}"} for i in range(CLUSTER_OPS // 5)])
+        assert created.status_code == 201, created.text
+        tasks = created.json()["data"]
+
+        def update(args) -> int:
+            task_id, fields = args
+            return client.put(f"/api/tasks/{task_id}", json=fields, headers=NEW_CONNECTION).status_code
+
+        updates = []
+        for task in tasks:
+            updates.append((task["id"], {"status": "completed"}))
+            updates.append((task["id"], {"priority": "3"}))
+        with allure.step(f"{len(updates)} concurrent updates, two per task"):
+            with ThreadPoolExecutor(max_workers=CLUSTER_THREADS) as pool:
+                assert set(pool.map(update, updates)) == {200}
+
+        stored = wait_for_agreement(client)
+        assert len(stored) == len(tasks)
+        assert all(task["status"] == "completed" and task["priority"] == "3" for task in stored), (
+            [task for task in stored if task["status"] != "completed" or task["priority"] != "3"][:5]
+        )
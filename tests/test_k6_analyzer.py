@@ -0,0 +1,109 @@
+"""Tests for the streaming k6 result analyzer (no server or browser needed)"""
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from tests.perf.k6_analyzer import K6Analyzer, analyze_file, main, summary_path
+from tests.perf.stats import percentile
+
+
+pytestmark = [pytest.mark.perf, pytest.mark.offline]
+
+K6_RESULTS = Path(__file__).resolve().parent.parent / "k6-results" / "k6-results-create-task.json"
+
+
+def metric_line(name: str, metric_type: str) -> str:
+    return json.dumps({"type": "Metric", "data": {"name": name, "type": metric_type}, "metric": name})
+
+
+def point_line(metric: str, value: float, time: str = "2025-01-01T12:00:00.000000+00:00", **tags) -> str:
+    return json.dumps({"type": "Point", "metric": metric, "data": {"time": time, "value": value, "tags": tags}})
+
+
+def write_results(tmp_path: Path, lines) -> Path:
+    path = tmp_path / "k6-results-synthetic.json"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+class TestK6Analyzer:
+    """Summaries computed from synthetic and recorded k6 output"""
+
+    def test_percentiles_within_one_percent(self, tmp_path):
+        """Histogram percentiles stay within ~1% of the exact values"""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+        lines = [metric_line("http_req_duration", "trend")]
+        lines += [point_line("http_req_duration", value) for value in values]
+
+        stats = analyze_file(write_results(tmp_path, lines))["metrics"]["http_req_duration"]
+
+        ordered = sorted(values)
+        assert stats["count"] == len(values)
+        assert stats["max"] == pytest.approx(ordered[-1])
+        for p in (50, 90, 95, 99):
+            assert stats[f"p{p}"] == pytest.approx(percentile(ordered, p), rel=0.02)
+
+    def test_tag_breakdown_and_overflow(self):
+        """Trends are split per tag value, with rare values folded into __other__ past the cap"""
+        analyzer = K6Analyzer(tag_keys=["name"], max_tag_values=2)
+        analyzer.feed([
+            metric_line("http_req_duration", "trend"),
+            point_line("http_req_duration", 10, name="/api/tasks"),
+            point_line("http_req_duration", 20, name="/api/tasks"),
+            point_line("http_req_duration", 30, name="/api/health"),
+            point_line("http_req_duration", 40, name="/api/tasks/1"),
+        ])
+
+        groups = analyzer.summary()["tags"]["http_req_duration"]
+        assert groups["name=/api/tasks"]["count"] == 2
+        assert groups["name=/api/health"]["count"] == 1
+        assert groups["name=__other__"]["count"] == 1
+
+    def test_errors_checks_and_throughput(self):
+        """Errors are grouped by code, checks counted and requests bucketed per window"""
+        analyzer = K6Analyzer(window_s=1)
+        lines = [metric_line("http_reqs", "counter"), metric_line("checks", "rate")]
+        for second in range(3):
+            for _ in range(second + 1):
+                time = f"2025-01-01T12:00:0{second}.500000+00:00"
+                lines.append(point_line("http_reqs", 1, time=time, status="0", error_code="1212", error="dial: connection refused"))
+                lines.append(point_line("checks", 0, time=time, check="status is 201"))
+        lines.append('{"type":"Point","metric":"http_reqs","data":{"ti')  # truncated last line
+        analyzer.feed(lines)
+
+        summary = analyzer.summary()
+        assert summary["invalid_lines"] == 1
+        assert summary["metrics"]["http_reqs"]["count"] == 6
+        assert summary["errors"] == [{"error_code": "1212", "error": "dial: connection refused", "status": "0", "count": 6}]
+        assert summary["checks"] == {"status is 201": {"passes": 0, "fails": 6}}
+        assert [window["requests"] for window in summary["throughput"]["windows"]] == [1, 2, 3]
+        assert summary["throughput"]["peak_rps"] == 3
+
+    def test_throughput_windows_coarsen(self):
+        """Long runs double the window width instead of keeping unbounded windows"""
+        analyzer = K6Analyzer(window_s=1)
+        analyzer.throughput.max_windows = 4
+        analyzer.feed([metric_line("http_reqs", "counter")] + [
+            point_line("http_reqs", 1, time=f"2025-01-01T12:00:{second:02d}.000000+00:00") for second in range(10)
+        ])
+
+        throughput = analyzer.summary()["throughput"]
+        assert throughput["window_s"] == 4
+        assert sum(window["requests"] for window in throughput["windows"]) == 10
+
+    def test_recorded_create_task_run(self, tmp_path):
+        """The committed k6 run against a stopped server summarizes as 1050 refused connections"""
+        source = tmp_path / K6_RESULTS.name
+        source.write_bytes(K6_RESULTS.read_bytes())
+
+        assert main([str(tmp_path)]) == 0
+
+        summary = json.loads(summary_path(source).read_text(encoding="utf-8"))
+        assert summary["metrics"]["http_reqs"]["count"] == 1050
+        assert summary["errors"][0]["error_code"] == "1212"
+        assert summary["errors"][0]["error"] == "dial: connection refused"
+        assert summary["checks"]["status is 201"] == {"passes": 0, "fails": 1050}
+        assert summary["metrics"]["http_req_duration"]["p95"] == 0
@@ -0,0 +1,81 @@
+"""E2E tests for live task updates pushed to every open page (GET /api/tasks/stream)"""
+import os
+import re
+import time
+from typing import List
+
+import allure
+import pytest
+from playwright.sync_api import expect
+
+from tests.api.client import TodoApiClient
+from tests.pages.todo_page import TodoPage
+from tests.perf.stats import summarize
+
+
+PAGE_COUNT = int(os.getenv("LIVE_PAGE_COUNT", "3"))
+ROUNDS = int(os.getenv("LIVE_ROUNDS", "10"))
+# Slowest time from an API write returning to the change showing on every page
+PROPAGATION_LIMIT_MS = float(os.getenv("LIVE_PROPAGATION_LIMIT_MS", "1000"))
+
+
+def wait_on_all(pages: List[TodoPage], condition) -> float:
+    """Wait for `condition(page)` on every page; milliseconds until the last one passed"""
+    start = time.perf_counter()
+    for todo_page in pages:
+        condition(todo_page)
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.ui
+class TestLiveUpdates:
+    """Changes made in one place show up on every open page without a reload"""
+
+    def test_changes_from_one_page_reach_the_others(self, todo_pages):
+        writer, *readers = todo_pages(PAGE_COUNT)
+
+        with allure.step("Add a task on the first page"):
+            writer.add_task("Shared Task", priority="2")
+        with allure.step("It appears on every other page"):
+            for reader in readers:
+                reader.wait_for_task("Shared Task")
+                assert "2 (Medium)" in reader.get_task_priority("Shared Task")
+
+        with allure.step("Complete it on the first page"):
+            writer.click_task("Shared Task")
+            writer.edit_task_status("Shared Task", "completed")
+            writer.save_task_changes("Shared Task")
+        with allure.step("Every other page shows it completed"):
+            for reader in readers:
+                expect(reader.get_task_by_name("Shared Task")).to_have_class(
+                    re.compile("status-highlight-completed"), timeout=5000
+                )
+
+        with allure.step("Delete it on the first page"):
+            writer.delete_task("Shared Task")
+        with allure.step("It disappears from every other page"):
+            for reader in readers:
+                reader.wait_for_task_removed("Shared Task")
+                assert reader.is_empty_state_visible()
+
+    @pytest.mark.perf
+    def test_propagation_latency(self, todo_pages, api_client: TodoApiClient):
+        pages = todo_pages(PAGE_COUNT)
+        latencies = []
+
+        with allure.step(f"Create and delete {ROUNDS} tasks through the API"):
+            for round_number in range(ROUNDS):
+                name = f"Live Task {round_number}"
+                task = api_client.create_task(name).json()["data"]
+                latencies.append(wait_on_all(pages, lambda todo_page: todo_page.wait_for_task(name)))
+                api_client.delete_task(task["id"])
+                latencies.append(wait_on_all(pages, lambda todo_page: todo_page.wait_for_task_removed(name)))
+
+        stats = summarize(latencies)
+        report = "\n".join(f"{key}: {value:.2f}" for key, value in stats.items())
+        allure.attach(report, name=f"Propagation to {PAGE_COUNT} pages (ms)", attachment_type=allure.attachment_type.TEXT)
+        print(f"\nPropagation to {PAGE_COUNT} pages (ms)\n{report}")
+
+        assert stats["max"] <= PROPAGATION_LIMIT_MS, (
+            f"Slowest change took {stats['max']:.0f}ms to reach all {PAGE_COUNT} pages (limit {PROPAGATION_LIMIT_MS:.0f}ms)"
+        )
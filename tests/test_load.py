@@ -0,0 +1,47 @@
+"""Load tests for the TODO API using the Python load generator"""
+import asyncio
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+from tests.perf.loadgen import LoadGenerator
+
+
+@pytest.mark.perf
+@pytest.mark.api
+class TestAPILoad:
+    """Short load runs that reuse the TestAPIDirect scenarios"""
+
+    def _generator(self, api_client: TodoApiClient, mix: dict, concurrency: int):
+        client = TodoApiClient(api_client.base_url, pool_size=1, retries=0, record_timings=False)
+        return client, LoadGenerator(client, mix, max_in_flight=concurrency, seed_tasks=500)
+
+    def test_closed_model_crud_mix(self, api_client: TodoApiClient):
+        """Closed model: 10 users looping over create/get/update/delete without think time"""
+        client, generator = self._generator(api_client, {"create": 1, "get": 1, "get_one": 2, "update": 2, "delete": 1}, 10)
+        try:
+            result = asyncio.run(generator.run_closed(users=10, duration=3))
+        finally:
+            client.close()
+
+        allure.attach(result.format_report(), name="Closed model load report", attachment_type=allure.attachment_type.TEXT)
+        summary = result.summary()
+        assert summary["total_requests"] > 0
+        for name, stats in summary["scenarios"].items():
+            assert stats["errors"] == 0, f"{name} had server errors: {stats['statuses']}"
+            assert stats["p50"] <= stats["p95"] <= stats["p99"] <= stats["max"]
+
+    def test_open_model_fixed_arrival_rate(self, api_client: TodoApiClient):
+        """Open model: 50 requests/s of creates and reads for 3 seconds"""
+        client, generator = self._generator(api_client, {"create": 1, "get_one": 3}, 50)
+        try:
+            result = asyncio.run(generator.run_open(rate=50, duration=3))
+        finally:
+            client.close()
+
+        allure.attach(result.format_report(), name="Open model load report", attachment_type=allure.attachment_type.TEXT)
+        summary = result.summary()
+        assert sum(stats["errors"] for stats in summary["scenarios"].values()) == 0
+        # Arrivals are Poisson, so allow generous slack around the 150 expected requests
+        assert 75 <= summary["total_requests"] <= 300
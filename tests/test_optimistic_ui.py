@@ -0,0 +1,99 @@
+"""E2E tests for optimistic updates: changes show at once and are saved in the background"""
+import os
+import time
+
+import allure
+import pytest
+from playwright.sync_api import expect
+
+from tests.api.client import TodoApiClient
+from tests.pages.todo_page import TodoPage
+
+
+# Added latency for the slow-network test; the task must show well before a round trip completes
+THROTTLE_LATENCY_MS = float(os.getenv("OPTIMISTIC_THROTTLE_LATENCY_MS", "1500"))
+DRAIN_TIMEOUT_MS = float(os.getenv("OPTIMISTIC_DRAIN_TIMEOUT_MS", "10000"))
+
+
+def count_saved_writes(todo_page: TodoPage) -> list:
+    """Record the method and path of every task write that reached the server"""
+    writes = []
+
+    def on_finished(request):
+        if request.method in ("POST", "PUT", "DELETE") and "/api/tasks" in request.url:
+            writes.append(f"{request.method} {request.url.split('/api', 1)[1]}")
+
+    todo_page.page.on("requestfinished", on_finished)
+    return writes
+
+
+@pytest.mark.ui
+class TestOptimisticUpdates:
+    """Writes are applied locally first and queued until the server has them"""
+
+    def test_offline_adds_are_queued_and_sent_together(self, todo_page: TodoPage, network, api_client: TodoApiClient):
+        todo_page.navigate()
+        writes = count_saved_writes(todo_page)
+        names = ["Offline Task 1", "Offline Task 2", "Offline Task 3"]
+
+        network.offline()
+        with allure.step("Add tasks while offline"):
+            for name in names:
+                todo_page.add_task(name, settle=False)
+        with allure.step("They are shown and waiting to be saved"):
+            assert todo_page.get_task_count() == len(names)
+            assert todo_page.get_pending_count() == len(names)
+            assert api_client.get_tasks().json()["count"] == 0
+
+        network.online()
+        with allure.step("The queue drains once the page is back online"):
+            todo_page.wait_for_settled(timeout=DRAIN_TIMEOUT_MS)
+            assert todo_page.get_pending_count() == 0
+            saved = [task["name"] for task in api_client.get_tasks().json()["data"]]
+            assert saved == names
+            assert writes == ["POST /tasks/bulk"], f"Expected one batched create, got {writes}"
+            for name in names:
+                expect(todo_page.get_task_by_name(name)).to_be_visible()
+
+    def test_add_shows_before_the_server_answers(self, todo_page: TodoPage, network):
+        todo_page.navigate()
+        network.throttle(THROTTLE_LATENCY_MS)
+
+        with allure.step(f"Add a task with {THROTTLE_LATENCY_MS:.0f}ms of network latency"):
+            start = time.perf_counter()
+            todo_page.add_task("Slow Network Task", settle=False)
+            shown_ms = (time.perf_counter() - start) * 1000
+            assert todo_page.get_pending_count() == 1
+
+        allure.attach(f"{shown_ms:.0f}", name="Time to show task (ms)", attachment_type=allure.attachment_type.TEXT)
+        assert shown_ms < THROTTLE_LATENCY_MS, (
+            f"Task took {shown_ms:.0f}ms to show, longer than one {THROTTLE_LATENCY_MS:.0f}ms round trip"
+        )
+
+        with allure.step("The server's id replaces the temporary one"):
+            todo_page.wait_for_settled(timeout=DRAIN_TIMEOUT_MS)
+            task_id = todo_page.page.evaluate("() => window.app.todos[0].id")
+            assert task_id > 0
+
+    def test_offline_edit_to_a_task_deleted_elsewhere_is_dropped(
+        self, todo_page: TodoPage, network, api_client: TodoApiClient, alert_messages
+    ):
+        task = api_client.create_task("Contested Task").json()["data"]
+        todo_page.navigate()
+
+        network.offline()
+        with allure.step("Complete the task while offline"):
+            todo_page.click_task("Contested Task")
+            todo_page.edit_task_status("Contested Task", "completed")
+            todo_page.save_task_changes("Contested Task", settle=False)
+            assert todo_page.get_pending_count() == 1
+        with allure.step("Someone else deletes it meanwhile"):
+            assert api_client.delete_task(task["id"]).status_code == 200
+
+        network.online()
+        with allure.step("The server's delete wins without an error"):
+            todo_page.wait_for_settled(timeout=DRAIN_TIMEOUT_MS)
+            todo_page.wait_for_task_removed("Contested Task")
+            assert todo_page.get_pending_count() == 0
+            assert alert_messages == []
+            assert api_client.get_tasks().json()["count"] == 0
@@ -0,0 +1,101 @@
+"""Performance regression gate: k6 summaries against the recorded baseline (no server or browser needed)"""
+import os
+from pathlib import Path
+
+import allure
+import pytest
+
+from tests.perf.baseline import (
+    PROJECT_ROOT,
+    REQUIRE_BASELINE,
+    Thresholds,
+    compare,
+    format_comparisons,
+    load_baseline,
+    load_summary,
+    record_run,
+    report_missing_baseline,
+    scenario_name,
+    summary_files,
+)
+
+
+pytestmark = [pytest.mark.perf, pytest.mark.offline]
+
+K6_RESULTS_DIR = Path(os.getenv("K6_RESULTS_DIR", PROJECT_ROOT / "k6-results"))
+SUMMARIES = summary_files(K6_RESULTS_DIR) if K6_RESULTS_DIR.is_dir() else []
+
+
+def make_summary(p95: float, rps: float = 50.0, failed_rate: float = 0.0, source: str = "k6-results-create-task.json") -> dict:
+    stats = {"p50": p95 / 2, "p95": p95, "p99": p95 * 1.5}
+    return {
+        "source": source,
+        "metrics": {
+            "http_req_duration": {"type": "trend", **stats},
+            "http_req_failed": {"type": "rate", "rate": failed_rate},
+        },
+        "tags": {"http_req_duration": {"endpoint=POST /api/tasks": stats}},
+        "throughput": {"windows": [{"rps": rps}], "mean_rps": rps},
+    }
+
+
+class TestBaselineComparator:
+    """The comparator only flags changes beyond tolerance, run-to-run noise and the noise floor"""
+
+    def _runs(self, *p95s):
+        baseline = {"scenarios": {}}
+        for p95 in p95s:
+            record_run(baseline, make_summary(p95))
+        return baseline["scenarios"]["create-task"]["runs"]
+
+    def _regressed(self, comparisons):
+        return {comparison.metric for comparison in comparisons if comparison.regressed}
+
+    def test_within_tolerance_passes(self):
+        assert not self._regressed(compare(make_summary(55), self._runs(48, 50, 52)))
+
+    def test_latency_regression_is_flagged(self):
+        regressed = self._regressed(compare(make_summary(100), self._runs(48, 50, 52)))
+        assert "http_req_duration.p95" in regressed
+        assert "endpoint[POST /api/tasks].p95" in regressed
+
+    def test_noise_floor_ignores_small_absolute_changes(self):
+        """2ms -> 4ms doubles p95 but stays under the 5ms floor"""
+        assert not self._regressed(compare(make_summary(4), self._runs(2, 2, 2)))
+
+    def test_noisy_history_widens_the_limit(self):
+        assert not self._regressed(compare(make_summary(100), self._runs(20, 50, 80)))
+
+    def test_throughput_drop_and_error_rate_are_flagged(self):
+        runs = self._runs(50, 50)
+        regressed = self._regressed(compare(make_summary(50, rps=20, failed_rate=0.2), runs))
+        assert regressed == {"throughput.mean_rps", "http_req_failed.rate"}
+
+    def test_keeps_latest_runs_only(self):
+        baseline = {"scenarios": {}}
+        for p95 in range(10):
+            record_run(baseline, make_summary(p95), keep=3)
+        runs = baseline["scenarios"]["create-task"]["runs"]
+        assert [run["metrics"]["http_req_duration.p95"] for run in runs] == [7, 8, 9]
+
+
+@pytest.mark.parametrize("summary_file", SUMMARIES or [
+    pytest.param(None, marks=pytest.mark.skip(reason=f"no k6 summaries in {K6_RESULTS_DIR}; run `npm run perf:analyze`"))
+], ids=lambda path: path.name if path else "none")
+def test_no_regression_against_baseline(summary_file: Path):
+    """Latest k6 run of each scenario stays within the thresholds of the stored baseline"""
+    summary = load_summary(summary_file)
+    scenario = scenario_name(summary)
+    runs = load_baseline()["scenarios"].get(scenario, {}).get("runs", [])
+    if not runs:
+        message = report_missing_baseline([scenario], required=REQUIRE_BASELINE)
+        if REQUIRE_BASELINE:
+            pytest.fail(message)
+        pytest.skip(message)
+
+    comparisons = compare(summary, runs, Thresholds.from_env())
+    report = format_comparisons(scenario, comparisons)
+    allure.attach(report, name=f"Baseline comparison: {scenario}", attachment_type=allure.attachment_type.TEXT)
+
+    regressed = [comparison.metric for comparison in comparisons if comparison.regressed]
+    assert not regressed, f"Performance regression in {scenario}: {', '.join(regressed)}\n{report}"
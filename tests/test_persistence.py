@@ -0,0 +1,135 @@
+"""Durability and throughput tests for the append-only task log"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+
+
+def stored_tasks(client: TodoApiClient) -> dict:
+    response = client.get_tasks()
+    response.raise_for_status()
+    return {task["id"]: task for task in response.json()["data"]}
+
+
+@pytest.mark.api
+class TestTaskLogDurability:
+    """Acknowledged writes survive crashes, torn writes and compaction"""
+
+    def test_acknowledged_writes_survive_crash(self, isolated_server):
+        """Every create/update/delete that got a response is there after kill -9 and restart"""
+        server = isolated_server()
+        client = TodoApiClient(server.base_url)
+
+        with allure.step("Create, update and delete tasks"):
+            created = client.create_tasks([{"name": f"Durable {i}"} for i in range(20)]).json()["data"]
+            single = client.create_task("Single Durable", priority="3").json()["data"]
+            client.update_task(created[0]["id"], status="completed")
+            client.delete_task(created[1]["id"])
+            expected = stored_tasks(client)
+        client.close()
+
+        with allure.step("Crash and restart the server"):
+            server.crash()
+            server.start()
+
+        client = TodoApiClient(server.base_url)
+        try:
+            assert stored_tasks(client) == expected
+            assert expected[single["id"]]["priority"] == "3"
+            assert expected[created[0]["id"]]["status"] == "completed"
+            assert created[1]["id"] not in expected
+            # Ids keep counting from where they were, not from the last snapshot
+            assert client.create_task("After Restart").json()["data"]["id"] == single["id"] + 1
+        finally:
+            client.close()
+
+    def test_torn_log_line_is_ignored(self, isolated_server):
+        """A half-written last log line (crash mid-append) does not stop the server from starting"""
+        server = isolated_server()
+        client = TodoApiClient(server.base_url)
+        client.create_tasks([{"name": f"Before Tear {i}"} for i in range(5)])
+        expected = stored_tasks(client)
+        client.close()
+
+        server.crash()
+        with open(server.log_file, "a", encoding="utf-8") as log:
+            log.write('{"seq": 999, "op": "put", "tasks": [{"id": 99')
+        server.start()
+
+        client = TodoApiClient(server.base_url)
+        try:
+            assert stored_tasks(client) == expected
+        finally:
+            client.close()
+
+    def test_graceful_shutdown_compacts_log(self, isolated_server):
+        """SIGTERM folds the log into tasks.json so the next start has nothing to replay"""
+        if os.name == "nt":
+            pytest.skip("Graceful shutdown is signalled with CTRL_BREAK on Windows")
+
+        server = isolated_server()
+        client = TodoApiClient(server.base_url)
+        client.create_tasks([{"name": f"Compacted {i}"} for i in range(10)])
+        client.close()
+
+        server.stop()
+
+        assert server.log_file.read_text(encoding="utf-8") == ""
+        assert '"Compacted 9"' in server.storage_file.read_text(encoding="utf-8")
+
+    def test_compaction_under_concurrent_writes(self, isolated_server):
+        """With a tiny compaction threshold, concurrent writes still all survive a crash"""
+        server = isolated_server(TASKS_COMPACT_BYTES=2048)
+        client = TodoApiClient(server.base_url, pool_size=20)
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            responses = list(executor.map(lambda i: client.create_task(f"Compaction {i}"), range(300)))
+        assert all(response.status_code == 201 for response in responses)
+        storage = client.get("/api/health").json()["storage"]
+        expected = stored_tasks(client)
+        client.close()
+
+        assert storage["compactions"] > 0
+        assert len(expected) == 300
+
+        server.crash()
+        server.start()
+        client = TodoApiClient(server.base_url)
+        try:
+            assert stored_tasks(client) == expected
+        finally:
+            client.close()
+
+
+@pytest.mark.api
+@pytest.mark.perf
+class TestTaskLogThroughput:
+    """Group commit keeps concurrent writes from paying one file write each"""
+
+    def test_concurrent_creates_are_group_committed(self, isolated_server):
+        server = isolated_server()
+        client = TodoApiClient(server.base_url, pool_size=50)
+        total = 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            responses = list(executor.map(lambda i: client.create_task(f"Throughput {i}"), range(total)))
+        elapsed = time.perf_counter() - started
+
+        storage = client.get("/api/health").json()["storage"]
+        client.close()
+        report = (
+            f"{total} creates from 50 threads in {elapsed:.2f}s ({total / elapsed:.0f} req/s)\n"
+            f"log appends={storage['appends']} batches={storage['batches']} compactions={storage['compactions']}"
+        )
+        allure.attach(report, name="Task log throughput", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        assert all(response.status_code == 201 for response in responses)
+        assert len({response.json()["data"]["id"] for response in responses}) == total
+        assert storage["appends"] == total
+        assert storage["batches"] < storage["appends"]
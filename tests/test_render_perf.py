@@ -0,0 +1,133 @@
+"""Rendering benchmark: add/edit/delete in the browser must not slow down with the size of the list"""
+import os
+from typing import Dict, List
+
+import allure
+import pytest
+from playwright.sync_api import expect
+
+from tests.pages.todo_page import TodoPage
+from tests.perf.stats import summarize
+
+
+DATASET_SIZES = [int(size) for size in os.getenv("RENDER_SIZES", "1000,10000").split(",")]
+SAMPLES = int(os.getenv("RENDER_SAMPLES", "5"))
+# Render p50 at the largest size may be at most GROWTH_LIMIT x the smallest size's p50, plus SLACK_MS
+GROWTH_LIMIT = float(os.getenv("RENDER_GROWTH_LIMIT", "3.0"))
+SLACK_MS = float(os.getenv("RENDER_SLACK_MS", "10.0"))
+LARGE_LIST_SIZE = int(os.getenv("RENDER_LARGE_LIST_SIZE", "50000"))
+# A long list is windowed, so it should only ever mount a screenful of rows plus overscan
+MAX_MOUNTED_ROWS = int(os.getenv("RENDER_MAX_MOUNTED_ROWS", "200"))
+LARGE_LIST_ADD_LIMIT_MS = float(os.getenv("RENDER_LARGE_LIST_ADD_LIMIT_MS", "1000"))
+
+# Record every TodoApp.render() call as a 'todo-render' entry on the performance timeline
+INSTRUMENT_RENDER = """() => {
+    const render = window.app.render.bind(window.app);
+    window.app.render = () => {
+        const start = performance.now();
+        render();
+        performance.measure('todo-render', { start, end: performance.now() });
+    };
+}"""
+START_OPERATION = "() => { performance.clearMeasures(); performance.mark('operation-start'); }"
+# Milliseconds since START_OPERATION, and how much of that was spent in render()
+FINISH_OPERATION = """() => {
+    const total = performance.measure('operation', 'operation-start').duration;
+    const render = performance.getEntriesByName('todo-render').reduce((sum, entry) => sum + entry.duration, 0);
+    performance.clearMarks('operation-start');
+    return { total, render };
+}"""
+
+
+def timed(todo_page: TodoPage, action) -> Dict[str, float]:
+    todo_page.page.evaluate(START_OPERATION)
+    action()
+    return todo_page.page.evaluate(FINISH_OPERATION)
+
+
+def edit(todo_page: TodoPage, name: str):
+    todo_page.click_task(name)
+    todo_page.edit_task_status(name, "completed")
+    todo_page.save_task_changes(name)
+
+
+def measure(todo_page: TodoPage, size: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """total/render p50/p95/... of add, edit and delete through the UI"""
+    samples: Dict[str, List[Dict[str, float]]] = {"add": [], "edit": [], "delete": []}
+    for sample in range(SAMPLES):
+        name = f"Render Task {size}-{sample}"
+        samples["add"].append(timed(todo_page, lambda: todo_page.add_task(name)))
+        samples["edit"].append(timed(todo_page, lambda: edit(todo_page, name)))
+        samples["delete"].append(timed(todo_page, lambda: todo_page.delete_task(name)))
+    return {
+        operation: {key: summarize([timing[key] for timing in timings]) for key in ("total", "render")}
+        for operation, timings in samples.items()
+    }
+
+
+def format_report(results: Dict[int, Dict[str, Dict[str, Dict[str, float]]]]) -> str:
+    lines = [f"{'tasks':>8} {'op':<7} {'total p50':>10} {'total p95':>10} {'render p50':>11} {'render p95':>11}"]
+    for size, operations in results.items():
+        for name, stats in operations.items():
+            lines.append(
+                f"{size:>8} {name:<7} {stats['total']['p50']:>10.2f} {stats['total']['p95']:>10.2f} "
+                f"{stats['render']['p50']:>11.2f} {stats['render']['p95']:>11.2f}"
+            )
+    return "\n".join(lines)
+
+
+@pytest.mark.perf
+@pytest.mark.ui
+class TestRenderScaling:
+    """Changing one task re-renders only its own item, and long lists only mount the visible rows"""
+
+    def test_operation_latency_is_flat(self, todo_page: TodoPage, seed_tasks):
+        seeded = 0
+        results = {}
+        for size in DATASET_SIZES:
+            with allure.step(f"Load {size} tasks and time add/edit/delete in the browser"):
+                seed_tasks(size - seeded, lambda i: {"name": f"Bench Task {seeded + i}"})
+                seeded = size
+                todo_page.page.goto(todo_page.base_url)
+                todo_page.wait_for_settled(timeout=60000)
+                assert todo_page.get_task_count() == size
+                todo_page.page.evaluate(INSTRUMENT_RENDER)
+                results[size] = measure(todo_page, size)
+
+        report = format_report(results)
+        allure.attach(report, name="Browser add/edit/delete latency by list size (ms)", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        smallest, largest = results[DATASET_SIZES[0]], results[DATASET_SIZES[-1]]
+        for name in smallest:
+            limit = smallest[name]["render"]["p50"] * GROWTH_LIMIT + SLACK_MS
+            assert largest[name]["render"]["p50"] <= limit, (
+                f"{name} render p50 grew from {smallest[name]['render']['p50']:.2f}ms at {DATASET_SIZES[0]} tasks "
+                f"to {largest[name]['render']['p50']:.2f}ms at {DATASET_SIZES[-1]} tasks (limit {limit:.2f}ms)\n{report}"
+            )
+
+    def test_large_list_stays_interactive(self, todo_page: TodoPage, seed_tasks):
+        seeded = seed_tasks(LARGE_LIST_SIZE, lambda i: {"name": f"Large Task {i}"})
+
+        with allure.step(f"Load {LARGE_LIST_SIZE} tasks"):
+            todo_page.page.goto(todo_page.base_url)
+            todo_page.wait_for_settled(timeout=120000)
+            assert todo_page.get_task_count() == LARGE_LIST_SIZE
+            assert todo_page.get_mounted_task_count() <= MAX_MOUNTED_ROWS
+
+        with allure.step("Reach a task in the middle of the list"):
+            middle = seeded[LARGE_LIST_SIZE // 2]
+            expect(todo_page.find_task_by_id(middle["id"])).to_contain_text(middle["name"])
+            assert todo_page.get_mounted_task_count() <= MAX_MOUNTED_ROWS
+
+        with allure.step("Add a task at the end of the list"):
+            todo_page.page.evaluate(INSTRUMENT_RENDER)
+            timing = timed(todo_page, lambda: todo_page.add_task("Large List New Task"))
+            allure.attach(
+                f"total: {timing['total']:.2f}\nrender: {timing['render']:.2f}",
+                name=f"Add with {LARGE_LIST_SIZE} tasks (ms)",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+            assert timing["total"] <= LARGE_LIST_ADD_LIMIT_MS, (
+                f"Adding a task took {timing['total']:.0f}ms with {LARGE_LIST_SIZE} tasks (limit {LARGE_LIST_ADD_LIMIT_MS:.0f}ms)"
+            )
@@ -0,0 +1,88 @@
+"""Scaling benchmark: single-task requests must not slow down as the task list grows"""
+import os
+import random
+import time
+from typing import Callable, Dict, List
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+from tests.perf.stats import summarize
+
+
+DATASET_SIZES = [int(size) for size in os.getenv("SCALING_SIZES", "1000,10000,100000").split(",")]
+SAMPLES = int(os.getenv("SCALING_SAMPLES", "200"))
+# p50 at the largest size may be at most GROWTH_LIMIT x the smallest size's p50, plus SLACK_MS of noise
+GROWTH_LIMIT = float(os.getenv("SCALING_GROWTH_LIMIT", "2.0"))
+SLACK_MS = float(os.getenv("SCALING_SLACK_MS", "1.0"))
+SEED_CHUNK_SIZE = 10000
+STATUSES = ["not started", "in progress", "completed"]
+
+
+def seed_to(client: TodoApiClient, ids: List[int], size: int):
+    """Bulk-create tasks until the server holds `size` of them"""
+    while len(ids) < size:
+        count = min(SEED_CHUNK_SIZE, size - len(ids))
+        response = client.create_tasks([{"name": f"Scale Task {len(ids) + i}"} for i in range(count)])
+        response.raise_for_status()
+        ids.extend(task["id"] for task in response.json()["data"])
+
+
+def timed(samples: int, call: Callable[[], object]) -> Dict[str, float]:
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarize(latencies)
+
+
+def measure(client: TodoApiClient, ids: List[int]) -> Dict[str, Dict[str, float]]:
+    """p50/p95/... of GET, PUT and DELETE /api/tasks/:id on random existing ids"""
+    timed(20, lambda: client.get_task(random.choice(ids)))  # warm up
+    return {
+        "get": timed(SAMPLES, lambda: client.get_task(random.choice(ids))),
+        "update": timed(SAMPLES, lambda: client.update_task(random.choice(ids), status=random.choice(STATUSES))),
+        "delete": timed(SAMPLES, lambda: client.delete_task(ids.pop(random.randrange(len(ids))))),
+    }
+
+
+def format_report(results: Dict[int, Dict[str, Dict[str, float]]]) -> str:
+    lines = [f"{'tasks':>8} {'op':<7} {'p50':>8} {'p95':>8} {'p99':>8}"]
+    for size, operations in results.items():
+        for name, stats in operations.items():
+            lines.append(f"{size:>8} {name:<7} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f}")
+    return "\n".join(lines)
+
+
+@pytest.mark.perf
+@pytest.mark.api
+class TestIdLookupScaling:
+    """GET/PUT/DELETE /api/tasks/:id go through the id index, not a scan of every task"""
+
+    def test_single_task_latency_is_flat(self, isolated_server):
+        # A huge compaction threshold keeps snapshot rewrites out of the measurements
+        server = isolated_server(TASKS_COMPACT_BYTES=10 ** 10)
+        client = TodoApiClient(server.base_url, pool_size=1, record_timings=False)
+        ids: List[int] = []
+        results = {}
+        try:
+            for size in DATASET_SIZES:
+                with allure.step(f"Seed {size} tasks and measure single-task requests"):
+                    seed_to(client, ids, size)
+                    results[size] = measure(client, ids)
+        finally:
+            client.close()
+
+        report = format_report(results)
+        allure.attach(report, name="Single-task latency by dataset size", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        smallest, largest = results[DATASET_SIZES[0]], results[DATASET_SIZES[-1]]
+        for name in smallest:
+            limit = smallest[name]["p50"] * GROWTH_LIMIT + SLACK_MS
+            assert largest[name]["p50"] <= limit, (
+                f"{name} p50 grew from {smallest[name]['p50']:.2f}ms at {DATASET_SIZES[0]} tasks "
+                f"to {largest[name]['p50']:.2f}ms at {DATASET_SIZES[-1]} tasks (limit {limit:.2f}ms)\n{report}"
+            )
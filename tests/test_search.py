@@ -0,0 +1,98 @@
+"""Search benchmark: filtered GET /api/tasks through the secondary indexes against a scan of every task"""
+import os
+import re
+from typing import Dict, List
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+from tests.perf.stats import summarize
+
+
+SEARCH_TASKS = int(os.getenv("SEARCH_TASKS", "100000"))
+SEARCH_SAMPLES = int(os.getenv("SEARCH_SAMPLES", "100"))
+# Server-side p50 of every indexed query must stay under this
+SEARCH_LIMIT_MS = float(os.getenv("SEARCH_LIMIT_MS", "1.0"))
+# The scan's p50 over the indexed p50, summed over the queries
+SEARCH_MIN_SPEEDUP = float(os.getenv("SEARCH_MIN_SPEEDUP", "10"))
+SEED_CHUNK_SIZE = 10000
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+STATUSES = ["not started", "in progress", "completed"]
+
+# One page of each; the last is a single task found by a word only it has
+QUERIES = {
+    "status+priority": {"status": "completed", "priority": "2", "limit": 50},
+    "word": {"q": "golf", "limit": 50},
+    "two words+status": {"q": "echo hot", "status": "in progress", "limit": 50},
+    "rare word": {"q": f"t{SEARCH_TASKS - 1}"},
+}
+
+
+def task_name(i: int) -> str:
+    return f"{WORDS[i % 8]} {WORDS[(i * 3 + i // 8) % 8]} t{i}"
+
+
+def seed(client: TodoApiClient, size: int):
+    """Bulk-create `size` tasks with two common words and one unique word in each name"""
+    for start in range(0, size, SEED_CHUNK_SIZE):
+        tasks = [
+            {"name": task_name(i), "priority": str(1 + i % 3), "status": STATUSES[(i // 3) % 3]}
+            for i in range(start, min(start + SEED_CHUNK_SIZE, size))
+        ]
+        client.create_tasks(tasks).raise_for_status()
+
+
+def search_ms(client: TodoApiClient, params: dict) -> float:
+    """Server-side search time of one query, from its Server-Timing header"""
+    response = client.get_tasks(**params)
+    assert response.status_code == 200, response.text
+    match = re.search(r"search;dur=([\d.]+)", response.headers["Server-Timing"])
+    assert match, f"Expected a search timing, got {response.headers['Server-Timing']}"
+    return float(match.group(1))
+
+
+def measure(client: TodoApiClient) -> Dict[str, Dict[str, float]]:
+    """p50/p95/... of each query's search time"""
+    results = {}
+    for name, params in QUERIES.items():
+        durations: List[float] = []
+        for i in range(SEARCH_SAMPLES):
+            # A write between samples, so every query is searched again instead of answered from the list cache
+            client.update_task(1, priority=str(1 + i % 3)).raise_for_status()
+            durations.append(search_ms(client, params))
+        results[name] = summarize(durations)
+    return results
+
+
+@pytest.mark.perf
+@pytest.mark.api
+class TestSearchIndexes:
+    """q/status/priority filters are answered from maintained indexes, not by scanning the task list"""
+
+    def test_indexed_search_is_sub_millisecond(self, isolated_server):
+        modes = {"indexed": {}, "scan": {"TASKS_SEARCH_INDEX": "false"}}
+        results = {}
+        for mode, env in modes.items():
+            server = isolated_server(TASKS_COMPACT_BYTES=10 ** 10, **env)
+            client = TodoApiClient(server.base_url, pool_size=1, record_timings=False)
+            try:
+                with allure.step(f"Seed {SEARCH_TASKS} tasks and time {SEARCH_SAMPLES} of each query ({mode})"):
+                    seed(client, SEARCH_TASKS)
+                    results[mode] = measure(client)
+                    assert [task["name"] for task in client.search_tasks(QUERIES["rare word"]["q"])] == [task_name(SEARCH_TASKS - 1)]
+            finally:
+                client.close()
+
+        lines = [f"{'query':<18} {'indexed p50':>12} {'scan p50':>10} {'speedup':>8}"]
+        for name in QUERIES:
+            indexed, scan = results["indexed"][name]["p50"], results["scan"][name]["p50"]
+            lines.append(f"{name:<18} {indexed:>12.3f} {scan:>10.3f} {scan / max(indexed, 0.001):>7.0f}x")
+        report = "\n".join(lines)
+        allure.attach(report, name=f"Search time at {SEARCH_TASKS} tasks (ms)", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        slow = {name: stats["p50"] for name, stats in results["indexed"].items() if stats["p50"] >= SEARCH_LIMIT_MS}
+        assert not slow, f"Indexed queries at or over {SEARCH_LIMIT_MS} ms p50: {slow}\n{report}"
+        speedup = sum(stats["p50"] for stats in results["scan"].values()) / sum(stats["p50"] for stats in results["indexed"].values())
+        assert speedup >= SEARCH_MIN_SPEEDUP, f"Indexes are only {speedup:.1f}x faster than a scan (need {SEARCH_MIN_SPEEDUP}x)\n{report}"
@@ -0,0 +1,93 @@
+"""Tests for the UI load path: hashed, precompressed, cacheable static assets"""
+import gzip
+import os
+import re
+from typing import Dict, List
+
+import allure
+import pytest
+
+from tests.api.client import TodoApiClient
+
+
+# Compressed bytes for the page, script and stylesheet together, as a fraction of the uncompressed bytes
+MAX_COMPRESSED_RATIO = {
+    "br": float(os.getenv("STATIC_MAX_BR_RATIO", "0.3")),
+    "gzip": float(os.getenv("STATIC_MAX_GZIP_RATIO", "0.35")),
+}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def fetch_raw(client: TodoApiClient, path: str, encoding: str = "identity", **headers):
+    """GET a path and return the response with the bytes exactly as sent (not decompressed)"""
+    response = client.get(path, headers={"Accept-Encoding": encoding, **headers}, stream=True)
+    body = response.raw.read(decode_content=False)
+    response.close()
+    return response, body
+
+
+def ui_load_path(client: TodoApiClient) -> List[str]:
+    """The page plus every script and stylesheet it links to"""
+    _, html = fetch_raw(client, "/")
+    links = re.findall(r'(?:src|href)="([^"]+\.(?:js|css))"', html.decode())
+    return ["/"] + [f"/{link}" for link in links]
+
+
+@pytest.mark.api
+class TestStaticAssets:
+    """The UI is served from a fixed list of files, compressed ahead of time and cached by content hash"""
+
+    def test_page_links_hashed_immutable_assets(self, api_client: TodoApiClient):
+        page, _ = fetch_raw(api_client, "/")
+        assert page.status_code == 200
+        assert page.headers["Cache-Control"] == "no-cache"
+        assert re.fullmatch(r'"[0-9a-f]{10}"', page.headers["ETag"]), "Expected a strong ETag"
+
+        assets = ui_load_path(api_client)[1:]
+        assert {os.path.splitext(asset)[1] for asset in assets} == {".js", ".css"}
+        for asset in assets:
+            assert re.fullmatch(r"/\w+\.[0-9a-f]{10}\.(js|css)", asset), asset
+            response, _ = fetch_raw(api_client, asset)
+            assert response.status_code == 200
+            assert response.headers["Cache-Control"] == IMMUTABLE
+
+    def test_revalidation_returns_304(self, api_client: TodoApiClient):
+        for encoding in ("identity", "gzip", "br"):
+            first, _ = fetch_raw(api_client, "/", encoding)
+            response, body = fetch_raw(api_client, "/", encoding, **{"If-None-Match": first.headers["ETag"]})
+            assert response.status_code == 304, encoding
+            assert body == b""
+
+    @pytest.mark.parametrize("path", ["/package-lock.json", "/server.js", "/tasks.json", "/requests.jsonl", "/k6/load-ui.js"])
+    def test_repository_files_are_not_served(self, api_client: TodoApiClient, path: str):
+        assert api_client.get(path).status_code == 404
+
+    @pytest.mark.perf
+    def test_compression_savings_on_ui_load_path(self, api_client: TodoApiClient):
+        paths = ui_load_path(api_client)
+        sizes: Dict[str, Dict[str, int]] = {}
+        for path in paths:
+            identity, plain = fetch_raw(api_client, path)
+            assert "Content-Encoding" not in identity.headers
+            sizes[path] = {"identity": len(plain)}
+            for encoding in ("gzip", "br"):
+                response, body = fetch_raw(api_client, path, encoding)
+                assert response.headers["Content-Encoding"] == encoding, path
+                assert response.headers["Vary"] == "Accept-Encoding"
+                assert response.headers["ETag"] != identity.headers["ETag"]
+                assert int(response.headers["Content-Length"]) == len(body)
+                if encoding == "gzip":
+                    assert gzip.decompress(body) == plain, path
+                sizes[path][encoding] = len(body)
+
+        totals = {encoding: sum(size[encoding] for size in sizes.values()) for encoding in ("identity", "gzip", "br")}
+        lines = [f"{'path':<28} {'identity':>9} {'gzip':>9} {'br':>9}"]
+        for path, size in [*sizes.items(), ("total", totals)]:
+            lines.append(f"{path:<28} {size['identity']:>9} {size['gzip']:>9} {size['br']:>9}")
+        report = "\n".join(lines)
+        allure.attach(report, name="UI load path bytes", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        for encoding, limit in MAX_COMPRESSED_RATIO.items():
+            ratio = totals[encoding] / totals["identity"]
+            assert ratio <= limit, f"{encoding} sends {ratio:.0%} of the uncompressed bytes (limit {limit:.0%})\n{report}"
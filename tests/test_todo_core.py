@@ -26,7 +26,7 @@ class TestAddTasks:
         with allure.step("Add new task 'Buy groceries'"):
             todo_page.task_name_input.fill("Buy groceries")
             todo_page.add_button.click()
-            todo_page.page.wait_for_timeout(1000)  # Wait for task to be added via API
+            todo_page.wait_for_settled()
         # Then
         with allure.step("Verify task was added correctly"):
             assert todo_page.task_exists("Buy groceries"), "Task should exist in the list"
@@ -121,7 +121,7 @@ class TestTaskStatusHighlighting:
 class TestEditTasks:
     """Test scenarios for editing tasks"""
     
-    def test_edit_task_priority_and_status(self, todo_page: TodoPage, server_process):
+    def test_edit_task_priority_and_status(self, todo_page: TodoPage, seed_tasks):
         # Scenario: Edit task priority and status
         # Given I have a task "Write documentation" with priority "1 (Low)" and status "Not Started"
         # When I click on the task
@@ -132,22 +132,20 @@ class TestEditTasks:
         # And the task should have status "In Progress"
         # And the task should be highlighted in orange
         with allure.step("Navigate to TO-DO list page"):
+            seed_tasks([{"name": "Write documentation", "priority": "1", "status": "not started"}])
             todo_page.navigate()
             todo_page.wait_for_api_detection()
-            todo_page.add_task("Write documentation", priority="1", status="not started")
         with allure.step("Edit task priority and status"):
             todo_page.click_task("Write documentation")
-            todo_page.page.wait_for_timeout(500)  # Wait for edit controls to appear
             todo_page.edit_task_priority("Write documentation", "2")
             todo_page.edit_task_status("Write documentation", "in progress")
             todo_page.save_task_changes("Write documentation")
-            todo_page.page.wait_for_timeout(500)  # Wait for save to complete
         with allure.step("Verify task was updated"):
             assert "2 (Medium)" in todo_page.get_task_priority("Write documentation")
             assert "In progress" in todo_page.get_task_status("Write documentation")
             assert todo_page.get_task_highlight_class("Write documentation") == "orange"
     
-    def test_toggle_edit_mode(self, todo_page: TodoPage, server_process):
+    def test_toggle_edit_mode(self, todo_page: TodoPage, seed_tasks):
         # Scenario: Toggle edit mode on and off
         # Given I have a task "Sample task" in the list
         # When I click on the task
@@ -155,17 +153,15 @@ class TestEditTasks:
         # When I click on the task again
         # Then the edit controls should be hidden
         with allure.step("Navigate to TO-DO list page and add sample task"):
+            seed_tasks([{"name": "Sample task"}])
             todo_page.navigate()
             todo_page.wait_for_api_detection()
-            todo_page.add_task("Sample task")
         with allure.step("Click task to enter edit mode"):
             todo_page.click_task("Sample task")
-            todo_page.page.wait_for_timeout(300)
         with allure.step("Verify task is in edit mode"):
             assert todo_page.is_task_in_edit_mode("Sample task"), "Task should be in edit mode"
         with allure.step("Click task again to exit edit mode"):
             todo_page.click_task("Sample task")
-            todo_page.page.wait_for_timeout(300)
         with allure.step("Verify task is not in edit mode"):
             assert not todo_page.is_task_in_edit_mode("Sample task"), "Task should not be in edit mode"
 
@@ -174,7 +170,7 @@ class TestEditTasks:
 class TestDeleteTasks:
     """Test scenarios for deleting tasks"""
     
-    def test_delete_task_with_confirmation(self, todo_page: TodoPage, server_process):
+    def test_delete_task_with_confirmation(self, todo_page: TodoPage, seed_tasks):
         """
         Scenario: Delete a task
         Given I have a task "Old task to delete" in the list
@@ -183,20 +179,19 @@ class TestDeleteTasks:
         Then the task should be removed from the list
         """
         # Given
+        seed_tasks([{"name": "Old task to delete"}])
         todo_page.navigate()
         todo_page.wait_for_api_detection()
-        todo_page.add_task("Old task to delete")
         initial_count = todo_page.get_task_count()
         
         # When
         todo_page.delete_task("Old task to delete", confirm=True)
-        todo_page.page.wait_for_timeout(500)
         
         # Then
         assert not todo_page.task_exists("Old task to delete"), "Task should be deleted"
         assert todo_page.get_task_count() == initial_count - 1
     
-    def test_cancel_task_deletion(self, todo_page: TodoPage, server_process):
+    def test_cancel_task_deletion(self, todo_page: TodoPage, seed_tasks):
         """
         Scenario: Cancel task deletion
         Given I have a task "Important task" in the list
@@ -205,14 +200,13 @@ class TestDeleteTasks:
         Then the task should still be visible
         """
         # Given
+        seed_tasks([{"name": "Important task"}])
         todo_page.navigate()
         todo_page.wait_for_api_detection()
-        todo_page.add_task("Important task")
         initial_count = todo_page.get_task_count()
         
         # When
         todo_page.delete_task("Important task", confirm=False)
-        todo_page.page.wait_for_timeout(500)
         
         # Then
         assert todo_page.task_exists("Important task"), "Task should still exist"
@@ -237,7 +231,7 @@ class TestValidation:
         
         # When
         todo_page.add_button.click()
-        todo_page.page.wait_for_timeout(500)
+        todo_page.wait_for_settled()
         
         # Then
         assert len(alert_messages) > 0, "Alert should be shown"
@@ -258,7 +252,7 @@ class TestValidation:
         # When
         todo_page.task_name_input.fill("   ")
         todo_page.add_button.click()
-        todo_page.page.wait_for_timeout(500)
+        todo_page.wait_for_settled()
         
         # Then
         assert len(alert_messages) > 0, "Alert should be shown"
@@ -279,7 +273,7 @@ class TestValidation:
         long_name = "a" * 201
         todo_page.task_name_input.fill(long_name)
         todo_page.add_button.click()
-        todo_page.page.wait_for_timeout(500)
+        todo_page.wait_for_settled()
         
         # Then
         assert len(alert_messages) > 0, "Alert should be shown"
@@ -300,7 +294,7 @@ class TestValidation:
         max_name = "a" * 200
         todo_page.task_name_input.fill(max_name)
         todo_page.add_button.click()
-        todo_page.page.wait_for_timeout(500)
+        todo_page.wait_for_settled()
         
         # Then
         assert todo_page.get_task_count() == 1, "Task should be added"
@@ -385,23 +379,18 @@ class TestCompleteWorkflow:
         
         # When - Change to In Progress
         todo_page.click_task("Workflow test task")
-        todo_page.page.wait_for_timeout(500)
         todo_page.edit_task_status("Workflow test task", "in progress")
         todo_page.save_task_changes("Workflow test task")
-        todo_page.page.wait_for_timeout(500)
         assert todo_page.get_task_highlight_class("Workflow test task") == "orange"
         
         # When - Change to Completed
         todo_page.click_task("Workflow test task")
-        todo_page.page.wait_for_timeout(500)
         todo_page.edit_task_status("Workflow test task", "completed")
         todo_page.save_task_changes("Workflow test task")
-        todo_page.page.wait_for_timeout(500)
         assert todo_page.get_task_highlight_class("Workflow test task") == "green"
         
         # When - Delete
         todo_page.delete_task("Workflow test task", confirm=True)
-        todo_page.page.wait_for_timeout(500)
         
         # Then
         assert not todo_page.task_exists("Workflow test task"), "Task should be deleted"
@@ -0,0 +1,129 @@
+"""Wire format benchmark: the columnar GET /api/tasks format against JSON for long lists"""
+import json
+import os
+import time
+from typing import Callable, Dict
+
+import allure
+import pytest
+from playwright.sync_api import Browser
+
+from tests.api.client import TodoApiClient
+from tests.api.task_columns import TASK_COLUMNS_TYPE, decode_task_columns
+from tests.perf.stats import summarize
+
+
+WIRE_TASKS = int(os.getenv("WIRE_TASKS", "50000"))
+WIRE_SAMPLES = int(os.getenv("WIRE_SAMPLES", "9"))
+# JSON bytes over columnar bytes for the whole list
+WIRE_MIN_SIZE_RATIO = float(os.getenv("WIRE_MIN_SIZE_RATIO", "4"))
+# JSON.parse p50 over TodoApp.decodeTaskColumns p50 in the browser
+WIRE_MIN_PARSE_SPEEDUP = float(os.getenv("WIRE_MIN_PARSE_SPEEDUP", "3"))
+SEED_CHUNK_SIZE = 10000
+STATUSES = ["not started", "in progress", "completed"]
+
+# Fetch the whole list in both formats in the page, then time parsing each one
+BROWSER_PARSE = """async ([type, samples]) => {
+    const [json, columns] = await Promise.all([
+        fetch('/api/tasks', { headers: { Accept: 'application/json' } }).then(response => response.text()),
+        fetch('/api/tasks', { headers: { Accept: type } }).then(response => response.arrayBuffer())
+    ]);
+    const median = parse => {
+        const times = [];
+        for (let i = 0; i < samples; i++) {
+            const start = performance.now();
+            parse();
+            times.push(performance.now() - start);
+        }
+        return times.sort((a, b) => a - b)[samples >> 1];
+    };
+    const same = JSON.stringify(JSON.parse(json).data) === JSON.stringify(TodoApp.decodeTaskColumns(columns).data);
+    return { same, json: median(() => JSON.parse(json)), columns: median(() => TodoApp.decodeTaskColumns(columns)) };
+}"""
+
+
+def seed(client: TodoApiClient, size: int):
+    """Bulk-create `size` tasks with varied names, statuses and priorities"""
+    for start in range(0, size, SEED_CHUNK_SIZE):
+        tasks = [
+            {"name": f"Wire Task {i}", "priority": str(1 + i % 3), "status": STATUSES[i % 3]}
+            for i in range(start, min(start + SEED_CHUNK_SIZE, size))
+        ]
+        client.create_tasks(tasks).raise_for_status()
+
+
+def timed(call: Callable[[], object]) -> float:
+    """p50 milliseconds of WIRE_SAMPLES calls"""
+    durations = []
+    for _ in range(WIRE_SAMPLES):
+        start = time.perf_counter()
+        call()
+        durations.append((time.perf_counter() - start) * 1000)
+    return summarize(durations)["p50"]
+
+
+@pytest.fixture
+def large_list(isolated_server):
+    """A private server holding WIRE_TASKS tasks, and a client for it"""
+    server = isolated_server(TASKS_COMPACT_BYTES=10 ** 10)
+    client = TodoApiClient(server.base_url, timeout=30, record_timings=False)
+    with allure.step(f"Seed {WIRE_TASKS} tasks"):
+        seed(client, WIRE_TASKS)
+    yield server, client
+    client.close()
+
+
+@pytest.mark.perf
+@pytest.mark.api
+class TestTaskColumns:
+    """Long task lists are much smaller and faster to parse in the columnar format"""
+
+    def test_columns_match_json_and_are_smaller(self, large_list):
+        _, client = large_list
+        json_response = client.get_tasks()
+        columns_response = client.get_tasks(columns=True)
+        assert columns_response.status_code == 200
+        assert columns_response.headers["Content-Type"] == TASK_COLUMNS_TYPE
+        assert "Accept" in columns_response.headers["Vary"]
+        assert columns_response.headers["ETag"] != json_response.headers["ETag"]
+        assert client.get_tasks(etag=columns_response.headers["ETag"], columns=True).status_code == 304
+
+        body = json_response.json()
+        decoded = client.task_list(columns_response)
+        assert decoded == body, "The columnar format decoded to a different task list"
+        assert decoded["count"] == WIRE_TASKS
+
+        sizes = {"json": len(json_response.content), "columns": len(columns_response.content)}
+        parse_ms = {
+            "json": timed(lambda: json.loads(json_response.content)),
+            "columns": timed(lambda: decode_task_columns(columns_response.content)),
+        }
+        lines = [f"{'format':<8} {'bytes':>10} {'python parse p50 ms':>20}"]
+        for name in sizes:
+            lines.append(f"{name:<8} {sizes[name]:>10} {parse_ms[name]:>20.1f}")
+        report = "\n".join(lines)
+        allure.attach(report, name=f"GET /api/tasks with {WIRE_TASKS} tasks", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        ratio = sizes["json"] / sizes["columns"]
+        assert ratio >= WIRE_MIN_SIZE_RATIO, f"Columns are only {ratio:.1f}x smaller than JSON (need {WIRE_MIN_SIZE_RATIO}x)\n{report}"
+
+    @pytest.mark.ui
+    def test_browser_parses_columns_faster_than_json(self, large_list, browser: Browser):
+        server, _ = large_list
+        context = browser.new_context()
+        try:
+            page = context.new_page()
+            page.goto(server.base_url)
+            with allure.step(f"Parse {WIRE_TASKS} tasks {WIRE_SAMPLES} times in each format"):
+                result: Dict[str, float] = page.evaluate(BROWSER_PARSE, [TASK_COLUMNS_TYPE, WIRE_SAMPLES])
+        finally:
+            context.close()
+
+        report = f"JSON.parse p50 {result['json']:.1f} ms, TodoApp.decodeTaskColumns p50 {result['columns']:.1f} ms"
+        allure.attach(report, name=f"Browser parse time for {WIRE_TASKS} tasks", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n{report}")
+
+        assert result["same"], "The browser decoded a different task list from the columns"
+        speedup = result["json"] / max(result["columns"], 0.01)
+        assert speedup >= WIRE_MIN_PARSE_SPEEDUP, f"Columns parse only {speedup:.1f}x faster than JSON (need {WIRE_MIN_PARSE_SPEEDUP}x)\n{report}"